@@ -2,7 +2,7 @@ from typing import Any, Dict, Optional
 
 from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordBearer
-from fastapi.security.utils import get_authorization_scheme_param
+from fastapi_async_sqlalchemy import db
 from jose import JWTError
 from pydantic import ValidationError
 
@@ -12,7 +12,9 @@ from app.models import UserModel
 from app.schemas.token_schema import TokenPayload
 from app.schemas.user_schema import UserSchema
 from app.services import UserService
+from app.services.base import id_cache_tag
 from app.utils.cache import cache_manager
+from app.utils.helpers import AuthContext, auth_from_jwt
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
 
@@ -50,10 +52,15 @@ class UserValidator:
         return isinstance(user.enable, str) and user.enable.lower() == "y"
 
     async def get_user_from_cache_or_db(self, user_id: str, user_service: UserService) -> Optional[UserSchema]:
-        """Ambil user dari cache atau database."""
-        user = await cache_manager.get(f"user:{user_id}")
-        if not user:
-            user = await user_service.find_by_id(user_id)
+        """Ambil user dari cache atau database (satu query per user per worker saat cache kosong/kedaluwarsa)."""
+
+        async def load_user() -> Dict[str, Any]:
+            # Session dan service sendiri: loader bisa berjalan di background bersamaan dengan request
+            async with db():
+                return (await Factory().get_user_service().find_by_id(user_id)).to_dict()
+
+        # Bertag id user: UserService.update/delete langsung membuang entry ini (juga nilai basinya)
+        user = await cache_manager.get_or_load(f"user:{user_id}", load_user, tags=[id_cache_tag(UserModel, user_id)])
 
         if user is None:
             return None
@@ -104,46 +111,51 @@ class AuthManager:
         Validasi token dan kembalikan user aktif.
         Jika error=False, kembalikan None jika tidak valid.
         Jika with_permissions=True, kembalikan user beserta permission.
+        Token dan user diambil dari AuthContext request, jadi hanya di-resolve sekali per request.
         """
-        # Ambil token dari header jika error=False (opsional, misal untuk endpoint publik)
-        if not self.error and request is not None:
-            authorization: str = request.headers.get("Authorization")
-            if not authorization:
+        if request is not None:
+            context = await auth_from_jwt(request)
+            # Tanpa header Authorization (endpoint publik dengan error=False)
+            if not self.error and context.token is None:
                 return None
-            scheme, token = get_authorization_scheme_param(authorization)
-            if scheme.lower() != "bearer" or not token:
-                return None
-
-        # Validasi token
-        payload = await self.token_validator.validate_token(token)
-        if not payload:
-            if self.error:
-                raise self.credentials_exception
-            return None
+            payload = context.payload
+        else:
+            context = AuthContext(token)
+            payload = await self.token_validator.validate_token(token)
 
-        user_id: Optional[str] = payload.get("sub")
+        user_id: Optional[str] = payload.get("sub") if payload else None
         if user_id is None:
             if self.error:
                 raise self.credentials_exception
             return None
 
-        # Ambil dan validasi user
-        user = await self.user_validator.get_user_from_cache_or_db(user_id, user_service)
+        # Ambil dan validasi user (sekali per request)
+        user = context.user
         if user is None:
-            if self.error:
-                raise self.credentials_exception
-            return None
+            user = await self.user_validator.get_user_from_cache_or_db(user_id, user_service)
+            if user is None:
+                if self.error:
+                    raise self.credentials_exception
+                return None
 
-        # Validasi user aktif
-        if not await self.user_validator.validate_user_active(user):
-            if self.error:
-                raise self.user_validator.inactive_user_exception
-            return None
+            # Validasi user aktif
+            if not await self.user_validator.validate_user_active(user):
+                if self.error:
+                    raise self.user_validator.inactive_user_exception
+                return None
+            context.user = user
 
         if not self.with_permissions:
             return user
 
-        return await user_service.find_by_id_with_permissions(user.id)
+        if context.user_with_permissions is None:
+            context.user_with_permissions = await user_service.find_by_id_with_permissions(user.id)
+        return context.user_with_permissions
+
+
+async def get_auth_context(request: Request) -> AuthContext:
+    """Dependency untuk AuthContext request (payload token tanpa lookup user)."""
+    return await auth_from_jwt(request)
 
 
 async def get_only_payload(
@@ -1,6 +1,6 @@
 from functools import partial
 
-from app.core.minio_client import MinioClient
+from app.core.minio_client import get_minio_client
 from app.models import (
     ArticleCommentModel,
     ArticleModel,
@@ -12,6 +12,7 @@ from app.models import (
     BusinessServiceModel,
     CommodityModel,
     EconomicValueModel,
+    ExportJobModel,
     FileModel,
     ForestryAreaModel,
     ForestryLandModel,
@@ -40,6 +41,7 @@ from app.repositories import (
     BusinessServiceRepository,
     CommodityRepository,
     EconomicValuesRepository,
+    ExportJobRepository,
     FarmerIncomesRepository,
     FileRepository,
     ForestryAreaRepository,
@@ -71,6 +73,7 @@ from app.services import (
     BusinessServiceService,
     CommodityService,
     EconomicValuesService,
+    ExportJobService,
     FarmerIncomesService,
     FileService,
     ForestryAreaService,
@@ -206,6 +209,10 @@ class RepositoryFactory:
     def create_settings_repository() -> SettingsRepository:
         return SettingsRepository(SettingsModel)
 
+    @staticmethod
+    def create_export_job_repository() -> ExportJobRepository:
+        return ExportJobRepository(ExportJobModel)
+
 
 class ServiceFactory:
     """Factory untuk membuat service instances."""
@@ -226,7 +233,7 @@ class ServiceFactory:
 
     def get_file_service(self) -> FileService:
         """Get FileService instance."""
-        return FileService(self.repository_factory.create_file_repository(), MinioClient())
+        return FileService(self.repository_factory.create_file_repository(), get_minio_client())
 
     def get_regional_service(self) -> RegionalService:
         """Get RegionalService instance."""
@@ -334,6 +341,17 @@ class ServiceFactory:
         """Get SettingsService instance."""
         return SettingsService(self.repository_factory.create_settings_repository())
 
+    def get_export_job_service(self) -> ExportJobService:
+        """Get ExportJobService instance."""
+        return ExportJobService(
+            self.repository_factory.create_export_job_repository(),
+            get_minio_client(),
+            exporters={
+                "businesses": self.get_businesses_service(),
+                "proposal-forestry": self.get_proposal_forestry_service(),
+            },
+        )
+
 
 # Backward compatibility - maintain existing interface
 class Factory(ServiceFactory):
@@ -371,3 +389,4 @@ class Factory(ServiceFactory):
         self.infographic_repository = staticmethod(partial(InfographicRepository))
         self.maps_repository = staticmethod(partial(MapsRepository))
         self.settings_repository = staticmethod(partial(SettingsRepository, SettingsModel))
+        self.export_job_repository = staticmethod(partial(ExportJobRepository, ExportJobModel))
@@ -10,6 +10,7 @@ from app.api.v1.routes import (
     businesses_router,
     commodity_router,
     economic_values_router,
+    export_router,
     farmer_incomes_router,
     file_router,
     forestry_area_router,
@@ -40,6 +41,7 @@ router.include_router(business_service_router, tags=["Business Services"])
 router.include_router(commodity_router, tags=["Commodities"])
 router.include_router(file_router, tags=["Files"])
 router.include_router(economic_values_router, tags=["Economic Values"])
+router.include_router(export_router, tags=["Exports"])
 router.include_router(farmer_incomes_router, tags=["Farmer Incomes"])
 router.include_router(forestry_area_router, tags=["Forestry Areas"])
 router.include_router(forestry_land_router, tags=["Forestry Lands"])
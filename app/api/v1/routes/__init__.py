@@ -7,6 +7,7 @@ from .business_service_route import router as business_service_router
 from .businesses_route import router as businesses_router
 from .commodity_route import router as commodity_router
 from .economic_values_route import router as economic_values_router
+from .export_route import router as export_router
 from .farmer_incomes_route import router as farmer_incomes_router
 from .file_route import router as file_router
 from .forestry_area_route import router as forestry_area_router
@@ -52,4 +53,5 @@ __all__ = [
     "infographic_router",
     "maps_router",
     "settings_router",
+    "export_router",
 ]
@@ -28,21 +28,24 @@ async def get_business_services(
     group_by = params.group_by
     limit = params.limit
     offset = params.offset
-    business_services, total = await service.find_all(
+    page = await service.find_all(
         filters=filter,
         sort=sort,
         search=search,
         group_by=group_by,
         limit=limit,
         offset=offset,
+        cursor=params.cursor,
+        count=params.count,
     )
 
     return PaginatedResponse(
-        items=[BusinessServiceSchema.model_validate(service_item) for service_item in business_services],
-        total=total,
+        items=[BusinessServiceSchema.model_validate(service_item) for service_item in page.items],
+        total=page.total,
         limit=limit,
         offset=offset,
-        has_more=total > (offset + limit),
+        has_more=page.has_more,
+        next_cursor=page.next_cursor,
     )
 
 
@@ -5,6 +5,7 @@ from fastapi.responses import StreamingResponse
 
 from app.api.dependencies.auth import get_current_active_user
 from app.api.dependencies.factory import Factory
+from app.core.data_types import ExportFormatEnum
 from app.core.params import CommonParams
 from app.schemas.base import PaginatedResponse
 from app.schemas.businesses_schema import (
@@ -14,6 +15,7 @@ from app.schemas.businesses_schema import (
 )
 from app.schemas.user_schema import UserSchema
 from app.services import BusinessesService
+from app.utils.helpers import export_media_type
 
 router = APIRouter()
 
@@ -29,21 +31,24 @@ async def get_businesses(
     group_by = params.group_by
     limit = params.limit
     offset = params.offset
-    businesses, total = await service.find_all(
+    page = await service.find_all(
         filters=filter,
         sort=sort,
         search=search,
         group_by=group_by,
         limit=limit,
         offset=offset,
+        cursor=params.cursor,
+        count=params.count,
     )
 
     return PaginatedResponse(
-        items=[BusinessesSchema.model_validate(business) for business in businesses],
-        total=total,
+        items=[BusinessesSchema.model_validate(business) for business in page.items],
+        total=page.total,
         limit=limit,
         offset=offset,
-        has_more=total > (offset + limit),
+        has_more=page.has_more,
+        next_cursor=page.next_cursor,
     )
 
 
@@ -57,9 +62,11 @@ async def export_business(
     offset: int = Query(0),
     relationships: Optional[List[str]] = Query(None),
     searchable_columns: Optional[List[str]] = Query(None),
+    export_format: ExportFormatEnum = Query(ExportFormatEnum.XLSX, alias="format"),
     service: BusinessesService = Depends(Factory().get_businesses_service),
 ):
-    excel_bytes = await service.export_to_excel(
+    content = service.export(
+        export_format=export_format,
         filters=filters,
         sort=sort,
         search=search,
@@ -70,9 +77,9 @@ async def export_business(
         searchable_columns=searchable_columns,
     )
     return StreamingResponse(
-        iter([excel_bytes]),
-        media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-        headers={"Content-Disposition": "attachment; filename=KUPS.xlsx"},
+        content,
+        media_type=export_media_type(export_format),
+        headers={"Content-Disposition": f"attachment; filename=KUPS.{export_format.value}"},
     )
 
 
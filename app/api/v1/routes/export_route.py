@@ -0,0 +1,31 @@
+from fastapi import APIRouter, Depends, status
+
+from app.api.dependencies.auth import get_current_active_user
+from app.api.dependencies.factory import Factory
+from app.schemas.export_job_schema import ExportJobCreateSchema, ExportJobSchema
+from app.schemas.user_schema import UserSchema
+from app.services import ExportJobService
+
+router = APIRouter()
+
+
+@router.post("/exports", response_model=ExportJobSchema, status_code=status.HTTP_202_ACCEPTED)
+async def create_export_job(
+    data: ExportJobCreateSchema,
+    current_user: UserSchema = Depends(get_current_active_user),
+    service: ExportJobService = Depends(Factory().get_export_job_service),
+):
+    """
+    Jadwalkan export di background. Pantau status lewat GET /exports/{id};
+    download_url tersedia setelah status completed.
+    """
+    return await service.create_job(data.model_dump(), current_user.id)
+
+
+@router.get("/exports/{id}", response_model=ExportJobSchema)
+async def get_export_job(
+    id: str,
+    current_user: UserSchema = Depends(get_current_active_user),
+    service: ExportJobService = Depends(Factory().get_export_job_service),
+):
+    return await service.get_job(id, current_user.id)
@@ -1,17 +1,38 @@
+from email.utils import format_datetime
 from typing import Optional
 
-from fastapi import APIRouter, Depends, File, Form, Response, UploadFile, status
-from fastapi.responses import StreamingResponse
+from fastapi import (
+    APIRouter,
+    Depends,
+    File,
+    Form,
+    Query,
+    Request,
+    Response,
+    UploadFile,
+    status,
+)
+from fastapi.responses import RedirectResponse, StreamingResponse
 
-from app.api.dependencies.auth import get_current_active_user, get_only_payload
+from app.api.dependencies.auth import (
+    get_auth_context,
+    get_current_active_user,
+    get_only_payload,
+)
 from app.api.dependencies.factory import Factory
+from app.core.config import settings
 from app.core.data_types import UUID7Field
 from app.core.params import CommonParams
 from app.models import UserModel
 from app.schemas.base import PaginatedResponse
-from app.schemas.file_schema import FileSchema
+from app.schemas.file_schema import FileSchema, FileZipSchema
 from app.services import FileService
-from app.utils.helpers import iterfile
+from app.utils.helpers import (
+    AuthContext,
+    is_not_modified,
+    parse_range_header,
+    range_applies,
+)
 
 router = APIRouter()
 
@@ -31,25 +52,91 @@ async def get_files(
     group_by = params.group_by
     limit = params.limit
     offset = params.offset
-    files, total = await service.find_all(filter, sort, search, group_by, limit, offset)
+    page = await service.find_all(
+        filter, sort, search, group_by, limit, offset, cursor=params.cursor, count=params.count
+    )
 
     return PaginatedResponse(
-        items=[FileSchema.model_validate(file) for file in files],
-        total=total,
+        items=[FileSchema.model_validate(file) for file in page.items],
+        total=page.total,
         limit=limit,
         offset=offset,
-        has_more=total > (offset + limit),
+        has_more=page.has_more,
+        next_cursor=page.next_cursor,
     )
 
 
 @router.get("/files/{object_name}", summary="Get file content")
-async def get_file_content(object_name: str, service: FileService = Depends(Factory().get_file_service)):
-    file_content, object_info = await service.get_file_content(object_name=object_name)
+async def get_file_content(
+    object_name: str,
+    request: Request,
+    w: Optional[int] = Query(None, description="Lebar turunan gambar (WebP), lihat IMAGE_DERIVATIVE_WIDTHS"),
+    auth: AuthContext = Depends(get_auth_context),
+    service: FileService = Depends(Factory().get_file_service),
+):
+    """
+    Mendukung Range (206), If-Range, serta ETag/If-None-Match dan Last-Modified/If-Modified-Since (304).
+    Dengan FILE_DOWNLOAD_REDIRECT, response berupa 302 ke presigned URL MinIO sehingga isi file
+    tidak melewati API (Range dan conditional GET dilayani langsung oleh MinIO).
+    Dengan `w`, gambar disajikan sebagai turunan WebP selebar `w` yang dibuat saat pertama diminta.
+    Nama file dan content type diambil dari row `files` milik pemanggil (objek dipakai bersama).
+    """
+    source_name, object_info = object_name, None
+    if w is not None:
+        object_name, object_info = await service.get_image_derivative(object_name, w)
+    filename, content_type = await service.get_download_name(source_name, object_name, auth.user_id)
+
+    if settings.FILE_DOWNLOAD_REDIRECT:
+        url = await service.get_download_url(object_name, filename=filename, content_type=content_type)
+        return RedirectResponse(url, status_code=status.HTTP_302_FOUND, headers={"Cache-Control": "no-store"})
+
+    object_info = object_info or await service.get_file_info(object_name)
+    size, etag, last_modified = object_info["_size"], object_info["_etag"], object_info["_last_modified"]
+
+    headers = {
+        "Accept-Ranges": "bytes",
+        "Content-Disposition": f'attachment; filename="{filename}"',
+    }
+    if etag:
+        headers["ETag"] = f'"{etag}"'
+    if last_modified:
+        headers["Last-Modified"] = format_datetime(last_modified, usegmt=True)
+
+    if is_not_modified(request.headers, etag, last_modified):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
 
+    byte_range = None
+    if range_applies(request.headers, etag, last_modified):
+        byte_range = parse_range_header(request.headers.get("range"), size)
+    start, end = byte_range or (0, size - 1)
+
+    file_content, object_info = await service.get_file_content(
+        object_name=object_name, offset=start, length=end - start + 1, object_info=object_info
+    )
+    headers["Content-Length"] = str(end - start + 1)
+    if byte_range:
+        headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+
+    return StreamingResponse(
+        content=file_content,
+        status_code=status.HTTP_206_PARTIAL_CONTENT if byte_range else status.HTTP_200_OK,
+        media_type=content_type or object_info["_content_type"],
+        headers=headers,
+    )
+
+
+@router.post("/files/zip", summary="Download beberapa file sebagai ZIP")
+async def download_files_zip(
+    data: FileZipSchema,
+    current_user: UserModel = Depends(get_current_active_user),
+    service: FileService = Depends(Factory().get_file_service),
+):
+    """ZIP dibangun sambil dialirkan; file diambil dari MinIO bersamaan dengan read-ahead terbatas."""
+    content = await service.get_zip_content(user_id=str(current_user.id), ids=data.ids, prefix=data.prefix)
     return StreamingResponse(
-        content=iterfile(file_content),
-        media_type=object_info["_content_type"],
-        headers={"Content-Disposition": f'attachment; filename="{object_info["_metadata"]["x-amz-meta-filename"]}"'},
+        content=content,
+        media_type="application/zip",
+        headers={"Content-Disposition": 'attachment; filename="files.zip"'},
     )
 
 
@@ -13,18 +13,7 @@ async def get_total_kph_accounts(
     """
     Return all data from all /infographic/* endpoints in a single response.
     """
-    return {
-        "summary": await service.get_summary_infographic(),
-        "farmer_incomes": await service.get_farmer_incomes(),
-        "social_forestry_achievement_by_schema": await service.get_social_forestry_achievement_by_schema(),
-        "businesses_class_progress": await service.get_businesses_class_progress(),
-        "growth_forestry_business_unit": await service.get_growth_forestry_business_unit(),
-        "forestry_area_by_regional": await service.get_forestry_area_by_regional(),
-        "households_by_regional": await service.get_households_by_regional(),
-        "social_forestry_commodities_by_regency": await service.get_social_forestry_commodities_by_regency(),
-        "sum_businesses_class_by_regency": await service.get_sum_businesses_class_by_regency(),
-        "sum_forestry_schema_by_regency": await service.get_sum_forestry_schema_by_regency(),
-    }
+    return await service.get_all()
 
 
 @router.get("/infographic/farmer-incomes")
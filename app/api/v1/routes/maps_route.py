@@ -3,6 +3,7 @@ from typing import Optional
 from fastapi import APIRouter, Depends, Query
 
 from app.api.dependencies.factory import Factory
+from app.core.data_types import CountModeEnum
 from app.schemas.base import PaginatedResponse
 from app.services import MapsService
 
@@ -13,21 +14,23 @@ router = APIRouter()
 async def get_maps_list(
     limit: int = Query(100, ge=1),
     offset: int = Query(0, ge=0),
+    count: CountModeEnum = Query(CountModeEnum.EXACT),
     service: MapsService = Depends(Factory().get_maps_service),
     filters: Optional[dict] = None,
 ) -> PaginatedResponse:
     filters = filters or {}
 
-    maps, total = await service.get_all(
+    page = await service.get_all(
         filters=filters,
         limit=limit,
         offset=offset,
+        count=count,
     )
 
     return PaginatedResponse(
-        items=maps,
-        total=total,
+        items=page.items,
+        total=page.total,
         limit=limit,
         offset=offset,
-        has_more=total > (offset + limit),
+        has_more=page.has_more,
     )
@@ -5,6 +5,7 @@ from fastapi.responses import StreamingResponse
 
 from app.api.dependencies.auth import get_current_active_user
 from app.api.dependencies.factory import Factory
+from app.core.data_types import ExportFormatEnum
 from app.core.params import CommonParams
 from app.schemas.base import PaginatedResponse
 from app.schemas.proposal_forestry_schema import (
@@ -14,6 +15,7 @@ from app.schemas.proposal_forestry_schema import (
 )
 from app.schemas.user_schema import UserSchema
 from app.services import ForestyProposalService
+from app.utils.helpers import export_media_type
 
 router = APIRouter()
 
@@ -29,24 +31,26 @@ async def get_proposal_list(
     group_by = params.group_by
     limit = params.limit
     offset = params.offset
-    forestry_proposals, total = await service.find_all(
+    page = await service.find_all(
         filters=filter,
         sort=sort,
         search=search,
         group_by=group_by,
         limit=limit,
         offset=offset,
+        cursor=params.cursor,
+        count=params.count,
     )
 
     return PaginatedResponse(
         items=[
-            ProposalForestrySchema.model_validate(proposal, by_alias=False, by_name=True)
-            for proposal in forestry_proposals
+            ProposalForestrySchema.model_validate(proposal, by_alias=False, by_name=True) for proposal in page.items
         ],
-        total=total,
+        total=page.total,
         limit=limit,
         offset=offset,
-        has_more=total > (offset + limit),
+        has_more=page.has_more,
+        next_cursor=page.next_cursor,
     )
 
 
@@ -60,10 +64,12 @@ async def export_forestry_proposal(
     offset: int = Query(0),
     relationships: Optional[List[str]] = Query(None),
     searchable_columns: Optional[List[str]] = Query(None),
+    export_format: ExportFormatEnum = Query(ExportFormatEnum.XLSX, alias="format"),
     service: ForestyProposalService = Depends(Factory().get_proposal_forestry_service),
 ):
 
-    excel_bytes = await service.export_to_excel(
+    content = service.export(
+        export_format=export_format,
         filters=filters,
         sort=sort,
         search=search,
@@ -74,9 +80,9 @@ async def export_forestry_proposal(
         searchable_columns=searchable_columns,
     )
     return StreamingResponse(
-        iter([excel_bytes]),
-        media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-        headers={"Content-Disposition": "attachment; filename=KPS.xlsx"},
+        content,
+        media_type=export_media_type(export_format),
+        headers={"Content-Disposition": f"attachment; filename=KPS.{export_format.value}"},
     )
 
 
@@ -1,5 +1,5 @@
 from functools import lru_cache
-from typing import List, Optional
+from typing import List, Literal, Optional
 
 from pydantic import Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -53,6 +53,30 @@ class Settings(BaseSettings):
     MINIO_SECURE: Optional[bool] = False
     MINIO_BUCKET_NAME: Optional[str] = Field(default="sips")
     MINIO_REGION: Optional[str] = Field(default=None)
+    MINIO_PART_SIZE: int = Field(default=10 * 1024 * 1024)  # ukuran part multipart, minimal 5MB
+    # Part yang ditransfer bersamaan per objek. Buffer per objek maksimal CONCURRENCY × PART_SIZE saat
+    # upload dan (CONCURRENCY + 1) × PART_SIZE saat download (termasuk part yang sedang dikirim)
+    MINIO_TRANSFER_CONCURRENCY: int = Field(default=4)
+    MINIO_TRANSFER_RETRIES: int = Field(default=3)
+    MINIO_VERIFY_ETAG: bool = Field(default=True)  # matikan jika bucket memakai enkripsi server-side
+    MINIO_MAX_CONNECTIONS: int = Field(default=100)  # Ukuran pool koneksi HTTP ke MinIO per proses
+
+    # File download settings
+    FILE_DOWNLOAD_REDIRECT: bool = Field(default=False)  # 302 ke presigned URL MinIO, bukan proxy lewat API
+    PRESIGNED_URL_EXPIRES: int = Field(default=900)  # Masa berlaku (detik) presigned URL
+    PRESIGNED_URL_CACHE_MARGIN: int = Field(default=60)  # URL di cache diganti sekian detik sebelum kedaluwarsa
+    PRESIGNED_URL_CACHE_SIZE: int = Field(default=10000)
+
+    # Image derivative settings
+    IMAGE_DERIVATIVE_WIDTHS: List[int] = Field(default=[160, 320, 640, 1280])  # Lebar yang boleh diminta via ?w=
+    IMAGE_WEBP_QUALITY: int = Field(default=80)
+    IMAGE_WORKERS: int = Field(default=2)  # Proses worker untuk resize/encode gambar
+    IMAGE_MAX_SOURCE_SIZE: int = Field(default=20 * 1024 * 1024)  # Gambar asli lebih besar disajikan apa adanya
+
+    # Bulk ZIP download settings
+    ZIP_MAX_FILES: int = Field(default=500)  # Maksimal file per arsip
+    ZIP_CONCURRENCY: int = Field(default=4)  # File yang diambil dari MinIO bersamaan
+    ZIP_READ_AHEAD: int = Field(default=2)  # Chunk per file yang boleh diambil lebih dulu dari yang dikirim
 
     MAX_UPLOAD_SIZE: int = 100 * 1024 * 1024  # 100MB default limit
     ALLOWED_EXTENSIONS: List[str] = [
@@ -73,6 +97,39 @@ class Settings(BaseSettings):
 
     TIMEZONE: str = Field(default="Asia/Jakarta")
 
+    # Cache settings
+    CACHE_BACKEND: Literal["lru", "simple"] = Field(default="lru")  # "simple" = SimpleMemoryCache tanpa batas
+    CACHE_TTL: int = Field(default=300)  # TTL default (detik)
+    CACHE_MAX_ENTRIES: int = Field(default=10000)  # Maksimal entry cache per proses
+    CACHE_MAX_BYTES: int = Field(default=64 * 1024 * 1024)  # Perkiraan memori maksimal cache per proses
+    CACHE_REDIS_URL: Optional[str] = Field(default=None)  # L2 bersama antar worker, mis. redis://localhost:6379/0
+    CACHE_REDIS_PREFIX: str = Field(default="sips:cache:")
+    CACHE_L1_TTL: int = Field(default=30)  # Maksimal umur (detik) salinan L1 jika L2 aktif
+    CACHE_STALE_TTL: int = Field(default=60)  # Nilai basi masih disajikan sekian detik sambil di-refresh
+    CACHE_EARLY_REFRESH_BETA: float = Field(default=1.0)  # >1 refresh lebih awal, 0 mematikan early refresh
+    CACHE_TAG_TTL: int = Field(default=86400)  # Umur versi tag; harus lebih lama dari TTL entry bertag
+
+    # Pagination settings
+    COUNT_CACHE_TTL: int = Field(default=60)  # TTL (detik) total hasil count=estimate
+    STATEMENT_CACHE_SIZE: int = Field(default=256)  # Jumlah bentuk query list yang disimpan
+
+    # Search settings
+    FULLTEXT_SEARCH: bool = Field(default=True)  # Pakai MATCH ... AGAINST untuk model dengan __searchable__
+    FULLTEXT_MIN_TOKEN_SIZE: int = Field(default=3)  # Samakan dengan innodb_ft_min_token_size
+
+    # Export settings
+    EXPORT_BATCH_SIZE: int = Field(default=1000)  # Jumlah baris per query saat export
+    EXPORT_WORKERS: int = Field(default=2)  # Worker job export background per proses
+    EXPORT_QUEUE_SIZE: int = Field(default=20)  # Maksimal job export yang menunggu di antrian
+    EXPORT_MAX_JOBS_PER_USER: int = Field(default=2)  # Maksimal job aktif (antri + jalan) per user di semua worker
+    EXPORT_HEARTBEAT_INTERVAL: int = Field(default=30)  # Interval (detik) worker memperbarui updated_at jobnya
+    EXPORT_JOB_STALE_AFTER: int = Field(default=180)  # Job aktif tanpa heartbeat selama ini (detik) dianggap terputus
+
+    # Infographic settings
+    INFOGRAPHIC_REFRESH_INTERVAL: int = Field(default=300)  # Interval (detik) rebuild penuh snapshot infografis
+    INFOGRAPHIC_QUERY_TIMEOUT: float = Field(default=30.0)  # Batas waktu (detik) per query section
+    INFOGRAPHIC_MAX_CONCURRENCY: int = Field(default=10)  # Maksimal query infografis paralel per proses
+
     # Settings config
     model_config = SettingsConfigDict(env_file=".env", env_file_encoding="utf-8", case_sensitive=True, extra="allow")
 
@@ -48,3 +48,22 @@ class UUID7Field(UUID):
 class YesNoEnum(str, Enum):
     Y = "Y"
     N = "N"
+
+
+class CountModeEnum(str, Enum):
+    EXACT = "exact"
+    ESTIMATE = "estimate"
+    NONE = "none"
+
+
+class ExportFormatEnum(str, Enum):
+    XLSX = "xlsx"
+    CSV = "csv"
+    PARQUET = "parquet"
+
+
+class ExportJobStatusEnum(str, Enum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
@@ -60,6 +60,20 @@ UnprocessableEntity = create_exception(
     "UnprocessableEntity", status.HTTP_422_UNPROCESSABLE_ENTITY, HTTPStatus.UNPROCESSABLE_ENTITY.description
 )
 
+TooManyRequestsException = create_exception(
+    "TooManyRequestsException", status.HTTP_429_TOO_MANY_REQUESTS, HTTPStatus.TOO_MANY_REQUESTS.description
+)
+
+ServiceUnavailableException = create_exception(
+    "ServiceUnavailableException", status.HTTP_503_SERVICE_UNAVAILABLE, HTTPStatus.SERVICE_UNAVAILABLE.description
+)
+
+RangeNotSatisfiableException = create_exception(
+    "RangeNotSatisfiableException",
+    status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE,
+    HTTPStatus.REQUESTED_RANGE_NOT_SATISFIABLE.description,
+)
+
 # Business Logic Exceptions
 DuplicateValueException = create_exception(
     "DuplicateValueException", status.HTTP_422_UNPROCESSABLE_ENTITY, "Duplicate value found"
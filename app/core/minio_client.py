@@ -1,11 +1,71 @@
-from typing import Any, BinaryIO, Dict, List, Optional, Tuple
+import logging
+import os
+import time
+from collections import OrderedDict
+from datetime import timedelta
+from functools import lru_cache
+from typing import Any, AsyncIterator, BinaryIO, Dict, List, Optional, Tuple
 from urllib.parse import urlparse
 
+from aiohttp import ClientSession, ClientTimeout, TCPConnector
+from aiohttp_retry import ExponentialRetry, RetryClient
 from fastapi import HTTPException, status
 from miniopy_async import Minio
 from miniopy_async.error import S3Error
 
 from app.core.config import settings
+from app.core.minio_transfer import (
+    PART_SIZE_METADATA,
+    ChecksumMismatchError,
+    MultipartTransfer,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class PresignedUrlCache:
+    """
+    Cache presigned URL per objek (dan varian header response-nya) di memori proses. URL dipakai
+    ulang sampai `margin` detik sebelum kedaluwarsa sehingga klien selalu menerima URL yang masih
+    cukup lama berlaku.
+    """
+
+    def __init__(self, max_size: int = 10000, margin: int = 60):
+        self.max_size = max_size
+        self.margin = margin
+        self._entries: "OrderedDict[Tuple[str, str], Tuple[str, float]]" = OrderedDict()
+
+    def get(self, object_name: str, variant: str = "") -> Optional[str]:
+        key = (object_name, variant)
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        url, refresh_at = entry
+        if time.monotonic() >= refresh_at:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return url
+
+    def set(self, object_name: str, url: str, expires_in: int, variant: str = "") -> None:
+        key = (object_name, variant)
+        self._entries[key] = (url, time.monotonic() + expires_in - self.margin)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, object_name: str) -> None:
+        for key in [key for key in self._entries if key[0] == object_name]:
+            del self._entries[key]
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+# Singleton instance
+presigned_url_cache = PresignedUrlCache(
+    max_size=settings.PRESIGNED_URL_CACHE_SIZE, margin=settings.PRESIGNED_URL_CACHE_MARGIN
+)
 
 
 class MinioClient:
@@ -14,14 +74,50 @@ class MinioClient:
     """
 
     def __init__(self):
+        # Minio hanya menerima host[:port]; MINIO_ENDPOINT_URL boleh ditulis dengan skema
         self.client = Minio(
-            endpoint=settings.MINIO_ENDPOINT_URL,
+            endpoint=urlparse(settings.MINIO_ENDPOINT_URL).netloc or settings.MINIO_ENDPOINT_URL,
             access_key=settings.MINIO_ROOT_USER,
             secret_key=settings.MINIO_ROOT_PASSWORD,
             secure=settings.MINIO_SECURE,
             region=settings.MINIO_REGION,
         )
         self.bucket_name = settings.MINIO_BUCKET_NAME
+        self.transfer = self._create_transfer(settings.MINIO_PART_SIZE)
+        self._bucket_ready = False
+
+    async def startup(self) -> None:
+        """
+        Dipanggil dari lifespan: buat pool koneksi bersama dan pastikan bucket ada.
+        Jika MinIO belum bisa dihubungi, bucket dicek ulang saat upload pertama.
+        """
+        # Sama dengan session bawaan miniopy, dengan pool yang lebih besar untuk transfer paralel
+        self.client.set_session(
+            RetryClient(
+                ClientSession(
+                    connector=TCPConnector(limit=settings.MINIO_MAX_CONNECTIONS),
+                    timeout=ClientTimeout(connect=300, sock_read=300),
+                ),
+                retry_options=ExponentialRetry(attempts=5, factor=0.2, statuses={500, 502, 503, 504}),
+            )
+        )
+        try:
+            await self.init_bucket()
+        except Exception as err:
+            logger.warning("Bucket MinIO %s belum siap: %s", self.bucket_name, err)
+
+    async def close(self) -> None:
+        await self.client.close_session()
+
+    def _create_transfer(self, part_size: int) -> MultipartTransfer:
+        return MultipartTransfer(
+            self.client,
+            self.bucket_name,
+            part_size=part_size,
+            concurrency=settings.MINIO_TRANSFER_CONCURRENCY,
+            retries=settings.MINIO_TRANSFER_RETRIES,
+            verify_etag=settings.MINIO_VERIFY_ETAG,
+        )
 
     async def init_bucket(self) -> None:
         """
@@ -33,12 +129,18 @@ class MinioClient:
                 # Set bucket policy agar dapat diakses publik jika diperlukan
                 # policy = {...}  # Define your policy if needed
                 # await self.client.set_bucket_policy(self.bucket_name, json.dumps(policy))
+            self._bucket_ready = True
         except S3Error as err:
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail=f"Error initializing MinIO bucket: {str(err)}",
             )
 
+    async def ensure_bucket(self) -> None:
+        """Cek bucket hanya jika belum dipastikan ada (normalnya sudah saat startup)."""
+        if not self._bucket_ready:
+            await self.init_bucket()
+
     async def upload_file(
         self,
         file_data: BinaryIO,
@@ -46,37 +148,39 @@ class MinioClient:
         content_type: str,
         content_length: int,
         metadata: Optional[Dict[str, str]] = None,
+        part_size: Optional[int] = None,
     ) -> str:
         """
         Upload file ke MinIO.
 
+        Data dibaca per part (read() boleh sync atau async); objek yang lebih besar dari
+        part_size dikirim sebagai multipart upload paralel (lihat MultipartTransfer).
+
         Args:
             file_data: File-like object untuk diupload
             object_name: Nama objek di MinIO
             content_type: Tipe konten file
+            content_length: Ukuran file, -1 jika belum diketahui (data tetap dibaca sampai EOF)
             metadata: Metadata tambahan untuk objek
+            part_size: Ukuran part multipart (default MINIO_PART_SIZE)
 
         Returns:
             URL objek yang telah diupload
         """
         try:
-            await self.init_bucket()
+            await self.ensure_bucket()
 
-            # Upload file
-            await self.client.put_object(
-                bucket_name=self.bucket_name,
-                object_name=object_name,
-                data=file_data,
-                length=content_length,
-                content_type=content_type,
-                metadata=metadata,
-            )
+            transfer = self._create_transfer(part_size) if part_size else self.transfer
+            await transfer.upload(file_data, object_name, content_type=content_type, metadata=metadata)
 
             # Generate URL
             url = await self.get_file_url(object_name)
             return url
 
-        except S3Error as err:
+        except (S3Error, ChecksumMismatchError) as err:
+            if isinstance(err, S3Error) and err.code == "NoSuchBucket":
+                # Bucket dihapus setelah startup; upload berikutnya membuatnya lagi
+                self._bucket_ready = False
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail=f"Error uploading file to MinIO: {str(err)}",
@@ -107,6 +211,58 @@ class MinioClient:
                 detail=f"Error retrieving file from MinIO: {str(err)}",
             )
 
+    async def stat_file(self, object_name: str) -> Dict[str, Any]:
+        """
+        Ambil info objek (ukuran, ETag, last modified, content type, metadata) tanpa isinya.
+
+        Args:
+            object_name: Nama objek di MinIO
+
+        Returns:
+            Object info
+        """
+        try:
+            stat = await self.client.stat_object(bucket_name=self.bucket_name, object_name=object_name)
+            return stat.__dict__
+        except S3Error as err:
+            if err.code == "NoSuchKey":
+                raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="File not found")
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Error retrieving file from MinIO: {str(err)}",
+            )
+
+    async def download_file(
+        self,
+        object_name: str,
+        offset: int = 0,
+        length: Optional[int] = None,
+        object_info: Optional[Dict[str, Any]] = None,
+    ) -> Tuple[AsyncIterator[bytes], Dict[str, Any]]:
+        """
+        Ambil file dari MinIO dengan range request paralel per part.
+
+        Args:
+            object_name: Nama objek di MinIO
+            offset: Byte awal
+            length: Jumlah byte (default sampai akhir objek)
+            object_info: Hasil stat_file jika sudah diambil, agar tidak stat ulang
+
+        Returns:
+            Tuple dari (iterator isi file, object info)
+        """
+        object_info = object_info or await self.stat_file(object_name)
+        part_size = (object_info.get("_metadata") or {}).get(PART_SIZE_METADATA)
+        content = self.transfer.download(
+            object_name,
+            object_info["_size"],
+            etag=object_info["_etag"],
+            offset=offset,
+            length=length,
+            upload_part_size=int(part_size) if part_size and part_size.isdigit() else None,
+        )
+        return content, object_info
+
     async def delete_file(self, object_name: str) -> bool:
         """
         Hapus file dari MinIO.
@@ -119,6 +275,7 @@ class MinioClient:
         """
         try:
             await self.client.remove_object(self.bucket_name, object_name)
+            presigned_url_cache.invalidate(object_name)
             return True
         except S3Error as err:
             if err.code == "NoSuchKey":
@@ -150,19 +307,55 @@ class MinioClient:
 
             return f"{protocol}://{host}/{self.bucket_name}/{object_name}"
 
-            # For presigned URL (time-limited access):
-            # return await self.client.presigned_get_object(
-            #     bucket_name=self.bucket_name,
-            #     object_name=object_name,
-            #     expires=timedelta(hours=1)
-            # )
+        except S3Error as err:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Error generating URL: {str(err)}",
+            )
+
+    async def get_presigned_url(
+        self, object_name: str, filename: Optional[str] = None, content_type: Optional[str] = None
+    ) -> str:
+        """
+        Dapatkan presigned URL (berlaku PRESIGNED_URL_EXPIRES detik) untuk download langsung dari MinIO.
+        URL memuat Content-Disposition dan Content-Type dari pemanggil dan disimpan di presigned_url_cache.
+        Metadata objek tidak dipakai untuk nama file karena objek bisa dipakai bersama beberapa upload.
+
+        Args:
+            object_name: Nama objek di MinIO
+            filename: Nama file download (default nama objek)
+            content_type: Content type download (default content type objek)
+
+        Returns:
+            Presigned URL
+        """
+        variant = f"{filename}\n{content_type}"
+        url = presigned_url_cache.get(object_name, variant)
+        if url:
+            return url
 
+        if content_type is None:
+            content_type = (await self.stat_file(object_name))["_content_type"]
+        filename = filename or os.path.basename(object_name)
+        try:
+            url = await self.client.presigned_get_object(
+                bucket_name=self.bucket_name,
+                object_name=object_name,
+                expires=timedelta(seconds=settings.PRESIGNED_URL_EXPIRES),
+                response_headers={
+                    "response-content-disposition": f'attachment; filename="{filename}"',
+                    "response-content-type": content_type or "application/octet-stream",
+                },
+            )
         except S3Error as err:
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail=f"Error generating URL: {str(err)}",
             )
 
+        presigned_url_cache.set(object_name, url, settings.PRESIGNED_URL_EXPIRES, variant)
+        return url
+
     async def list_files(self, prefix: str = "", recursive: bool = True) -> List[Dict[str, Any]]:
         """
         Daftar semua file di dalam bucket dengan prefix tertentu.
@@ -191,3 +384,9 @@ class MinioClient:
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail=f"Error listing files: {str(err)}",
             )
+
+
+@lru_cache
+def get_minio_client() -> MinioClient:
+    """MinioClient bersama untuk seluruh proses (satu pool koneksi, status bucket, dan cache region)."""
+    return MinioClient()
@@ -0,0 +1,60 @@
+import inspect
+from typing import Dict, List, Tuple
+
+from miniopy_async import Minio
+from miniopy_async.datatypes import Part
+
+# miniopy_async tidak punya API publik untuk upload per part, jadi MultipartTransfer memakai
+# method privat Minio. Semua panggilan privat hanya lewat MultipartApi; parameter wajib yang
+# diharapkan dicatat di sini dan dicek oleh test setiap kali versi miniopy_async berubah.
+MULTIPART_SIGNATURES: Dict[str, Tuple[str, ...]] = {
+    "_create_multipart_upload": ("bucket_name", "object_name", "headers"),
+    "_put_object": ("bucket_name", "object_name", "data", "headers"),
+    "_upload_part": ("bucket_name", "object_name", "data", "headers", "upload_id", "part_number"),
+    "_complete_multipart_upload": ("bucket_name", "object_name", "upload_id", "parts"),
+    "_abort_multipart_upload": ("bucket_name", "object_name", "upload_id"),
+}
+
+
+def multipart_api_mismatches(client_class: type = Minio) -> List[str]:
+    """Method multipart privat `client_class` yang hilang atau parameter wajibnya tidak sesuai."""
+    mismatches = []
+    for name, expected in MULTIPART_SIGNATURES.items():
+        method = getattr(client_class, name, None)
+        if method is None:
+            mismatches.append(f"{name}: tidak ada")
+            continue
+        parameters = list(inspect.signature(method).parameters.values())[1:]
+        required = tuple(p.name for p in parameters if p.default is inspect.Parameter.empty)
+        if required != expected:
+            mismatches.append(f"{name}{required}, seharusnya {expected}")
+    return mismatches
+
+
+class MultipartApi:
+    """Pembungkus tipis method multipart privat Minio untuk satu bucket."""
+
+    def __init__(self, client: Minio, bucket_name: str):
+        self.client = client
+        self.bucket_name = bucket_name
+
+    async def put(self, object_name: str, data: bytes, headers: Dict[str, str]):
+        """PUT satu objek utuh; return ObjectWriteResult."""
+        return await self.client._put_object(self.bucket_name, object_name, data, headers)
+
+    async def create(self, object_name: str, headers: Dict[str, str]) -> str:
+        """Mulai multipart upload; return upload id."""
+        return await self.client._create_multipart_upload(self.bucket_name, object_name, headers)
+
+    async def upload_part(
+        self, object_name: str, upload_id: str, part_number: int, data: bytes, headers: Dict[str, str]
+    ) -> str:
+        """Upload satu part; return ETag part."""
+        return await self.client._upload_part(self.bucket_name, object_name, data, headers, upload_id, part_number)
+
+    async def complete(self, object_name: str, upload_id: str, parts: List[Part]):
+        """Selesaikan multipart upload; return CompleteMultipartUploadResult."""
+        return await self.client._complete_multipart_upload(self.bucket_name, object_name, upload_id, parts)
+
+    async def abort(self, object_name: str, upload_id: str) -> None:
+        await self.client._abort_multipart_upload(self.bucket_name, object_name, upload_id)
@@ -0,0 +1,233 @@
+import asyncio
+import base64
+import hashlib
+import logging
+from collections import deque
+from typing import AsyncIterator, Awaitable, Callable, Dict, List, Optional, TypeVar
+
+from miniopy_async import Minio
+from miniopy_async.datatypes import Part
+from miniopy_async.helpers import genheaders
+
+from app.core.minio_compat import MultipartApi
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Range terkecil per request saat download, agar seek kecil tidak memicu banyak request
+MIN_DOWNLOAD_CHUNK = 256 * 1024
+# Metadata objek multipart berisi ukuran part upload, agar ETag multipart bisa dicek saat download
+PART_SIZE_METADATA = "x-amz-meta-part-size"
+
+
+class ChecksumMismatchError(IOError):
+    """Data part tidak sesuai dengan checksum yang diharapkan."""
+
+
+def _md5(data: bytes):
+    return hashlib.md5(data, usedforsecurity=False)
+
+
+def multipart_etag(digests: List[bytes]) -> str:
+    """ETag S3 untuk objek multipart: md5(gabungan md5 tiap part)-jumlah_part."""
+    return f"{_md5(b''.join(digests)).hexdigest()}-{len(digests)}"
+
+
+class MultipartTransfer:
+    """
+    Transfer paralel ke/dari MinIO per part.
+
+    Upload: data dibaca berurutan per part, part dikirim bersamaan dengan Content-MD5 dan ETag
+    part dicocokkan dengan md5 lokal. Part yang sedang dibaca ikut memakai slot, sehingga buffer
+    upload maksimal `concurrency` × `part_size` per objek.
+    Download: range request per part diambil bersamaan lalu dikeluarkan berurutan; buffer maksimal
+    `concurrency` range yang diambil ditambah satu yang sedang dikirim ke pemanggil.
+    Setiap part yang gagal diulang hingga `retries` kali sebelum seluruh transfer gagal.
+    """
+
+    def __init__(
+        self,
+        client: Minio,
+        bucket_name: str,
+        part_size: int,
+        concurrency: int = 4,
+        retries: int = 3,
+        verify_etag: bool = True,
+    ):
+        self.client = client
+        self.bucket_name = bucket_name
+        self.api = MultipartApi(client, bucket_name)
+        self.part_size = part_size
+        self.concurrency = max(concurrency, 1)
+        self.retries = retries
+        # ETag = md5 hanya berlaku tanpa enkripsi server-side; Content-MD5 tetap selalu dikirim
+        self.verify_etag = verify_etag
+
+    async def _retry(self, description: str, func: Callable[[], Awaitable[T]]) -> T:
+        for attempt in range(self.retries + 1):
+            try:
+                return await func()
+            except (ValueError, asyncio.CancelledError):
+                raise
+            except Exception as err:
+                if attempt >= self.retries:
+                    raise
+                logger.warning("Gagal %s (percobaan %d): %r", description, attempt + 1, err)
+                await asyncio.sleep(min(0.2 * 2**attempt, 5))
+
+    @staticmethod
+    async def _read(data, size: int) -> bytes:
+        """Baca tepat `size` byte (kurang hanya di akhir data); read() boleh sync atau async."""
+        buffer = bytearray()
+        while len(buffer) < size:
+            chunk = data.read(size - len(buffer))
+            if asyncio.iscoroutine(chunk):
+                chunk = await chunk
+            if not chunk:
+                break
+            buffer += chunk
+        return bytes(buffer)
+
+    async def upload(
+        self,
+        data,
+        object_name: str,
+        content_type: str,
+        metadata: Optional[Dict[str, str]] = None,
+    ) -> str:
+        """Upload data hingga EOF; objek yang muat dalam satu part dikirim dengan satu PUT. Return ETag objek."""
+        headers = genheaders(metadata, None, None, None, False)
+        headers["Content-Type"] = content_type or "application/octet-stream"
+
+        first = await self._read(data, self.part_size)
+        if len(first) < self.part_size:
+            return await self._retry(f"upload {object_name}", lambda: self._put(object_name, first, headers))
+
+        headers[PART_SIZE_METADATA] = str(self.part_size)
+        upload_id = await self.api.create(object_name, dict(headers))
+        semaphore = asyncio.Semaphore(self.concurrency)
+        # Slot untuk part pertama yang sudah dibaca
+        await semaphore.acquire()
+        tasks: List[asyncio.Task] = []
+
+        async def send(part_number: int, part: bytes) -> Part:
+            try:
+                return await self._retry(
+                    f"upload part {part_number} {object_name}",
+                    lambda: self._upload_part(object_name, upload_id, part_number, part),
+                )
+            finally:
+                semaphore.release()
+
+        try:
+            part, part_number = first, 1
+            while part:
+                tasks.append(asyncio.create_task(send(part_number, part)))
+                # Tunggu slot kosong sebelum membaca part berikutnya: maksimal `concurrency` part di memori
+                await semaphore.acquire()
+                for task in tasks:
+                    if task.done() and task.exception():
+                        raise task.exception()
+                part, part_number = await self._read(data, self.part_size), part_number + 1
+            semaphore.release()
+
+            parts = await asyncio.gather(*tasks)
+            result = await self.api.complete(object_name, upload_id, parts)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            await self.api.abort(object_name, upload_id)
+            raise
+
+        expected = multipart_etag([bytes.fromhex(part.etag) for part in parts]) if self.verify_etag else None
+        if expected and result.etag and result.etag != expected:
+            raise ChecksumMismatchError(f"ETag {object_name} {result.etag} tidak sesuai, seharusnya {expected}")
+        return result.etag
+
+    async def _put(self, object_name: str, body: bytes, headers: Dict[str, str]) -> str:
+        digest = _md5(body)
+        result = await self.api.put(
+            object_name, body, {**headers, "Content-MD5": base64.b64encode(digest.digest()).decode()}
+        )
+        self._verify_etag(object_name, result.etag, digest.hexdigest())
+        return result.etag
+
+    async def _upload_part(self, object_name: str, upload_id: str, part_number: int, body: bytes) -> Part:
+        digest = _md5(body)
+        etag = await self.api.upload_part(
+            object_name, upload_id, part_number, body, {"Content-MD5": base64.b64encode(digest.digest()).decode()}
+        )
+        self._verify_etag(f"{object_name} part {part_number}", etag, digest.hexdigest())
+        return Part(part_number, etag)
+
+    def _verify_etag(self, name: str, etag: str, md5_hex: str) -> None:
+        if self.verify_etag and etag and etag != md5_hex:
+            raise ChecksumMismatchError(f"ETag {name} {etag} tidak sesuai, seharusnya {md5_hex}")
+
+    def chunk_size(self, length: int) -> int:
+        """Ukuran range per request menyesuaikan panjang data: range kecil dibagi ke semua slot, maksimal part_size."""
+        return min(self.part_size, max(MIN_DOWNLOAD_CHUNK, -(-length // self.concurrency)))
+
+    async def download(
+        self,
+        object_name: str,
+        size: int,
+        etag: Optional[str] = None,
+        offset: int = 0,
+        length: Optional[int] = None,
+        upload_part_size: Optional[int] = None,
+    ) -> AsyncIterator[bytes]:
+        """
+        Keluarkan isi objek per part secara berurutan, mengambil hingga `concurrency` part sekaligus.
+        Jika seluruh objek diunduh, hasilnya dicocokkan dengan ETag (md5 atau ETag multipart).
+        ETag multipart hanya dicek jika `upload_part_size` (lihat PART_SIZE_METADATA) diketahui.
+        """
+        end = size if length is None else min(size, offset + length)
+        verify = etag if self.verify_etag and offset == 0 and end == size else None
+        multipart = bool(verify) and "-" in verify
+        if multipart and not upload_part_size:
+            verify, multipart = None, False
+        # ETag multipart hanya bisa dicek jika data dipecah tepat seperti part saat upload
+        part_size = upload_part_size if multipart else self.chunk_size(end - offset)
+        ranges = deque((start, min(part_size, end - start)) for start in range(offset, end, part_size))
+        whole, digests = _md5(b""), []
+        pending: deque = deque()
+
+        def schedule() -> None:
+            while ranges and len(pending) < self.concurrency:
+                start, part_length = ranges.popleft()
+                pending.append(asyncio.create_task(self._get_range(object_name, start, part_length)))
+
+        try:
+            schedule()
+            while pending:
+                chunk = await pending.popleft()
+                schedule()
+                if verify:
+                    whole.update(chunk)
+                    digests.append(_md5(chunk).digest())
+                yield chunk
+        finally:
+            for task in pending:
+                task.cancel()
+
+        if multipart:
+            if verify != multipart_etag(digests):
+                raise ChecksumMismatchError(f"ETag {object_name} {verify} tidak sesuai")
+        elif verify:
+            self._verify_etag(object_name, verify, whole.hexdigest())
+
+    async def _get_range(self, object_name: str, start: int, length: int) -> bytes:
+        async def fetch() -> bytes:
+            response = await self.client.get_object(self.bucket_name, object_name, offset=start, length=length)
+            try:
+                chunk = await response.read()
+            finally:
+                await response.release()
+            if len(chunk) != length:
+                raise IOError(f"Range {start}-{start + length - 1} {object_name}: {len(chunk)} dari {length} byte")
+            return chunk
+
+        return await self._retry(f"download {object_name} {start}", fetch)
@@ -0,0 +1,135 @@
+import base64
+from typing import Any, List, Mapping, NamedTuple, Optional, Sequence
+
+import orjson
+from sqlalchemy import and_, false, or_, true
+from sqlalchemy.sql import operators
+from sqlalchemy.sql.elements import ColumnElement, UnaryExpression
+
+from app.core.exceptions import ValidationException
+
+
+class SortKey(NamedTuple):
+    """Satu kolom urutan untuk keyset pagination."""
+
+    name: str
+    column: ColumnElement
+    descending: bool = False
+    nullable: bool = True
+
+    def order_by(self) -> UnaryExpression:
+        return self.column.desc() if self.descending else self.column.asc()
+
+
+class Page(tuple):
+    """
+    Hasil find_all yang tetap bisa di-unpack sebagai (items, total),
+    dengan informasi tambahan has_more dan next_cursor.
+    """
+
+    def __new__(
+        cls,
+        items: List[Any],
+        total: int,
+        has_more: bool = False,
+        next_cursor: Optional[str] = None,
+    ):
+        page = super().__new__(cls, (items, total))
+        page.has_more = has_more
+        page.next_cursor = next_cursor
+        return page
+
+    @property
+    def items(self) -> List[Any]:
+        return self[0]
+
+    @property
+    def total(self) -> int:
+        return self[1]
+
+
+def build_sort_keys(sort: Sequence[Any], primary_key: Any, key_of) -> List[SortKey]:
+    """
+    Ubah ekspresi ORDER BY dari _build_sort menjadi list SortKey.
+    Primary key selalu ditambahkan di akhir sebagai tie-breaker agar urutan stabil.
+    Kolom tanpa informasi nullable (mis. ekspresi) dianggap bisa NULL.
+    """
+    keys: List[SortKey] = []
+    for expression in sort:
+        if isinstance(expression, UnaryExpression):
+            column = expression.element
+            descending = expression.modifier is operators.desc_op
+        else:
+            column = expression
+            descending = False
+        keys.append(SortKey(key_of(column), column, descending, getattr(column, "nullable", True) is not False))
+
+    pk_name = key_of(primary_key)
+    if pk_name not in {key.name for key in keys}:
+        keys.append(SortKey(pk_name, primary_key, nullable=False))
+    return keys
+
+
+def encode_cursor(keys: Sequence[SortKey], record: Any) -> str:
+    """Encode nilai sort key dari record terakhir menjadi cursor opaque."""
+    if isinstance(record, Mapping):
+        values = [record.get(key.name) for key in keys]
+    else:
+        values = [getattr(record, key.name, None) for key in keys]
+
+    payload = orjson.dumps({"k": [key.name for key in keys], "v": values}, default=str)
+    return base64.urlsafe_b64encode(payload).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, keys: Sequence[SortKey]) -> List[Any]:
+    """Decode cursor dan pastikan cursor dibuat dengan urutan sort yang sama."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = orjson.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        names, values = payload["k"], payload["v"]
+    except (ValueError, TypeError, KeyError):
+        raise ValidationException("Invalid cursor")
+
+    if names != [key.name for key in keys] or len(values) != len(keys):
+        raise ValidationException("Cursor does not match the requested sort")
+    return values
+
+
+def _seek_equals(key: SortKey, value: Any) -> ColumnElement:
+    return key.column.is_(None) if value is None else key.column == value
+
+
+def _seek_after(key: SortKey, value: Any) -> ColumnElement:
+    """Baris setelah `value` pada satu kolom. NULL paling kecil (seperti MySQL): awal di ASC, akhir di DESC."""
+    if value is None:
+        return false() if key.descending else key.column.is_not(None)
+    if key.descending:
+        after = key.column < value
+        return or_(after, key.column.is_(None)) if key.nullable else after
+    return key.column > value
+
+
+def _seek_leading(key: SortKey, value: Any) -> ColumnElement:
+    """Batas range untuk kolom pertama agar index range scan tetap bisa dipakai."""
+    if value is None:
+        return key.column.is_(None) if key.descending else true()
+    if key.descending:
+        leading = key.column <= value
+        return or_(leading, key.column.is_(None)) if key.nullable else leading
+    return key.column >= value
+
+
+def build_seek_predicate(keys: Sequence[SortKey], values: Sequence[Any]) -> ColumnElement:
+    """
+    Bangun predicate keyset: (k1 > v1) OR (k1 = v1 AND k2 > v2) OR ...
+    Operator mengikuti arah sort tiap kolom. Kolom pertama juga dibatasi
+    dengan >= / <= agar index range scan tetap bisa dipakai.
+    Nilai cursor None (kolom nullable) memakai IS NULL / IS NOT NULL, jadi nilainya
+    harus berupa None asli, bukan bound parameter.
+    """
+    branches = []
+    for idx, key in enumerate(keys):
+        equals = [_seek_equals(keys[i], values[i]) for i in range(idx)]
+        branches.append(and_(*equals, _seek_after(key, values[idx])))
+
+    return and_(_seek_leading(keys[0], values[0]), or_(*branches))
@@ -3,6 +3,8 @@ from typing import Optional
 
 from fastapi import Query
 
+from app.core.data_types import CountModeEnum
+
 
 class CommonParams:
     def __init__(
@@ -13,6 +15,14 @@ class CommonParams:
         group_by: Optional[str] = Query(default=None),
         limit: int = Query(default=100, ge=1),
         offset: int = Query(default=0, ge=0),
+        cursor: Optional[str] = Query(
+            default=None,
+            description="Keyset pagination cursor. Kirim kosong untuk halaman pertama, lalu next_cursor dari respons.",
+        ),
+        count: CountModeEnum = Query(
+            default=CountModeEnum.EXACT,
+            description="exact: COUNT penuh, estimate: statistik/cache, none: tanpa total (has_more dari baris ekstra).",
+        ),
     ):
         if filter:
             try:
@@ -34,3 +44,5 @@ class CommonParams:
         self.group_by = group_by
         self.limit = limit
         self.offset = offset
+        self.cursor = cursor
+        self.count = count
@@ -0,0 +1,22 @@
+import re
+from typing import Optional
+
+from app.core.config import settings
+
+_TOKEN = re.compile(r"\w+", re.UNICODE)
+
+
+def build_boolean_query(term: str) -> Optional[str]:
+    """
+    Ubah kata kunci menjadi query MATCH ... AGAINST (BOOLEAN MODE): setiap kata wajib ada
+    dan dicocokkan sebagai prefix, mis. "hutan nag" -> "+hutan* +nag*".
+    Mengembalikan None jika kata kunci tidak cocok untuk index FULLTEXT
+    (hanya angka atau semua kata lebih pendek dari token minimum), sehingga pemanggil
+    kembali ke pencarian LIKE.
+    """
+    tokens = _TOKEN.findall(term or "")
+    if not tokens or all(token.isdigit() for token in tokens):
+        return None
+    if any(len(token) < settings.FULLTEXT_MIN_TOKEN_SIZE for token in tokens):
+        return None
+    return " ".join(f"+{token}*" for token in tokens)
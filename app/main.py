@@ -14,6 +14,12 @@ from sqlalchemy.exc import IntegrityError
 from app.api.v1 import router as api_router
 from app.core.config import settings
 from app.core.exceptions import APIException, prepare_error_response
+from app.core.minio_client import get_minio_client
+from app.services.export_job_service import export_jobs_heartbeat
+from app.services.export_runner import export_runner
+from app.services.image_processor import image_processor
+from app.services.infographic_store import infographic_store
+from app.utils.cache import cache_manager
 from app.utils.helpers import auth_from_jwt
 from app.utils.limiter import limiter
 from app.utils.system import optimize_system
@@ -22,7 +28,17 @@ from app.utils.system import optimize_system
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     await optimize_system()
+    await get_minio_client().startup()
+    cache_manager.start()
+    infographic_store.start()
+    export_runner.start(heartbeat=export_jobs_heartbeat)
+    image_processor.start()
     yield
+    image_processor.stop()
+    await export_runner.stop()
+    await infographic_store.stop()
+    await get_minio_client().close()
+    await cache_manager.stop()
 
 
 app = FastAPI(
@@ -12,7 +12,9 @@ from .business_service_model import BusinessServiceModel
 from .businesses_model import BusinessesModel
 from .commodity_model import CommodityModel
 from .economic_values_model import EconomicValueModel
+from .export_job_model import ExportJobModel
 from .farmer_incomes_model import IncomeModel
+from .file_blob_model import FileBlobModel
 from .file_model import FileModel
 from .forestry_area import ForestryAreaModel
 from .forestry_land_model import ForestryLandModel
@@ -39,6 +41,8 @@ __all__ = [
     "BusinessOperationalStatusModel",
     "BusinessServiceModel",
     "FileModel",
+    "FileBlobModel",
+    "ExportJobModel",
     "ForestrySchemaModel",
     "RefreshTokenModel",
     "RegionalModel",
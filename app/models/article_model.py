@@ -1,7 +1,17 @@
 from datetime import datetime
 
 from pytz import timezone
-from sqlalchemy import CHAR, BigInteger, Column, DateTime, Enum, Integer, String, Text
+from sqlalchemy import (
+    CHAR,
+    BigInteger,
+    Column,
+    DateTime,
+    Enum,
+    Index,
+    Integer,
+    String,
+    Text,
+)
 
 from app.core.config import settings
 
@@ -10,6 +20,11 @@ from .base import Base
 
 class ArticleModel(Base):
     __tablename__ = "articles"
+    __table_args__ = (Index("ft_articles_search", "article_title", "article_content", mysql_prefix="FULLTEXT"),)
+
+    # Kolom teks untuk pencarian FULLTEXT (harus sama dengan index ft_articles_search)
+    __searchable__ = ("title", "content")
+
     id = Column("id", Integer, primary_key=True, autoincrement=True, nullable=False)
 
     title = Column("article_title", String(128), nullable=False)
@@ -1,7 +1,17 @@
 from datetime import datetime
 
 from pytz import timezone
-from sqlalchemy import CHAR, JSON, Column, DateTime, Enum, Integer, String
+from sqlalchemy import (
+    CHAR,
+    JSON,
+    Column,
+    Computed,
+    DateTime,
+    Enum,
+    Index,
+    Integer,
+    String,
+)
 
 from app.core.config import settings
 from app.models.base import Base
@@ -14,6 +24,13 @@ class BusinessesModel(Base):
     """
 
     __tablename__ = "businesses"
+    __table_args__ = (
+        Index("ft_businesses_search", "kups_nama", "kups_nama_ketua", "kups_sk_no", mysql_prefix="FULLTEXT"),
+        Index("ix_businesses_kps_key", "fore_kps_key"),
+    )
+
+    # Kolom teks untuk pencarian FULLTEXT (harus sama dengan index ft_businesses_search)
+    __searchable__ = ("name", "chairman_name", "sk_number")
 
     # Primary Key
     id = Column("kups_id", CHAR(36), primary_key=True, index=True, default=generate_code(), comment="ID unik KUPS")
@@ -28,6 +45,12 @@ class BusinessesModel(Base):
     name = Column("kups_nama", String(256), comment="Nama KUPS")
 
     forestry_id = Column("fore_kps_id", CHAR(11), comment="ID kawasan perhutanan sosial")
+    forestry_key = Column(
+        "fore_kps_key",
+        CHAR(11),
+        Computed("UPPER(TRIM(fore_kps_id))", persisted=True),
+        comment="fore_kps_id ternormalisasi untuk join ke forestry",
+    )
 
     # Informasi legal dan pembentukan
     sk_number = Column("kups_sk_no", String(128), comment="Nomor SK pembentukan")
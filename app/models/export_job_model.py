@@ -0,0 +1,51 @@
+from datetime import datetime
+
+from pytz import timezone
+from sqlalchemy import (
+    CHAR,
+    JSON,
+    BigInteger,
+    Column,
+    DateTime,
+    Enum,
+    Index,
+    String,
+    Text,
+)
+from uuid6 import uuid7
+
+from app.core.config import settings
+from app.core.data_types import ExportJobStatusEnum
+
+from . import Base
+
+
+class ExportJobModel(Base):
+    """Job export background; file hasilnya disimpan di MinIO."""
+
+    __tablename__ = "export_jobs"
+    __table_args__ = (
+        Index("ix_export_jobs_user_status", "user_id", "status"),
+        Index("ix_export_jobs_status_updated", "status", "updated_at"),
+    )
+
+    id = Column(CHAR(36), primary_key=True, default=lambda: str(uuid7()))
+    user_id = Column(String(36), nullable=False)
+    resource = Column(String(64), nullable=False)
+    format = Column(String(16), nullable=False)
+    params = Column(JSON, nullable=True)
+    status = Column(
+        Enum(*[item.value for item in ExportJobStatusEnum], name="export_job_status_enum"),
+        default=ExportJobStatusEnum.QUEUED.value,
+        nullable=False,
+    )
+    object_name = Column(String(512), nullable=True)
+    size = Column(BigInteger, nullable=True)
+    error = Column(Text, nullable=True)
+
+    created_at = Column(DateTime(timezone=True), default=lambda: datetime.now(timezone(settings.TIMEZONE)))
+    started_at = Column(DateTime(timezone=True), nullable=True)
+    finished_at = Column(DateTime(timezone=True), nullable=True)
+    # Proses yang memegang job di antriannya; heartbeat updated_at diperbarui selama job aktif
+    worker_id = Column(String(128), nullable=True)
+    updated_at = Column(DateTime(timezone=True), nullable=True)
@@ -0,0 +1,22 @@
+from datetime import datetime
+
+from pytz import timezone
+from sqlalchemy import CHAR, BigInteger, Column, DateTime, Integer, String, text
+
+from app.core.config import settings
+
+from . import Base
+
+
+class FileBlobModel(Base):
+    """Objek MinIO yang disimpan sekali per isi (sha256) dan dipakai bersama oleh row `files`."""
+
+    __tablename__ = "file_blobs"
+
+    id = Column(BigInteger, primary_key=True, autoincrement=True)
+    content_hash = Column(CHAR(64), nullable=False, unique=True)
+    object_name = Column(String(512), nullable=False, unique=True)
+    # Jumlah row `files` yang memakai objek ini; objek dihapus saat referensi terakhir dilepas
+    ref_count = Column(Integer, nullable=False, default=1, server_default=text("1"))
+
+    created_at = Column(DateTime(timezone=True), default=lambda: datetime.now(timezone(settings.TIMEZONE)))
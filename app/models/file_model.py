@@ -1,7 +1,7 @@
 from datetime import datetime
 
 from pytz import timezone
-from sqlalchemy import BigInteger, Column, DateTime, Integer, String, Text
+from sqlalchemy import CHAR, BigInteger, Column, DateTime, Integer, String, Text
 
 from app.core.config import settings
 
@@ -13,12 +13,14 @@ class FileModel(Base):
 
     id = Column(BigInteger, primary_key=True, index=True, autoincrement=True)
     filename = Column(String(255), nullable=False, index=True)
-    object_name = Column(String(512), nullable=False, unique=True)
+    object_name = Column(String(512), nullable=False, index=True)
     content_type = Column(String(100), nullable=False)
     size = Column(Integer, nullable=False)
     description = Column(Text, nullable=True)
     url = Column(String(1024), nullable=False)
     user_id = Column(String(36))
+    # sha256 isi file; setiap upload punya row sendiri, objek MinIO-nya dipakai bersama (lihat FileBlobModel)
+    content_hash = Column(CHAR(64), nullable=True, index=True)
 
     created_at = Column(DateTime(timezone=True), default=datetime.now(timezone(settings.TIMEZONE)))
     modified_at = Column(
@@ -1,7 +1,18 @@
 from datetime import datetime
 
 from pytz import timezone
-from sqlalchemy import CHAR, JSON, Column, DateTime, Enum, Float, Integer, String
+from sqlalchemy import (
+    CHAR,
+    JSON,
+    Column,
+    Computed,
+    DateTime,
+    Enum,
+    Float,
+    Index,
+    Integer,
+    String,
+)
 
 from app.core.config import settings
 
@@ -10,6 +21,22 @@ from . import Base
 
 class ForestryProposalModel(Base):
     __tablename__ = "forestry"
+    __table_args__ = (
+        Index(
+            "ft_forestry_search",
+            "fore_name",
+            "fore_nama_ketua",
+            "fore_pps_sknagari",
+            "fore_sk_bupati",
+            "fore_sk_menlhk",
+            mysql_prefix="FULLTEXT",
+        ),
+        Index("ix_forestry_kps_key", "fore_kps_key", "fore_skema_key"),
+        Index("ix_forestry_skema_key", "fore_skema_key"),
+    )
+
+    # Kolom teks untuk pencarian FULLTEXT (harus sama dengan index ft_forestry_search)
+    __searchable__ = ("name", "head_name", "nagari_sk", "regent_sk", "forestry_sk")
 
     id = Column(
         "fore_kps_id",
@@ -28,6 +55,10 @@ class ForestryProposalModel(Base):
         "fore_skema_id",
         CHAR(4),
     )
+
+    # Kunci join ternormalisasi (stored generated column) agar join ke businesses bisa memakai index
+    kps_key = Column("fore_kps_key", CHAR(11), Computed("UPPER(TRIM(fore_kps_id))", persisted=True))
+    schema_key = Column("fore_skema_key", CHAR(4), Computed("UPPER(TRIM(fore_skema_id))", persisted=True))
     kph_account_id = Column(
         "kph_acc_id",
         CHAR(36),
@@ -9,6 +9,7 @@ from .business_service_repository import BusinessServiceRepository
 from .businesses_repository import BusinessesRepository
 from .commodity_repository import CommodityRepository
 from .economic_values_repository import EconomicValuesRepository
+from .export_job_repository import ExportJobRepository
 from .farmer_incomes_repository import FarmerIncomesRepository
 from .file_repository import FileRepository
 from .forestry_area_repository import ForestryAreaRepository
@@ -54,6 +55,7 @@ __all__ = [
     "FarmerIncomesRepository",
     "PiapsRecordsRepository",
     "EconomicValuesRepository",
+    "ExportJobRepository",
     "ArticleCommentRepository",
     "InfographicRepository",
     "MapsRepository",
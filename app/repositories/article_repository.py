@@ -1,9 +1,10 @@
-from typing import Any, List, Optional, Tuple, override
+from typing import Any, Dict, Hashable, List, Optional, Tuple, override
 
 from fastapi_async_sqlalchemy import db
-from sqlalchemy import Sequence, String, cast, func, select
+from sqlalchemy import Select, Sequence, func, select
 from sqlalchemy.orm import joinedload, selectinload
 
+from app.core.data_types import CountModeEnum
 from app.core.exceptions import NotFoundException
 from app.models import ArticleModel, ArticleRatingModel
 
@@ -65,6 +66,10 @@ class ArticleRepository(BaseRepository[ArticleModel]):
         offset: int = 0,
         relationships: Optional[List[str]] = None,
         searchable_columns: Optional[List[str]] = None,
+        cursor: Optional[str] = None,
+        count: str = CountModeEnum.EXACT,
+        shape: Optional[Hashable] = None,
+        params: Optional[Dict[str, Any]] = None,
     ) -> Tuple[List[ArticleModel], int]:
         """Optimized find_all method."""
 
@@ -72,40 +77,27 @@ class ArticleRepository(BaseRepository[ArticleModel]):
         sort = sort or []
         relationships = relationships or []
         searchable_columns = searchable_columns or []
+        params = self._list_params(params, search, searchable_columns)
+        shape = self._list_shape(shape, search, searchable_columns, group_by, relationships)
 
-        query = self.build_base_query().filter(*filters)
+        def build() -> Select:
+            query = self.build_base_query().filter(*filters)
 
-        # Optimized search
-        if search:
-            if searchable_columns:
-                search_conditions = [
-                    cast(getattr(self.model, col), String).ilike(f"%{search}%")
-                    for col in searchable_columns
-                    if hasattr(self.model, col)
-                ]
-            else:
-                search_conditions = [
-                    cast(getattr(self.model, col_name), String).ilike(f"%{search}%")
-                    for col_name in self.inspector.c.keys()
-                ]
+            if search:
+                search_clause = self._search_clause(search, searchable_columns)
+                if search_clause is not None:
+                    query = query.where(search_clause)
 
-            if search_conditions:
-                query = query.where(or_(*search_conditions))
+            if group_by:
+                query = query.group_by(getattr(self.model, group_by))
+            return query
 
-        if group_by:
-            query = query.group_by(getattr(self.model, group_by))
+        query = self._statement(shape, "query", build)
 
         # Count query
-        count_query = select(func.count()).select_from(query.subquery())
-        total = await self.session.scalar(count_query)
-        if total is None:
-            total = 0
-
-        # Data query
-        if sort:
-            query = query.order_by(*sort)
-        else:
-            query = query.order_by(self.model.id)
+        total = await self._count(query, count, params, shape)
+        # Selain count exact, has_more diambil dari baris ekstra
+        peek = count != CountModeEnum.EXACT
 
         if relationships:
             for rel in relationships:
@@ -116,12 +108,13 @@ class ArticleRepository(BaseRepository[ArticleModel]):
                     else:
                         query = query.options(joinedload(attr))
 
-        query = query.limit(limit).offset(offset)
-        result = await self.session.execute(query)
+        # Data query
+        query, keys = self._paginate(query, sort, limit, offset, cursor, peek, params, shape)
+        result = await self.session.execute(query, params)
         records_seq: Sequence[ArticleModel] = result.mappings().all()
         records: List[ArticleModel] = list(records_seq)
 
-        return records, total
+        return self._build_page(records, total, limit, offset, keys, peek)
 
     @override
     async def find_by_id(self, id: str, relationships: Optional[List[str]] = None) -> Optional[ArticleModel]:
@@ -1,14 +1,44 @@
-from typing import Any, Dict, Generic, List, Optional, Sequence, Tuple, Type, TypeVar
+import copy
+import hashlib
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Generic,
+    Hashable,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Type,
+    TypeVar,
+)
 
 from fastapi_async_sqlalchemy import db
-from sqlalchemy import String, cast
+from sqlalchemy import Select, String, bindparam, cast
 from sqlalchemy import delete as sqlalchemy_delete
-from sqlalchemy import func, inspect, or_, select
+from sqlalchemy import func, inspect, or_, select, text
 from sqlalchemy import update as sqlalchemy_update
+from sqlalchemy.dialects.mysql import match
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import joinedload, selectinload
+from sqlalchemy.orm.exc import UnmappedColumnError
+from sqlalchemy.sql.elements import ColumnElement
 
+from app.core.config import settings
+from app.core.data_types import CountModeEnum
 from app.core.database import Base
+from app.core.pagination import (
+    Page,
+    SortKey,
+    build_seek_predicate,
+    build_sort_keys,
+    decode_cursor,
+    encode_cursor,
+)
+from app.core.search import build_boolean_query
+from app.utils.cache import cache_manager
+from app.utils.statement_cache import statement_cache
 
 ModelType = TypeVar("ModelType", bound=Base)
 
@@ -26,6 +56,12 @@ class BaseRepository(Generic[ModelType]):
         """Get database session."""
         return self._session
 
+    def with_session(self, session: AsyncSession) -> "BaseRepository[ModelType]":
+        """Salinan repository yang memakai `session` lain, mis. session `db()` milik background task."""
+        repository = copy.copy(self)
+        repository._session = session
+        return repository
+
     def build_base_query(self, include_deleted: bool = False):
         """Build base query dengan soft delete handling."""
         query = select(self.model)
@@ -33,6 +69,221 @@ class BaseRepository(Generic[ModelType]):
             query = query.where(self.model.is_deleted.is_(False))
         return query
 
+    def _attribute_key(self, column: Any) -> str:
+        """Nama atribut model untuk kolom (mis. kolom 'kups_nama' -> 'name')."""
+        try:
+            return self.inspector.get_property_by_column(column).key
+        except UnmappedColumnError:
+            return column.key
+
+    def _statement(self, shape: Optional[Hashable], part: Hashable, build: Callable[[], Select]) -> Select:
+        """
+        Ambil Select dari statement cache berdasarkan bentuk query (shape) dan bagiannya.
+        Tanpa shape (mis. dipanggil langsung, bukan lewat BaseService) Select dibangun biasa.
+        """
+        if shape is None:
+            return build()
+        return statement_cache.get_or_build((type(self), self.model, shape, part), build)
+
+    def _list_shape(
+        self,
+        shape: Optional[Hashable],
+        search: str,
+        searchable_columns: List[str],
+        group_by: Optional[str],
+        relationships: List[str],
+    ) -> Optional[Hashable]:
+        """Lengkapi shape dari service dengan bagian yang ditentukan di repository."""
+        if shape is None:
+            return None
+        search_mode = self._search_mode(search, searchable_columns)
+        return (shape, search_mode, tuple(searchable_columns), group_by, tuple(relationships))
+
+    def _list_params(
+        self, params: Optional[Dict[str, Any]], search: str, searchable_columns: Optional[List[str]] = None
+    ) -> Dict[str, Any]:
+        params = dict(params or {})
+        search_mode = self._search_mode(search, searchable_columns or [])
+        if search_mode == "fulltext":
+            params["search"] = build_boolean_query(search)
+        elif search_mode == "like":
+            params["search"] = f"%{search}%"
+        return params
+
+    def _search_mode(self, search: str, searchable_columns: List[str]) -> Optional[str]:
+        """
+        Mode pencarian: "fulltext" (MATCH ... AGAINST memakai index FULLTEXT dari __searchable__)
+        atau "like" (CAST ... ILIKE, perilaku lama) sebagai fallback.
+        Fulltext hanya dipakai jika kolomnya sama dengan index dan kata kuncinya cocok untuk index.
+        """
+        if not search:
+            return None
+        searchable = getattr(self.model, "__searchable__", None)
+        if not settings.FULLTEXT_SEARCH or not searchable:
+            return "like"
+        if searchable_columns and set(searchable_columns) != set(searchable):
+            return "like"
+        return "fulltext" if build_boolean_query(search) else "like"
+
+    def _search_clause(
+        self, search: str, searchable_columns: List[str], columns: Optional[List[Any]] = None
+    ) -> Optional[ColumnElement]:
+        """Kondisi search dengan nilai dari bound parameter :search."""
+        term = bindparam("search")
+        if self._search_mode(search, searchable_columns) == "fulltext":
+            fulltext_columns = [getattr(self.model, col) for col in self.model.__searchable__]
+            return match(*fulltext_columns, against=term).in_boolean_mode()
+
+        if searchable_columns:
+            columns = [getattr(self.model, col) for col in searchable_columns if hasattr(self.model, col)]
+        elif columns is None:
+            columns = [getattr(self.model, col_name) for col_name in self.inspector.c.keys()]
+
+        conditions = [cast(column, String).ilike(term) for column in columns]
+        return or_(*conditions) if conditions else None
+
+    async def _count(
+        self,
+        query: Select,
+        count: str = CountModeEnum.EXACT,
+        params: Optional[Dict[str, Any]] = None,
+        shape: Optional[Hashable] = None,
+    ) -> Optional[int]:
+        """
+        Hitung total sesuai mode count.
+        - exact: COUNT(*) atas query tanpa kolom proyeksi (subquery JSON korelasi ikut dibuang).
+        - estimate: statistik tabel jika tanpa filter, selain itu count exact yang di-cache.
+        - none: tidak menghitung; has_more diambil dari baris ekstra.
+        """
+        if count == CountModeEnum.NONE:
+            return None
+
+        count_query = self._statement(
+            shape,
+            "count",
+            lambda: select(func.count()).select_from(query.with_only_columns(self.model.id).subquery()),
+        )
+        if count != CountModeEnum.ESTIMATE:
+            return await self.session.scalar(count_query, params) or 0
+
+        if query.whereclause is None:
+            estimate = await self._estimate_table_rows()
+            if estimate is not None:
+                return estimate
+
+        compiled = count_query.compile()
+        bound = {**compiled.params, **(params or {})}
+        digest = hashlib.sha1(f"{compiled}|{sorted(bound.items(), key=str)!r}".encode()).hexdigest()
+        key = f"count:{self.model.__tablename__}:{digest}"
+        total = await cache_manager.get(key)
+        if total is None:
+            total = await self.session.scalar(count_query, params) or 0
+            await cache_manager.set(key, total, ttl=settings.COUNT_CACHE_TTL)
+        return total
+
+    async def _estimate_table_rows(self) -> Optional[int]:
+        """Perkiraan jumlah baris dari statistik tabel MySQL (information_schema)."""
+        key = f"count:{self.model.__tablename__}:table_rows"
+        total = await cache_manager.get(key)
+        if total is None:
+            total = await self.session.scalar(
+                text(
+                    "SELECT TABLE_ROWS FROM information_schema.TABLES "
+                    "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = :table_name"
+                ),
+                {"table_name": self.model.__tablename__},
+            )
+            if total is None:
+                return None
+            total = int(total)
+            await cache_manager.set(key, total, ttl=settings.COUNT_CACHE_TTL)
+        return total
+
+    def _paginate(
+        self,
+        query: Select,
+        sort: List[Any],
+        limit: int,
+        offset: int,
+        cursor: Optional[str] = None,
+        peek: bool = False,
+        params: Optional[Dict[str, Any]] = None,
+        shape: Optional[Hashable] = None,
+    ) -> Tuple[Select, Optional[List[SortKey]]]:
+        """
+        Terapkan ORDER BY dan LIMIT.
+        Tanpa cursor memakai LIMIT/OFFSET, dengan cursor memakai keyset (seek) pagination
+        berdasarkan kolom sort + primary key. Cursor kosong berarti halaman pertama.
+        peek=True mengambil satu baris ekstra untuk menentukan has_more tanpa COUNT.
+        Jika params diberikan, limit/offset/nilai cursor dikirim sebagai bound parameter
+        sehingga Select-nya bisa di-cache per shape.
+        """
+        if cursor is None:
+            page_limit = limit + 1 if peek else limit
+            if params is not None:
+                params.update(_limit=page_limit, _offset=offset)
+                page_limit, offset = bindparam("_limit"), bindparam("_offset")
+
+            def build_offset() -> Select:
+                ordered = query.order_by(*sort) if sort else query.order_by(self.model.id)
+                return ordered.limit(page_limit).offset(offset)
+
+            return self._statement(shape, ("offset", peek), build_offset), None
+
+        keys = build_sort_keys(sort, self.model.id, self._attribute_key)
+        values = decode_cursor(cursor, keys) if cursor else None
+        # Nilai NULL mengubah bentuk predicate (IS NULL), jadi ikut menentukan statement
+        nulls = None if values is None else tuple(value is None for value in values)
+        page_limit = limit + 1
+        if params is not None:
+            params["_limit"] = page_limit
+            page_limit = bindparam("_limit")
+            if values is not None:
+                params.update({f"_k{idx}": value for idx, value in enumerate(values) if value is not None})
+                values = [None if value is None else bindparam(f"_k{idx}") for idx, value in enumerate(values)]
+
+        def build_keyset() -> Select:
+            seek = self._project_sort_keys(query, keys)
+            if values is not None:
+                seek = seek.where(build_seek_predicate(keys, values))
+            return seek.order_by(*[key.order_by() for key in keys]).limit(page_limit)
+
+        return self._statement(shape, ("cursor", nulls), build_keyset), keys
+
+    def _project_sort_keys(self, query: Select, keys: List[SortKey]) -> Select:
+        """
+        Tambahkan kolom sort yang tidak ada di proyeksi (select berlabel) agar nilainya
+        bisa dibaca encode_cursor dari record. Select entity model sudah memuat semua kolom.
+        """
+        descriptions = query.column_descriptions
+        if any(description["expr"] is self.model for description in descriptions):
+            return query
+        projected = {description["name"] for description in descriptions}
+        missing = [key.column.label(key.name) for key in keys if key.name not in projected]
+        return query.add_columns(*missing) if missing else query
+
+    def _build_page(
+        self,
+        records: List[Any],
+        total: Optional[int],
+        limit: int,
+        offset: int,
+        keys: Optional[List[SortKey]] = None,
+        peek: bool = False,
+    ) -> Page:
+        """
+        Bungkus hasil query menjadi Page, termasuk next_cursor untuk mode keyset.
+        has_more hanya dihitung dari total jika total exact; total estimate bisa meleset jauh,
+        jadi query tersebut mengambil baris ekstra (peek) dan has_more diambil dari sana.
+        """
+        if keys is None and not peek and total is not None:
+            return Page(records, total, has_more=total > (offset + limit))
+
+        has_more = len(records) > limit
+        records = records[:limit]
+        next_cursor = encode_cursor(keys, records[-1]) if keys and has_more else None
+        return Page(records, total, has_more=has_more, next_cursor=next_cursor)
+
     async def find_by_id(self, id: str, relationships: Optional[List[str]] = None) -> Optional[ModelType]:
         """Find record by ID dengan optional eager loading."""
         query = self.build_base_query().where(self.model.id == id)
@@ -59,47 +310,43 @@ class BaseRepository(Generic[ModelType]):
         offset: int = 0,
         relationships: Optional[List[str]] = None,
         searchable_columns: Optional[List[str]] = None,
-    ) -> Tuple[List[ModelType], int]:
-        """Optimized find_all method."""
+        cursor: Optional[str] = None,
+        count: str = CountModeEnum.EXACT,
+        shape: Optional[Hashable] = None,
+        params: Optional[Dict[str, Any]] = None,
+    ) -> Page:
+        """
+        Optimized find_all method.
+        shape/params diisi BaseService: filter memakai bound parameter sehingga
+        statement untuk bentuk query yang sama dipakai ulang dari statement cache.
+        """
 
         filters = filters or []
         sort = sort or []
         relationships = relationships or []
         searchable_columns = searchable_columns or []
+        params = self._list_params(params, search, searchable_columns)
+        shape = self._list_shape(shape, search, searchable_columns, group_by, relationships)
 
-        query = self.build_base_query().filter(*filters)
+        def build() -> Select:
+            query = self.build_base_query().filter(*filters)
 
-        # Optimized search
-        if search:
-            if searchable_columns:
-                search_conditions = [
-                    cast(getattr(self.model, col), String).ilike(f"%{search}%")
-                    for col in searchable_columns
-                    if hasattr(self.model, col)
-                ]
-            else:
-                search_conditions = [
-                    cast(getattr(self.model, col_name), String).ilike(f"%{search}%")
-                    for col_name in self.inspector.c.keys()
-                ]
+            # Optimized search
+            if search:
+                search_clause = self._search_clause(search, searchable_columns)
+                if search_clause is not None:
+                    query = query.where(search_clause)
 
-            if search_conditions:
-                query = query.where(or_(*search_conditions))
+            if group_by:
+                query = query.group_by(getattr(self.model, group_by))
+            return query
 
-        if group_by:
-            query = query.group_by(getattr(self.model, group_by))
+        query = self._statement(shape, "query", build)
 
         # Count query
-        count_query = select(func.count()).select_from(query.subquery())
-        total = await self.session.scalar(count_query)
-        if total is None:
-            total = 0
-
-        # Data query
-        if sort:
-            query = query.order_by(*sort)
-        else:
-            query = query.order_by(self.model.id)
+        total = await self._count(query, count, params, shape)
+        # Selain count exact, has_more diambil dari baris ekstra
+        peek = count != CountModeEnum.EXACT
 
         if relationships:
             for rel in relationships:
@@ -110,12 +357,13 @@ class BaseRepository(Generic[ModelType]):
                     else:
                         query = query.options(joinedload(attr))
 
-        query = query.limit(limit).offset(offset)
-        result = await self.session.execute(query)
+        # Data query
+        query, keys = self._paginate(query, sort, limit, offset, cursor, peek, params, shape)
+        result = await self.session.execute(query, params)
         records_seq: Sequence[ModelType] = result.scalars().all()
         records: List[ModelType] = list(records_seq)
 
-        return records, total
+        return self._build_page(records, total, limit, offset, keys, peek)
 
     async def create(self, data: Dict[str, Any]) -> ModelType:
         """Create new record."""
@@ -1,22 +1,24 @@
-import json
-from typing import Any, Dict, List, Optional, Tuple, override
+from typing import Any, Dict, Hashable, List, Optional, Tuple, override
 
-from sqlalchemy import JSON, Select, String, cast, func, or_, select
-from sqlalchemy.orm import aliased, joinedload, selectinload
+from sqlalchemy import Select, select
+from sqlalchemy.orm import joinedload, selectinload
 
-from app.models import (
-    BusinessClassModel,
-    BusinessesModel,
-    BusinessOperationalStatusModel,
-    ForestryAreaModel,
-    ForestryProposalModel,
-    ForestrySchemaModel,
-    ProposalforestryStatusModel,
-    RegionalModel,
-    UserModel,
-)
+from app.core.data_types import CountModeEnum
+from app.core.pagination import Page
+from app.models import BusinessesModel
 
 from . import BaseRepository
+from .hydration import (
+    attach_forestry_users,
+    fetch_business_classes,
+    fetch_operational_statuses,
+    fetch_users,
+    hydrate_forestries,
+    json_values,
+    pick,
+    pick_many,
+)
+from .projections import cached_select
 
 
 class BusinessesRepository(BaseRepository[BusinessesModel]):
@@ -26,404 +28,73 @@ class BusinessesRepository(BaseRepository[BusinessesModel]):
     def _mapping(self, record: dict) -> dict:
         if not record:
             return {}
-
-        json_fields = [
-            "account_users",
-            "business_class",
-            "operational_status",
-            "forestry",
-        ]
-
-        temp = dict(record)
-        for field in json_fields:
-            value = temp.get(field)
-            if isinstance(value, str):
-                try:
-                    temp[field] = json.loads(value)
-                except (json.JSONDecodeError, TypeError):
-                    temp[field] = value
-
-        return temp
+        return dict(record)
 
     def _build_query(self) -> Select:
-        user_alias = aliased(UserModel)
-        class_alias = aliased(BusinessClassModel)
-        operational_status_alias = aliased(BusinessOperationalStatusModel)
-        forestry_alias = aliased(ForestryProposalModel)
-        area_alias = aliased(ForestryAreaModel)
-
-        account_users_subq = (
-            select(
-                func.coalesce(
-                    func.json_arrayagg(
-                        func.json_object(
-                            "id",
-                            user_alias.id,
-                            "name",
-                            user_alias.name,
-                            "email",
-                            user_alias.email,
-                            "phone",
-                            user_alias.phone,
-                            "agency_name",
-                            user_alias.agency_name,
-                            "agency_type",
-                            user_alias.agency_type,
-                            "avatar",
-                            user_alias.avatar,
-                            "enable",
-                            user_alias.enable,
-                            "role_id",
-                            user_alias.role_id,
-                            "is_verified",
-                            user_alias.is_verified,
-                        )
-                    ),
-                    func.cast("[]", JSON),
-                )
-            )
-            .select_from(user_alias)
-            .where(
-                func.json_contains(
-                    self.model.account_ids,
-                    func.json_quote(func.cast(user_alias.id, String)),
-                )
-            )
-            .correlate(self.model)
-            .scalar_subquery()
-        )
-
-        business_class_subq = (
-            select(
-                func.coalesce(
-                    func.json_object(
-                        "id",
-                        class_alias.id,
-                        "name",
-                        class_alias.name,
-                        "type",
-                        class_alias.type,
-                    ),
-                    func.cast("{}", JSON),
-                )
-            )
-            .select_from(class_alias)
-            .where(self.model.class_id == class_alias.type)
-            .correlate(self.model)
-            .scalar_subquery()
-        )
-        operational_subq = (
-            select(
-                func.coalesce(
-                    func.json_object(
-                        "id",
-                        operational_status_alias.id,
-                        "name",
-                        operational_status_alias.name,
-                        "type",
-                        operational_status_alias.type,
-                        "notes",
-                        operational_status_alias.notes,
-                    ),
-                    func.cast("{}", JSON),
-                )
-            )
-            .select_from(operational_status_alias)
-            .where(self.model.operational_status_id == operational_status_alias.type)
-            .correlate(self.model)
-            .scalar_subquery()
-        )
-
-        assist_users_subq = (
-            select(
-                func.coalesce(
-                    func.json_arrayagg(
-                        func.json_object(
-                            "id",
-                            user_alias.id,
-                            "name",
-                            user_alias.name,
-                            "email",
-                            user_alias.email,
-                            "phone",
-                            user_alias.phone,
-                            "agency_name",
-                            user_alias.agency_name,
-                            "agency_type",
-                            user_alias.agency_type,
-                            "avatar",
-                            user_alias.avatar,
-                            "enable",
-                            user_alias.enable,
-                            "role_id",
-                            user_alias.role_id,
-                            "is_verified",
-                            user_alias.is_verified,
-                        )
-                    ),
-                    func.cast("[]", JSON),
-                )
-            )
-            .select_from(user_alias)
-            .where(
-                func.json_search(
-                    forestry_alias.assist_account_id,
-                    "one",
-                    func.cast(user_alias.id, String),
-                ).isnot(None)
-            )
-            .correlate(forestry_alias)
-            .scalar_subquery()
-        )
-
-        area_subq = (
-            select(
-                func.json_arrayagg(
-                    func.json_object(
-                        "id",
-                        area_alias.id,
-                        "name",
-                        area_alias.name,
-                        "abbreviation",
-                        area_alias.abbreviation,
-                    )
-                )
-            )
-            .select_from(area_alias)
-            .where(
-                func.json_contains(
-                    forestry_alias.kh_id,
-                    func.json_quote(area_alias.abbreviation),
-                )
-            )
-            .correlate(forestry_alias)
-            .scalar_subquery()
+        return cached_select((type(self), self.model), self._compose_query)
+
+    def _compose_query(self) -> Select:
+        """
+        Hanya kolom dasar business. Relasi (account_users, business_class,
+        operational_status, forestry) di-resolve per halaman oleh _hydrate.
+        """
+        return select(
+            self.model.id.label("id"),
+            self.model.status.label("status"),
+            self.model.name.label("name"),
+            self.model.forestry_id.label("forestry_id"),
+            self.model.sk_number.label("sk_number"),
+            self.model.establishment_year.label("establishment_year"),
+            self.model.member_count.label("member_count"),
+            self.model.chairman_name.label("chairman_name"),
+            self.model.chairman_contact.label("chairman_contact"),
+            self.model.latitude.label("latitude"),
+            self.model.longitude.label("longitude"),
+            self.model.capital_id.label("capital_id"),
+            self.model.operational_status_id.label("operational_status_id"),
+            self.model.operational_period_id.label("operational_period_id"),
+            self.model.class_id.label("class_id"),
+            self.model.is_validated.label("is_validated"),
+            self.model.capital_provider_name.label("capital_provider_name"),
+            self.model.capital_provision_type.label("capital_provision_type"),
+            self.model.capital_provision_type_other.label("capital_provision_type_other"),
+            self.model.capital_repayment_period.label("capital_repayment_period"),
+            self.model.created_by.label("created_by"),
+            self.model.updated_by.label("updated_by"),
+            self.model.created_at.label("created_at"),
+            self.model.updated_at.label("updated_at"),
+            self.model.account_ids.label("account_ids"),
+        ).select_from(self.model)
+
+    async def _hydrate(self, records: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Lengkapi satu halaman business dengan relasinya menggunakan query batch
+        (satu query per relasi), bukan subquery berkorelasi per baris.
+        """
+        if not records:
+            return records
+
+        account_ids = {id(record): json_values(record.pop("account_ids", None)) for record in records}
+
+        classes = await fetch_business_classes(self.session, (record["class_id"] for record in records))
+        statuses = await fetch_operational_statuses(
+            self.session, (record["operational_status_id"] for record in records)
         )
-
-        regional_subq = (
-            select(
-                func.json_object(
-                    "id",
-                    RegionalModel.id,
-                    "name",
-                    RegionalModel.name,
-                    "parent",
-                    RegionalModel.parent,
-                    "group",
-                    RegionalModel.group,
-                    "created_at",
-                    RegionalModel.created_at,
-                    "created_by",
-                    RegionalModel.created_by,
-                )
-            )
-            .select_from(RegionalModel)
-            .where(RegionalModel.id == forestry_alias.regional_id)
-            .correlate(forestry_alias)
-            .scalar_subquery()
-        )
-
-        vertex_subq = (
-            select(
-                func.json_object(
-                    "id",
-                    ProposalforestryStatusModel.id,
-                    "name",
-                    ProposalforestryStatusModel.name,
-                    "proposal_forestry_vertex",
-                    ProposalforestryStatusModel.proposal_forestry_vertex,
-                    "description",
-                    ProposalforestryStatusModel.description,
-                )
-            )
-            .select_from(ProposalforestryStatusModel)
-            .where(ProposalforestryStatusModel.proposal_forestry_vertex == forestry_alias.vertex)
-            .correlate(forestry_alias)
-            .scalar_subquery()
+        forestries, forestry_user_ids = await hydrate_forestries(
+            self.session, (record["forestry_id"] for record in records)
         )
-
-        kph_account_subq = (
-            select(
-                func.json_object(
-                    "id",
-                    user_alias.id,
-                    "name",
-                    user_alias.name,
-                    "email",
-                    user_alias.email,
-                    "phone",
-                    user_alias.phone,
-                    "agency_name",
-                    user_alias.agency_name,
-                    "agency_type",
-                    user_alias.agency_type,
-                    "avatar",
-                    user_alias.avatar,
-                    "enable",
-                    user_alias.enable,
-                    "role_id",
-                    user_alias.role_id,
-                    "is_verified",
-                    user_alias.is_verified,
-                )
-            )
-            .select_from(user_alias)
-            .where(user_alias.id == forestry_alias.kph_account_id)
-            .correlate(forestry_alias)
-            .scalar_subquery()
+        users = await fetch_users(
+            self.session,
+            [user_id for ids in account_ids.values() for user_id in ids] + forestry_user_ids,
         )
+        attach_forestry_users(forestries, users)
 
-        schema_subq = (
-            select(
-                func.json_object(
-                    "schema_id",
-                    func.min(ForestrySchemaModel.schema_id),
-                    "name",
-                    func.min(ForestrySchemaModel.name),
-                    "description",
-                    func.min(ForestrySchemaModel.description),
-                    "ord",
-                    func.min(ForestrySchemaModel.ord),
-                )
-            )
-            .select_from(ForestrySchemaModel)
-            .where(ForestrySchemaModel.schema_id == forestry_alias.schema_id)
-            .correlate(forestry_alias)
-            .scalar_subquery()
-        )
-
-        forestry_subq = (
-            select(
-                func.coalesce(
-                    func.json_object(
-                        "id",
-                        forestry_alias.id,
-                        "name",
-                        forestry_alias.name,
-                        "regional_id",
-                        forestry_alias.regional_id,
-                        "kph_account_id",
-                        forestry_alias.kph_account_id,
-                        "schema_id",
-                        forestry_alias.schema_id,
-                        "area",
-                        forestry_alias.area,
-                        "household_count",
-                        forestry_alias.household_count,
-                        "head_name",
-                        forestry_alias.head_name,
-                        "head_contact",
-                        forestry_alias.head_contact,
-                        "map_ps",
-                        forestry_alias.map_ps,
-                        "pps_id",
-                        forestry_alias.pps_id,
-                        "vertex",
-                        forestry_alias.vertex,
-                        "status",
-                        forestry_alias.status,
-                        "nagari_sk",
-                        forestry_alias.nagari_sk,
-                        "regent_sk",
-                        forestry_alias.regent_sk,
-                        "forestry_sk",
-                        forestry_alias.forestry_sk,
-                        "is_valid",
-                        forestry_alias.is_valid,
-                        "request_year",
-                        forestry_alias.request_year,
-                        "release_year",
-                        forestry_alias.release_year,
-                        "is_kps_valid",
-                        forestry_alias.is_kps_valid,
-                        "created_by",
-                        forestry_alias.created_by,
-                        "updated_by",
-                        forestry_alias.updated_by,
-                        "created_at",
-                        forestry_alias.created_at,
-                        "updated_at",
-                        forestry_alias.updated_at,
-                        "regional",
-                        regional_subq,
-                        "schema",
-                        schema_subq,
-                        "kph_account",
-                        kph_account_subq,
-                        "vertex_detail",
-                        vertex_subq,
-                        "kh_detail",
-                        area_subq,
-                        "assist_accounts",
-                        assist_users_subq,
-                    ),
-                    func.cast("{}", JSON),
-                )
-            )
-            .select_from(forestry_alias)
-            .where(self.model.forestry_id == forestry_alias.id)
-            .outerjoin(
-                ProposalforestryStatusModel,
-                forestry_alias.vertex == ProposalforestryStatusModel.proposal_forestry_vertex,
-            )
-            .outerjoin(
-                RegionalModel,
-                forestry_alias.regional_id == RegionalModel.id,
-            )
-            .outerjoin(
-                ForestrySchemaModel,
-                forestry_alias.schema_id == ForestrySchemaModel.schema_id,
-            )
-            .outerjoin(
-                user_alias,
-                forestry_alias.kph_account_id == user_alias.id,
-            )
-            .correlate(self.model)
-            .scalar_subquery()
-        )
-
-        return (
-            select(
-                self.model.id.label("id"),
-                self.model.status.label("status"),
-                self.model.name.label("name"),
-                self.model.forestry_id.label("forestry_id"),
-                self.model.sk_number.label("sk_number"),
-                self.model.establishment_year.label("establishment_year"),
-                self.model.member_count.label("member_count"),
-                self.model.chairman_name.label("chairman_name"),
-                self.model.chairman_contact.label("chairman_contact"),
-                self.model.latitude.label("latitude"),
-                self.model.longitude.label("longitude"),
-                self.model.capital_id.label("capital_id"),
-                self.model.operational_status_id.label("operational_status_id"),
-                self.model.operational_period_id.label("operational_period_id"),
-                self.model.class_id.label("class_id"),
-                self.model.is_validated.label("is_validated"),
-                self.model.capital_provider_name.label("capital_provider_name"),
-                self.model.capital_provision_type.label("capital_provision_type"),
-                self.model.capital_provision_type_other.label("capital_provision_type_other"),
-                self.model.capital_repayment_period.label("capital_repayment_period"),
-                self.model.created_by.label("created_by"),
-                self.model.updated_by.label("updated_by"),
-                self.model.created_at.label("created_at"),
-                self.model.updated_at.label("updated_at"),
-                account_users_subq.label("account_users"),
-                business_class_subq.label("business_class"),
-                operational_subq.label("operational_status"),
-                forestry_subq.label("forestry"),
-            )
-            .select_from(self.model)
-            .outerjoin(
-                class_alias,
-                self.model.class_id == class_alias.id,
-            )
-            .outerjoin(
-                operational_status_alias,
-                self.model.operational_status_id == operational_status_alias.id,
-            )
-            .group_by(self.model.id)
-        )
+        for record in records:
+            record["account_users"] = pick_many(users, account_ids[id(record)])
+            record["business_class"] = pick(classes, record["class_id"])
+            record["operational_status"] = pick(statuses, record["operational_status_id"])
+            record["forestry"] = pick(forestries, record["forestry_id"])
+        return records
 
     @override
     async def find_all(
@@ -437,42 +108,35 @@ class BusinessesRepository(BaseRepository[BusinessesModel]):
         relationships: Optional[List[str]] = None,
         searchable_columns: Optional[List[str]] = None,
         all: bool = False,
+        cursor: Optional[str] = None,
+        count: str = CountModeEnum.EXACT,
+        shape: Optional[Hashable] = None,
+        params: Optional[Dict[str, Any]] = None,
     ) -> Tuple[List[BusinessesModel], int]:
         filters = filters or []
         sort = sort or []
         relationships = relationships or []
         searchable_columns = searchable_columns or []
+        params = self._list_params(params, search, searchable_columns)
+        shape = self._list_shape(shape, search, searchable_columns, group_by, relationships)
 
-        query = self._build_query().filter(*filters)
-
-        if search:
-            if searchable_columns:
-                search_conditions = [
-                    cast(getattr(self.model, col), String).ilike(f"%{search}%")
-                    for col in searchable_columns
-                    if hasattr(self.model, col)
-                ]
-            else:
-                search_conditions = [
-                    cast(getattr(self.model, col_name), String).ilike(f"%{search}%")
-                    for col_name in self.inspector.c.keys()
-                ]
+        def build() -> Select:
+            query = self._build_query().filter(*filters)
 
-            if search_conditions:
-                query = query.where(or_(*search_conditions))
+            if search:
+                search_clause = self._search_clause(search, searchable_columns)
+                if search_clause is not None:
+                    query = query.where(search_clause)
 
-        if group_by:
-            query = query.group_by(getattr(self.model, group_by))
+            if group_by:
+                query = query.group_by(getattr(self.model, group_by))
+            return query
 
-        count_query = select(func.count()).select_from(query.subquery())
-        total = await self.session.scalar(count_query)
-        if total is None:
-            total = 0
+        query = self._statement(shape, "query", build)
 
-        if sort:
-            query = query.order_by(*sort)
-        else:
-            query = query.order_by(self.model.id)
+        total = await self._count(query, count, params, shape)
+        # Selain count exact, has_more diambil dari baris ekstra
+        peek = count != CountModeEnum.EXACT
 
         if relationships:
             for rel in relationships:
@@ -482,14 +146,19 @@ class BusinessesRepository(BaseRepository[BusinessesModel]):
                         query = query.options(selectinload(attr))
                     else:
                         query = query.options(joinedload(attr))
-        if not all:
-            query = query.limit(limit).offset(offset)
+        keys = None
+        if all:
+            query = query.order_by(*sort) if sort else query.order_by(self.model.id)
+        else:
+            query, keys = self._paginate(query, sort, limit, offset, cursor, peek, params, shape)
 
-        result = await self.session.execute(query)
+        result = await self.session.execute(query, params)
         records_seq = result.mappings().all()
-        records = [self._mapping(record) for record in records_seq]
+        records = await self._hydrate([self._mapping(record) for record in records_seq])
 
-        return records, total
+        if all:
+            return Page(records, len(records) if total is None else total)
+        return self._build_page(records, total, limit, offset, keys, peek)
 
     @override
     async def find_by_id(self, id: str, relationships: Optional[List[str]] = None) -> Optional[BusinessesModel]:
@@ -507,7 +176,10 @@ class BusinessesRepository(BaseRepository[BusinessesModel]):
         result = await self.session.execute(query)
         result = result.mappings().first()
 
-        return self._mapping(result) if result else None
+        if not result:
+            return None
+        records = await self._hydrate([self._mapping(result)])
+        return records[0]
 
     @override
     async def create(self, data: Dict[str, Any]) -> BusinessesModel:
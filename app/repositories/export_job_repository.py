@@ -0,0 +1,66 @@
+from datetime import datetime
+from typing import Any, Optional
+
+from sqlalchemy import func, or_, select, update
+
+from app.core.data_types import ExportJobStatusEnum
+from app.models import ExportJobModel
+
+from . import BaseRepository
+
+# Status job yang belum selesai (masih memakai jatah job aktif user)
+ACTIVE_STATUSES = (ExportJobStatusEnum.QUEUED.value, ExportJobStatusEnum.RUNNING.value)
+
+
+class ExportJobRepository(BaseRepository[ExportJobModel]):
+    def __init__(self, model):
+        super().__init__(model)
+
+    async def count_active(self, user_id: str) -> int:
+        """Jumlah job queued/running milik user (memakai index ix_export_jobs_user_status)."""
+        query = (
+            select(func.count())
+            .select_from(self.model)
+            .where(self.model.user_id == user_id, self.model.status.in_(ACTIVE_STATUSES))
+        )
+        return await self.session.scalar(query) or 0
+
+    async def set_status(self, id: str, worker_id: str, status: ExportJobStatusEnum, **fields: Any) -> bool:
+        """Ubah status job yang masih aktif dan dipegang `worker_id`; False jika job sudah ditandai failed."""
+        query = (
+            update(self.model)
+            .where(
+                self.model.id == id,
+                self.model.worker_id == worker_id,
+                self.model.status.in_(ACTIVE_STATUSES),
+            )
+            .values(status=status.value, **fields)
+        )
+        result = await self.session.execute(query)
+        await self.session.commit()
+        return result.rowcount > 0
+
+    async def touch(self, worker_id: str, now: datetime) -> int:
+        """Heartbeat: perbarui updated_at semua job queued/running yang dipegang `worker_id`."""
+        query = (
+            update(self.model)
+            .where(self.model.worker_id == worker_id, self.model.status.in_(ACTIVE_STATUSES))
+            .values(updated_at=now)
+        )
+        result = await self.session.execute(query)
+        await self.session.commit()
+        return result.rowcount
+
+    async def fail_stale(self, stale_before: datetime, error: str, finished_at: Optional[datetime]) -> int:
+        """Tandai failed job queued/running yang heartbeat terakhirnya sebelum `stale_before`."""
+        query = (
+            update(self.model)
+            .where(
+                self.model.status.in_(ACTIVE_STATUSES),
+                or_(self.model.updated_at.is_(None), self.model.updated_at < stale_before),
+            )
+            .values(status=ExportJobStatusEnum.FAILED.value, error=error, finished_at=finished_at)
+        )
+        result = await self.session.execute(query)
+        await self.session.commit()
+        return result.rowcount
@@ -1,7 +1,10 @@
+from typing import Awaitable, Callable, List, Optional
+
 from fastapi_async_sqlalchemy import db
-from sqlalchemy import select
+from sqlalchemy import delete, select, update
+from sqlalchemy.exc import IntegrityError
 
-from app.models import FileModel
+from app.models import FileBlobModel, FileModel
 
 from . import BaseRepository
 
@@ -19,3 +22,90 @@ class FileRepository(BaseRepository[FileModel]):
         query = select(self.model).where(self.model.object_name == object_name)
         result = await db.session.execute(query)
         return result.scalars().first()
+
+    async def find_by_object_name_for_user(self, object_name: str, user_id: str) -> Optional[FileModel]:
+        query = (
+            select(self.model)
+            .where(self.model.object_name == object_name, self.model.user_id == user_id)
+            .order_by(self.model.id)
+        )
+        result = await db.session.execute(query)
+        return result.scalars().first()
+
+    async def find_by_ids(self, ids: List[int], user_id: str) -> List[FileModel]:
+        query = select(self.model).where(self.model.id.in_(ids), self.model.user_id == user_id)
+        result = await db.session.execute(query)
+        return result.scalars().all()
+
+    async def find_by_user_and_prefix(self, user_id: str, prefix: str, limit: int) -> List[FileModel]:
+        query = (
+            select(self.model)
+            .where(self.model.user_id == user_id, self.model.object_name.startswith(prefix, autoescape=True))
+            .order_by(self.model.id)
+            .limit(limit)
+        )
+        result = await db.session.execute(query)
+        return result.scalars().all()
+
+    async def add_reference(self, content_hash: str) -> Optional[FileBlobModel]:
+        """
+        Tambah ref_count blob dengan hash ini tanpa commit; row blob tetap terkunci sampai row
+        file baru di-commit (atau di-rollback). None jika blob belum ada.
+        """
+        result = await db.session.execute(
+            update(FileBlobModel)
+            .where(FileBlobModel.content_hash == content_hash)
+            .values(ref_count=FileBlobModel.ref_count + 1)
+            .execution_options(synchronize_session=False)
+        )
+        if result.rowcount == 0:
+            # Akhiri transaksi agar gap lock dari UPDATE tidak tertahan selama upload ke MinIO
+            await db.session.rollback()
+            return None
+        query = select(FileBlobModel).where(FileBlobModel.content_hash == content_hash)
+        return (await db.session.execute(query.execution_options(populate_existing=True))).scalars().first()
+
+    async def create_blob(self, content_hash: str, object_name: str) -> Optional[FileBlobModel]:
+        """Tambah blob baru (ref_count=1) tanpa commit; None jika upload paralel lebih dulu menyimpan hash ini."""
+        blob = FileBlobModel(content_hash=content_hash, object_name=object_name, ref_count=1)
+        db.session.add(blob)
+        try:
+            await db.session.flush()
+        except IntegrityError:
+            await db.session.rollback()
+            return None
+        return blob
+
+    async def release_reference(self, id: int, on_last: Callable[[str], Awaitable[None]]) -> bool:
+        """
+        Hapus row file dan lepas referensinya ke blob. Pada referensi terakhir, on_last(object_name)
+        (hapus objek) dijalankan sebelum commit dan selama row blob masih terkunci, sehingga upload
+        isi yang sama menunggu lalu mengupload ulang objeknya. Row lama tanpa content_hash memiliki
+        objeknya sendiri. Return True jika objek ikut dihapus.
+        """
+        try:
+            file = (await db.session.execute(select(self.model).where(self.model.id == id))).scalars().first()
+            if file is None:
+                return False
+            await db.session.execute(delete(self.model).where(self.model.id == id))
+
+            if file.content_hash is not None:
+                await db.session.execute(
+                    update(FileBlobModel)
+                    .where(FileBlobModel.content_hash == file.content_hash)
+                    .values(ref_count=FileBlobModel.ref_count - 1)
+                    .execution_options(synchronize_session=False)
+                )
+                query = select(FileBlobModel).where(FileBlobModel.content_hash == file.content_hash)
+                blob = (await db.session.execute(query.execution_options(populate_existing=True))).scalars().first()
+                if blob is None or blob.ref_count > 0:
+                    await db.session.commit()
+                    return False
+                await db.session.execute(delete(FileBlobModel).where(FileBlobModel.id == blob.id))
+
+            await on_last(file.object_name)
+            await db.session.commit()
+            return True
+        except Exception:
+            await db.session.rollback()
+            raise
@@ -0,0 +1,219 @@
+"""
+Batch hydration (dataloader) untuk relasi yang sebelumnya di-embed sebagai
+subquery JSON berkorelasi. Setiap relasi di-resolve dengan satu query IN (...)
+per halaman, lalu digabungkan di Python.
+"""
+
+import json
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple, Type
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.database import Base
+from app.models import (
+    BusinessClassModel,
+    BusinessOperationalStatusModel,
+    ForestryAreaModel,
+    ForestryProposalModel,
+    ForestrySchemaModel,
+    ProposalforestryStatusModel,
+    RegionalModel,
+    UserModel,
+)
+
+from .projections import (
+    BUSINESS_CLASS_FIELDS,
+    FORESTRY_AREA_FIELDS,
+    FORESTRY_FIELDS,
+    FORESTRY_SCHEMA_FIELDS,
+    OPERATIONAL_STATUS_FIELDS,
+    REGIONAL_FIELDS,
+    USER_FIELDS,
+    VERTEX_FIELDS,
+)
+
+# Batas jumlah nilai per IN (...) agar query tetap wajar saat export (all=True)
+IN_CHUNK_SIZE = 1000
+
+
+def normalize_key(value: Any) -> Optional[str]:
+    """
+    Key pembanding yang meniru perbandingan MySQL: CHAR tanpa trailing space,
+    collation case-insensitive, dan kolom integer vs CHAR.
+    """
+    if value is None:
+        return None
+    key = str(value).strip().lower()
+    return key or None
+
+
+def json_values(value: Any) -> List[str]:
+    """Ambil semua nilai skalar dari kolom JSON (list/dict/string JSON) sebagai string."""
+    if value is None:
+        return []
+    if isinstance(value, (bytes, str)):
+        try:
+            value = json.loads(value)
+        except (json.JSONDecodeError, TypeError):
+            return [value.decode() if isinstance(value, bytes) else value]
+    if isinstance(value, dict):
+        value = list(value.values())
+    if isinstance(value, list):
+        values: List[str] = []
+        for item in value:
+            values.extend(json_values(item) if isinstance(item, (list, dict)) else [str(item)])
+        return values
+    return [str(value)]
+
+
+def _unique(values: Iterable[Any]) -> List[Any]:
+    seen = set()
+    result = []
+    for value in values:
+        key = normalize_key(value)
+        if key is not None and key not in seen:
+            seen.add(key)
+            result.append(value)
+    return result
+
+
+async def fetch_by_keys(
+    session: AsyncSession,
+    model: Type[Base],
+    key_field: str,
+    keys: Iterable[Any],
+    fields: Sequence[str],
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Ambil baris model dengan satu query IN (...) per chunk dan kembalikan
+    dict {normalize_key(key_field): {field: value}}. Baris pertama menang jika key duplikat.
+    """
+    keys = _unique(keys)
+    if not keys:
+        return {}
+
+    key_column = getattr(model, key_field)
+    columns = [getattr(model, field).label(field) for field in fields]
+    if key_field not in fields:
+        columns.append(key_column.label("_key"))
+
+    loaded: Dict[str, Dict[str, Any]] = {}
+    for start in range(0, len(keys), IN_CHUNK_SIZE):
+        chunk = keys[start : start + IN_CHUNK_SIZE]
+        result = await session.execute(select(*columns).where(key_column.in_(chunk)))
+        for row in result.mappings().all():
+            data = dict(row)
+            key = normalize_key(data.pop("_key", None) if key_field not in fields else data[key_field])
+            loaded.setdefault(key, data)
+    return loaded
+
+
+async def fetch_forestry_schemas(session: AsyncSession, schema_ids: Iterable[Any]) -> Dict[str, Dict[str, Any]]:
+    """Skema perhutanan; MIN() per kolom seperti subquery aslinya."""
+    schema_ids = _unique(schema_ids)
+    loaded: Dict[str, Dict[str, Any]] = {}
+    for start in range(0, len(schema_ids), IN_CHUNK_SIZE):
+        chunk = schema_ids[start : start + IN_CHUNK_SIZE]
+        result = await session.execute(
+            select(*[func.min(getattr(ForestrySchemaModel, field)).label(field) for field in FORESTRY_SCHEMA_FIELDS])
+            .where(ForestrySchemaModel.schema_id.in_(chunk))
+            .group_by(ForestrySchemaModel.schema_id)
+        )
+        for row in result.mappings().all():
+            loaded[normalize_key(row["schema_id"])] = dict(row)
+    return loaded
+
+
+def pick(lookup: Dict[str, Dict[str, Any]], value: Any, default: Any = None) -> Any:
+    return lookup.get(normalize_key(value), default)
+
+
+def pick_many(lookup: Dict[str, Dict[str, Any]], values: Iterable[Any]) -> List[Dict[str, Any]]:
+    """Ambil beberapa baris sesuai urutan values (tanpa duplikat, yang tidak ada dilewati)."""
+    return [lookup[key] for key in _unique_keys(values) if key in lookup]
+
+
+def _unique_keys(values: Iterable[Any]) -> List[str]:
+    return [normalize_key(value) for value in _unique(values)]
+
+
+async def hydrate_forestries(
+    session: AsyncSession,
+    forestry_ids: Iterable[Any],
+) -> Tuple[Dict[str, Dict[str, Any]], List[str]]:
+    """
+    Resolve object forestry lengkap (regional, schema, kph_account, vertex_detail,
+    kh_detail, assist_accounts) untuk sekumpulan forestry id.
+
+    Mengembalikan (forestry_lookup, user_ids) di mana user_ids adalah user yang masih
+    perlu di-resolve; pemanggil menggabungkannya dengan user lain dalam satu query,
+    lalu memanggil attach_forestry_users.
+    """
+    forestry_rows = await fetch_by_keys(
+        session,
+        ForestryProposalModel,
+        "id",
+        forestry_ids,
+        FORESTRY_FIELDS + ("kh_id", "assist_account_id"),
+    )
+    rows = list(forestry_rows.values())
+    if not rows:
+        return {}, []
+
+    regionals = await fetch_by_keys(
+        session, RegionalModel, "id", (row["regional_id"] for row in rows), REGIONAL_FIELDS
+    )
+    schemas = await fetch_forestry_schemas(session, (row["schema_id"] for row in rows))
+    vertices = await fetch_by_keys(
+        session,
+        ProposalforestryStatusModel,
+        "proposal_forestry_vertex",
+        (row["vertex"] for row in rows),
+        VERTEX_FIELDS,
+    )
+    areas = await fetch_by_keys(
+        session,
+        ForestryAreaModel,
+        "abbreviation",
+        (abbreviation for row in rows for abbreviation in json_values(row["kh_id"])),
+        FORESTRY_AREA_FIELDS,
+    )
+
+    empty_schema = {field: None for field in FORESTRY_SCHEMA_FIELDS}
+    user_ids: List[str] = []
+    for row in rows:
+        kh_detail = pick_many(areas, json_values(row.pop("kh_id")))
+        assist_ids = json_values(row.pop("assist_account_id"))
+        row["_assist_ids"] = assist_ids
+        user_ids.extend(assist_ids)
+        if row["kph_account_id"] is not None:
+            user_ids.append(row["kph_account_id"])
+
+        row["regional"] = pick(regionals, row["regional_id"])
+        row["schema"] = pick(schemas, row["schema_id"], dict(empty_schema))
+        row["kph_account"] = None
+        row["vertex_detail"] = pick(vertices, row["vertex"])
+        row["kh_detail"] = kh_detail or None
+        row["assist_accounts"] = []
+
+    return forestry_rows, user_ids
+
+
+def attach_forestry_users(forestries: Dict[str, Dict[str, Any]], users: Dict[str, Dict[str, Any]]) -> None:
+    """Isi kph_account dan assist_accounts setelah user di-resolve."""
+    for row in forestries.values():
+        row["kph_account"] = pick(users, row["kph_account_id"])
+        row["assist_accounts"] = pick_many(users, row.pop("_assist_ids", []))
+
+
+async def fetch_users(session: AsyncSession, user_ids: Iterable[Any]) -> Dict[str, Dict[str, Any]]:
+    return await fetch_by_keys(session, UserModel, "id", user_ids, USER_FIELDS)
+
+
+async def fetch_business_classes(session: AsyncSession, class_ids: Iterable[Any]) -> Dict[str, Dict[str, Any]]:
+    return await fetch_by_keys(session, BusinessClassModel, "type", class_ids, BUSINESS_CLASS_FIELDS)
+
+
+async def fetch_operational_statuses(session: AsyncSession, status_ids: Iterable[Any]) -> Dict[str, Dict[str, Any]]:
+    return await fetch_by_keys(session, BusinessOperationalStatusModel, "type", status_ids, OPERATIONAL_STATUS_FIELDS)
@@ -46,23 +46,23 @@ class InfographicRepository:
             WITH
                 ps AS (
                 SELECT
-                    UPPER(TRIM(f.fore_skema_id))                 AS schema_code,
+                    f.fore_skema_key                             AS schema_code,
                     COUNT(DISTINCT f.fore_kps_id)                AS total_ps_units,
                     COALESCE(SUM(f.fore_jumlah_kk),0)            AS total_households,
                     COALESCE(SUM(f.fore_luas),0)                 AS total_area_ha
                 FROM forestry f
                 --   WHERE f.fore_kps_valid = 'Y'
-                GROUP BY UPPER(TRIM(f.fore_skema_id))
+                GROUP BY f.fore_skema_key
                 ),
                 kups AS (
                 SELECT
-                    UPPER(TRIM(f.fore_skema_id))                 AS schema_code,
+                    f.fore_skema_key                             AS schema_code,
                     COUNT(DISTINCT b.kups_id)                    AS total_kups_units
                 FROM forestry f
                 JOIN businesses b
-                    ON UPPER(TRIM(b.fore_kps_id)) = UPPER(TRIM(f.fore_kps_id))
+                    ON b.fore_kps_key = f.fore_kps_key
                 --   WHERE f.fore_kps_valid = 'Y'
-                GROUP BY UPPER(TRIM(f.fore_skema_id))
+                GROUP BY f.fore_skema_key
                 )
                 SELECT
                     s.nama_skema                                       AS schema_name,
@@ -87,14 +87,14 @@ class InfographicRepository:
             WITH
                 ps AS (
                     SELECT
-                        UPPER(TRIM(f.fore_kps_id)) AS kps_id,
-                        UPPER(TRIM(f.fore_skema_id)) AS scheme
+                        f.fore_kps_key AS kps_id,
+                        f.fore_skema_key AS scheme
                     FROM forestry f
                     --   WHERE f.fore_kps_valid = 'Y'
                 ),
                 bk AS (
                     SELECT
-                        UPPER(TRIM(b.fore_kps_id)) AS kps_id,
+                        b.fore_kps_key AS kps_id,
                         COALESCE(NULLIF(TRIM(sbc.nama_kelas_kups),''), 'KUPS Not Registered') AS class_name,
                         b.kups_id
                     FROM businesses b
@@ -168,7 +168,7 @@ class InfographicRepository:
                     JOIN businesses b
                     ON b.kups_id = bp.kups_id
                     JOIN forestry f
-                    ON UPPER(TRIM(f.fore_kps_id)) = UPPER(TRIM(b.fore_kps_id)))  AS commodity_types,
+                    ON f.fore_kps_key = b.fore_kps_key)  AS commodity_types,
 
                 /* 4) PS Groups (units) */
                 (SELECT COUNT(DISTINCT f.fore_kps_id)
@@ -178,7 +178,7 @@ class InfographicRepository:
                 (SELECT COUNT(DISTINCT b.kups_id)
                     FROM businesses b
                     JOIN forestry f
-                    ON UPPER(TRIM(f.fore_kps_id)) = UPPER(TRIM(b.fore_kps_id)))  AS kups_groups;
+                    ON f.fore_kps_key = b.fore_kps_key)  AS kups_groups;
 
             """
         )
@@ -238,7 +238,7 @@ class InfographicRepository:
                 b.kups_id
             FROM businesses_product bp
             JOIN businesses b  ON b.kups_id = bp.kups_id
-            JOIN forestry f    ON UPPER(TRIM(f.fore_kps_id)) = UPPER(TRIM(b.fore_kps_id))
+            JOIN forestry f    ON f.fore_kps_key = b.fore_kps_key
             LEFT JOIN komoditas k ON k.komoditas_id = bp.komoditas_id
             LEFT JOIN regional  r ON r.reg_id = f.reg_id
             ),
@@ -270,14 +270,14 @@ class InfographicRepository:
             """
             WITH ps AS (
                 SELECT
-                    UPPER(TRIM(f.fore_kps_id)) AS kps_id,
+                    f.fore_kps_key AS kps_id,
                     r.reg_name                 AS regency_name
                 FROM forestry f
                 LEFT JOIN regional r ON r.reg_id = f.reg_id
                 ),
                 biz AS (
                 SELECT
-                    UPPER(TRIM(b.fore_kps_id)) AS kps_id,
+                    b.fore_kps_key AS kps_id,
                     b.kups_id,
                     /* Map class to English; NULL/unknown -> Unregistered */
                     CASE UPPER(TRIM(sbc.nama_kelas_kups))
@@ -316,13 +316,13 @@ class InfographicRepository:
             WITH agg AS (
                 SELECT
                     r.reg_name                               AS regency_name,
-                    UPPER(TRIM(f.fore_skema_id))             AS scheme_code,   -- e.g. HA, HKM, HN, HTR, KK
+                    f.fore_skema_key                         AS scheme_code,   -- e.g. HA, HKM, HN, HTR, KK
                     COUNT(DISTINCT f.fore_kps_id)            AS kps_count
                 FROM forestry f
                 LEFT JOIN regional r ON r.reg_id = f.reg_id
                 /* Optional: only validated units
                     WHERE f.fore_kps_valid = 'Y' */
-                GROUP BY r.reg_name, UPPER(TRIM(f.fore_skema_id))
+                GROUP BY r.reg_name, f.fore_skema_key
                 )
                 SELECT
                 regency_name,
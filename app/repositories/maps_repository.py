@@ -1,9 +1,22 @@
+import hashlib
+
 from fastapi_async_sqlalchemy import db
 from sqlalchemy import text
 
+from app.core.config import settings
+from app.core.data_types import CountModeEnum
+from app.core.pagination import Page
+from app.utils.cache import cache_manager
+
 
 class MapsRepository:
-    async def get_all(self, filters: dict = None, limit: int = 100, offset: int = 0):
+    async def get_all(
+        self,
+        filters: dict = None,
+        limit: int = 100,
+        offset: int = 0,
+        count: str = CountModeEnum.EXACT,
+    ):
         base_query = """
             SELECT
                 adm.nama_kab AS district_name,
@@ -68,13 +81,12 @@ class MapsRepository:
             base_query += " AND " + " AND ".join(filter_clauses)
 
         # Query for total count
-        count_query = f"SELECT COUNT(*) FROM ({base_query}) AS subquery"
-        count_result = await db.session.execute(text(count_query), params)
-        total = count_result.scalar() or 0
+        total = await self._count(base_query, params, count)
 
-        # Query for paginated data
+        # Query for paginated data; selain count=exact mengambil satu baris ekstra untuk has_more
+        peek = count != CountModeEnum.EXACT
         paginated_query = base_query + " LIMIT :limit OFFSET :offset"
-        params["limit"] = limit
+        params["limit"] = limit + 1 if peek else limit
         params["offset"] = offset
 
         query = text(paginated_query)
@@ -82,4 +94,26 @@ class MapsRepository:
         rows = result.fetchall()
         columns = result.keys()
         items = [dict(zip(columns, row)) for row in rows]
-        return items, total
+
+        if peek:
+            return Page(items[:limit], total, has_more=len(items) > limit)
+        return Page(items, total, has_more=total > (offset + limit))
+
+    async def _count(self, base_query: str, params: dict, count: str):
+        """COUNT(*) atas base query; count=estimate memakai hasil yang di-cache."""
+        if count == CountModeEnum.NONE:
+            return None
+
+        count_query = f"SELECT COUNT(*) FROM ({base_query}) AS subquery"
+        if count != CountModeEnum.ESTIMATE:
+            count_result = await db.session.execute(text(count_query), params)
+            return count_result.scalar() or 0
+
+        digest = hashlib.sha1(f"{base_query}|{sorted(params.items())!r}".encode()).hexdigest()
+        key = f"count:maps:{digest}"
+        total = await cache_manager.get(key)
+        if total is None:
+            count_result = await db.session.execute(text(count_query), params)
+            total = count_result.scalar() or 0
+            await cache_manager.set(key, total, ttl=settings.COUNT_CACHE_TTL)
+        return total
@@ -0,0 +1,243 @@
+"""
+Registry proyeksi JSON bersama untuk sub-object user, forestry, business, dst.
+
+Ekspresi sub-object dibangun sekali saat import, dan Select lengkap per repository
+di-cache oleh cached_select. Select SQLAlchemy immutable (filter/where/order_by
+menghasilkan objek baru) sehingga aman dipakai ulang lintas request, dan cache key
+milik sub-ekspresi yang sama ikut di-memoize sehingga lookup ke compiled cache engine
+tidak perlu menelusuri ulang seluruh proyeksi.
+"""
+
+from typing import Any, Callable, Dict, Hashable, Sequence
+
+from sqlalchemy import JSON, Select, String, func, select
+from sqlalchemy.orm import aliased
+from sqlalchemy.sql.elements import ColumnElement
+
+from app.models import (
+    BusinessClassModel,
+    BusinessesModel,
+    BusinessOperationalStatusModel,
+    CommodityModel,
+    ForestryAreaModel,
+    ForestryProposalModel,
+    ForestrySchemaModel,
+    ProposalforestryStatusModel,
+    RegionalModel,
+    UserModel,
+)
+
+USER_FIELDS = (
+    "id",
+    "name",
+    "email",
+    "phone",
+    "agency_name",
+    "agency_type",
+    "avatar",
+    "enable",
+    "role_id",
+    "is_verified",
+)
+BUSINESS_CLASS_FIELDS = ("id", "name", "type")
+OPERATIONAL_STATUS_FIELDS = ("id", "name", "type", "notes")
+REGIONAL_FIELDS = ("id", "name", "parent", "group", "created_at", "created_by")
+VERTEX_FIELDS = ("id", "name", "proposal_forestry_vertex", "description")
+FORESTRY_AREA_FIELDS = ("id", "name", "abbreviation")
+FORESTRY_SCHEMA_FIELDS = ("schema_id", "name", "description", "ord")
+FORESTRY_FIELDS = (
+    "id",
+    "name",
+    "regional_id",
+    "kph_account_id",
+    "schema_id",
+    "area",
+    "household_count",
+    "head_name",
+    "head_contact",
+    "map_ps",
+    "pps_id",
+    "vertex",
+    "status",
+    "nagari_sk",
+    "regent_sk",
+    "forestry_sk",
+    "is_valid",
+    "request_year",
+    "release_year",
+    "is_kps_valid",
+    "created_by",
+    "updated_by",
+    "created_at",
+    "updated_at",
+)
+BUSINESS_FIELDS = (
+    "id",
+    "status",
+    "name",
+    "forestry_id",
+    "sk_number",
+    "establishment_year",
+    "member_count",
+    "chairman_name",
+    "chairman_contact",
+    "latitude",
+    "longitude",
+    "capital_id",
+    "operational_status_id",
+    "operational_period_id",
+    "class_id",
+    "is_validated",
+    "capital_provider_name",
+    "capital_provision_type",
+    "capital_provision_type_other",
+    "capital_repayment_period",
+    "created_by",
+    "updated_by",
+    "created_at",
+    "updated_at",
+)
+COMMODITY_FIELDS = (
+    "id",
+    "name",
+    "local_name",
+    "latin_name",
+    "type_code",
+    "description",
+    "photo",
+    "status",
+)
+
+EMPTY_JSON_ARRAY = func.cast("[]", JSON)
+EMPTY_JSON_OBJECT = func.cast("{}", JSON)
+
+_statements: Dict[Hashable, Select] = {}
+
+
+def json_object(entity: Any, fields: Sequence[str], **extra: ColumnElement) -> ColumnElement:
+    """JSON_OBJECT('field', entity.field, ...) ditambah pasangan key/ekspresi tambahan."""
+    pairs = []
+    for field in fields:
+        pairs.extend((field, getattr(entity, field)))
+    for key, expression in extra.items():
+        pairs.extend((key, expression))
+    return func.json_object(*pairs)
+
+
+def scalar_object(entity: Any, fields: Sequence[str], where: ColumnElement, correlate: Any, **extra):
+    """Subquery skalar satu object JSON, '{}' bila kosong (sesuai query lama)."""
+    return (
+        select(func.coalesce(json_object(entity, fields, **extra), EMPTY_JSON_OBJECT))
+        .select_from(entity)
+        .where(where)
+        .correlate(correlate)
+        .scalar_subquery()
+    )
+
+
+def users_by_json_ids(ids_column: Any, correlate: Any, search: bool = False):
+    """Array user yang id-nya ada di kolom JSON ids_column; '[]' bila kosong."""
+    user = aliased(UserModel)
+    if search:
+        condition = func.json_search(ids_column, "one", func.cast(user.id, String)).isnot(None)
+    else:
+        condition = func.json_contains(ids_column, func.json_quote(func.cast(user.id, String)))
+    return (
+        select(func.coalesce(func.json_arrayagg(json_object(user, USER_FIELDS)), EMPTY_JSON_ARRAY))
+        .select_from(user)
+        .where(condition)
+        .correlate(correlate)
+        .scalar_subquery()
+    )
+
+
+def forestry_relations(forestry: Any) -> Dict[str, Any]:
+    """Sub-object relasi forestry (regional, schema, kph_account, ...) yang berkorelasi ke `forestry`."""
+    user = aliased(UserModel)
+    area = aliased(ForestryAreaModel)
+
+    return {
+        "assist_accounts": users_by_json_ids(forestry.assist_account_id, forestry, search=True),
+        "kh_detail": (
+            select(func.json_arrayagg(json_object(area, FORESTRY_AREA_FIELDS)))
+            .select_from(area)
+            .where(func.json_contains(forestry.kh_id, func.json_quote(area.abbreviation)))
+            .correlate(forestry)
+            .scalar_subquery()
+        ),
+        "vertex_detail": (
+            select(json_object(ProposalforestryStatusModel, VERTEX_FIELDS))
+            .where(ProposalforestryStatusModel.proposal_forestry_vertex == forestry.vertex)
+            .correlate(forestry)
+            .scalar_subquery()
+        ),
+        "kph_account": (
+            select(json_object(user, USER_FIELDS))
+            .where(user.id == forestry.kph_account_id)
+            .correlate(forestry)
+            .scalar_subquery()
+        ),
+        "regional": (
+            select(json_object(RegionalModel, REGIONAL_FIELDS))
+            .where(RegionalModel.id == forestry.regional_id)
+            .correlate(forestry)
+            .scalar_subquery()
+        ),
+        "schema": (
+            select(
+                func.json_object(
+                    *[
+                        item
+                        for field in FORESTRY_SCHEMA_FIELDS
+                        for item in (field, func.min(getattr(ForestrySchemaModel, field)))
+                    ]
+                )
+            )
+            .where(ForestrySchemaModel.schema_id == forestry.schema_id)
+            .correlate(forestry)
+            .scalar_subquery()
+        ),
+    }
+
+
+def business_object(business: Any, where: ColumnElement, correlate: Any):
+    """Object business lengkap dengan account_users, class, status, dan forestry (tanpa relasi forestry)."""
+    business_class = aliased(BusinessClassModel)
+    operational_status = aliased(BusinessOperationalStatusModel)
+    forestry = aliased(ForestryProposalModel)
+
+    return scalar_object(
+        business,
+        BUSINESS_FIELDS,
+        where,
+        correlate,
+        account_users=users_by_json_ids(business.account_ids, business),
+        business_class=scalar_object(
+            business_class, BUSINESS_CLASS_FIELDS, business.class_id == business_class.type, business
+        ),
+        operational_status=scalar_object(
+            operational_status,
+            OPERATIONAL_STATUS_FIELDS,
+            business.operational_status_id == operational_status.type,
+            business,
+        ),
+        forestry=scalar_object(forestry, FORESTRY_FIELDS, business.forestry_id == forestry.id, business),
+    )
+
+
+def commodity_object(commodity: Any, where: ColumnElement, correlate: Any):
+    return scalar_object(commodity, COMMODITY_FIELDS, where, correlate)
+
+
+def cached_select(key: Hashable, builder: Callable[[], Select]) -> Select:
+    """Bangun Select dasar sekali per key (biasanya kelas repository + model) lalu pakai ulang."""
+    statement = _statements.get(key)
+    if statement is None:
+        statement = _statements[key] = builder()
+    return statement
+
+
+# Sub-object yang dibangun sekali saat import
+BUSINESS_ALIAS = aliased(BusinessesModel, name="business_alias")
+COMMODITY_ALIAS = aliased(CommodityModel, name="commodity_alias")
+FORESTRY_RELATIONS = forestry_relations(ForestryProposalModel)
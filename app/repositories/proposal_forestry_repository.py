@@ -1,13 +1,13 @@
 import json
-from typing import List, Tuple, override
+from typing import Any, Dict, Hashable, List, Optional, Tuple, override
 
 from fastapi_async_sqlalchemy import db
-from sqlalchemy import Integer, Select, String, cast, func, or_, select
-from sqlalchemy.dialects.mysql import JSON
+from sqlalchemy import Integer, Select, cast, func, select
 from sqlalchemy.orm import aliased, joinedload, selectinload
 
+from app.core.data_types import CountModeEnum
+from app.core.pagination import Page
 from app.models import (
-    ForestryAreaModel,
     ForestryProposalModel,
     ProposalforestryStatusModel,
     RegionalModel,
@@ -16,6 +16,7 @@ from app.models import (
 from app.models.forestry_schema_model import ForestrySchemaModel
 
 from . import BaseRepository
+from .projections import FORESTRY_RELATIONS, cached_select
 
 
 class ForestryProposalRepository(BaseRepository[ForestryProposalModel]):
@@ -47,166 +48,11 @@ class ForestryProposalRepository(BaseRepository[ForestryProposalModel]):
         return temp
 
     def _build_query(self) -> Select:
-        user_alias = aliased(UserModel)
-        area_alias = aliased(ForestryAreaModel)
-
-        assist_users_subq = (
-            select(
-                func.coalesce(
-                    func.json_arrayagg(
-                        func.json_object(
-                            "id",
-                            user_alias.id,
-                            "name",
-                            user_alias.name,
-                            "email",
-                            user_alias.email,
-                            "phone",
-                            user_alias.phone,
-                            "agency_name",
-                            user_alias.agency_name,
-                            "agency_type",
-                            user_alias.agency_type,
-                            "avatar",
-                            user_alias.avatar,
-                            "enable",
-                            user_alias.enable,
-                            "role_id",
-                            user_alias.role_id,
-                            "is_verified",
-                            user_alias.is_verified,
-                        )
-                    ),
-                    func.cast("[]", JSON),
-                )
-            )
-            .select_from(user_alias)
-            .where(
-                func.json_search(
-                    self.model.assist_account_id,
-                    "one",
-                    func.cast(user_alias.id, String),
-                ).isnot(None)
-            )
-            .correlate(self.model)
-            .scalar_subquery()
-        )
-
-        area_subq = (
-            select(
-                func.json_arrayagg(
-                    func.json_object(
-                        "id",
-                        area_alias.id,
-                        "name",
-                        area_alias.name,
-                        "abbreviation",
-                        area_alias.abbreviation,
-                    )
-                )
-            )
-            .select_from(area_alias)
-            .where(
-                func.json_contains(
-                    self.model.kh_id,
-                    func.json_quote(area_alias.abbreviation),
-                )
-            )
-            .correlate(self.model)
-            .scalar_subquery()
-        )
-
-        regional_subq = (
-            select(
-                func.json_object(
-                    "id",
-                    RegionalModel.id,
-                    "name",
-                    RegionalModel.name,
-                    "parent",
-                    RegionalModel.parent,
-                    "group",
-                    RegionalModel.group,
-                    "created_at",
-                    RegionalModel.created_at,
-                    "created_by",
-                    RegionalModel.created_by,
-                )
-            )
-            .select_from(RegionalModel)
-            .where(RegionalModel.id == self.model.regional_id)
-            .correlate(self.model)
-            .scalar_subquery()
-        )
-
-        vertex_subq = (
-            select(
-                func.json_object(
-                    "id",
-                    ProposalforestryStatusModel.id,
-                    "name",
-                    ProposalforestryStatusModel.name,
-                    "proposal_forestry_vertex",
-                    ProposalforestryStatusModel.proposal_forestry_vertex,
-                    "description",
-                    ProposalforestryStatusModel.description,
-                )
-            )
-            .select_from(ProposalforestryStatusModel)
-            .where(ProposalforestryStatusModel.proposal_forestry_vertex == self.model.vertex)
-            .correlate(self.model)
-            .scalar_subquery()
-        )
+        return cached_select((type(self), self.model), self._compose_query)
 
-        kph_account_subq = (
-            select(
-                func.json_object(
-                    "id",
-                    user_alias.id,
-                    "name",
-                    user_alias.name,
-                    "email",
-                    user_alias.email,
-                    "phone",
-                    user_alias.phone,
-                    "agency_name",
-                    user_alias.agency_name,
-                    "agency_type",
-                    user_alias.agency_type,
-                    "avatar",
-                    user_alias.avatar,
-                    "enable",
-                    user_alias.enable,
-                    "role_id",
-                    user_alias.role_id,
-                    "is_verified",
-                    user_alias.is_verified,
-                )
-            )
-            .select_from(user_alias)
-            .where(user_alias.id == self.model.kph_account_id)
-            .correlate(self.model)
-            .scalar_subquery()
-        )
+    def _compose_query(self) -> Select:
+        user_alias = aliased(UserModel)
 
-        schema_subq = (
-            select(
-                func.json_object(
-                    "schema_id",
-                    func.min(ForestrySchemaModel.schema_id),
-                    "name",
-                    func.min(ForestrySchemaModel.name),
-                    "description",
-                    func.min(ForestrySchemaModel.description),
-                    "ord",
-                    func.min(ForestrySchemaModel.ord),
-                )
-            )
-            .select_from(ForestrySchemaModel)
-            .where(ForestrySchemaModel.schema_id == self.model.schema_id)
-            .correlate(self.model)
-            .scalar_subquery()
-        )
         return (
             select(
                 self.model.id.label("id"),
@@ -235,12 +81,7 @@ class ForestryProposalRepository(BaseRepository[ForestryProposalModel]):
                 func.min(self.model.updated_by).label("updated_by"),
                 func.min(self.model.created_at).label("created_at"),
                 func.min(self.model.updated_at).label("updated_at"),
-                assist_users_subq.label("assist_accounts"),
-                area_subq.label("kh_detail"),
-                vertex_subq.label("vertex_detail"),
-                kph_account_subq.label("kph_account"),
-                regional_subq.label("regional"),
-                schema_subq.label("schema"),
+                *[FORESTRY_RELATIONS[name].label(name) for name in FORESTRY_RELATIONS],
             )
             .select_from(self.model)
             .outerjoin(
@@ -282,18 +123,20 @@ class ForestryProposalRepository(BaseRepository[ForestryProposalModel]):
         relationships: List[str] = None,
         searchable_columns: List[str] = None,
         all: bool = False,
+        cursor: Optional[str] = None,
+        count: str = CountModeEnum.EXACT,
+        shape: Optional[Hashable] = None,
+        params: Optional[Dict[str, Any]] = None,
     ) -> Tuple[List[ForestryProposalModel], int]:
+        relationships = relationships or []
+        searchable_columns = searchable_columns or []
+        params = self._list_params(params, search, searchable_columns)
+        shape = self._list_shape(shape, search, searchable_columns, group_by, relationships)
 
-        query = self._build_query()
-
-        if search:
-            if searchable_columns:
-                search_conditions = []
-                for col in searchable_columns:
-                    if hasattr(self.model, col):
-                        search_conditions.append(cast(getattr(self.model, col), String).ilike(f"%{search}%"))
+        def build() -> Select:
+            query = self._build_query()
 
-            else:
+            if search:
                 searchable_fields = [
                     self.model.id,
                     self.model.name,
@@ -306,29 +149,27 @@ class ForestryProposalRepository(BaseRepository[ForestryProposalModel]):
                     self.model.request_year,
                     self.model.release_year,
                 ]
-                search_conditions = [cast(field, String).ilike(f"%{search}%") for field in searchable_fields]
-
-            if search_conditions:
-                query = query.where(or_(*search_conditions))
-
-        if group_by:
-            # Try to get model field, either directly or through mapping
-            if hasattr(self.model, group_by):
-                query = query.group_by(getattr(self.model, group_by))
-            else:
-                # Try to map table column name to model field
-                model_field = self.get_model_field(group_by)
-                if model_field:
-                    query = query.group_by(model_field)
-                # If no mapping found, skip group_by
-
-        count_query = select(func.count()).select_from(query.subquery())
-        total = await db.session.scalar(count_query)
-
-        if sort:
-            query = query.order_by(*sort)
-        else:
-            query = query.order_by(self.model.id)
+                search_clause = self._search_clause(search, searchable_columns, searchable_fields)
+                if search_clause is not None:
+                    query = query.where(search_clause)
+
+            if group_by:
+                # Try to get model field, either directly or through mapping
+                if hasattr(self.model, group_by):
+                    query = query.group_by(getattr(self.model, group_by))
+                else:
+                    # Try to map table column name to model field
+                    model_field = self.get_model_field(group_by)
+                    if model_field:
+                        query = query.group_by(model_field)
+                    # If no mapping found, skip group_by
+            return query
+
+        query = self._statement(shape, "query", build)
+
+        total = await self._count(query, count, params, shape)
+        # Selain count exact, has_more diambil dari baris ekstra
+        peek = count != CountModeEnum.EXACT
 
         if relationships:
             for rel in relationships:
@@ -339,15 +180,20 @@ class ForestryProposalRepository(BaseRepository[ForestryProposalModel]):
                     else:
                         query = query.options(joinedload(attr))
 
-        if not all and limit and offset:
-            query = query.limit(limit).offset(offset)
+        paginate = not all and (cursor is not None or peek or (limit and offset))
+        if paginate:
+            query, keys = self._paginate(query, sort, limit, offset, cursor, peek, params, shape)
+        else:
+            query = query.order_by(*sort) if sort else query.order_by(self.model.id)
 
-        result = await db.session.execute(query)
+        result = await db.session.execute(query, params)
 
         records = result.mappings().all()
         results_dict = [self._mapping(record) for record in records]
 
-        return results_dict, total
+        if not paginate:
+            return Page(results_dict, len(results_dict) if total is None else total)
+        return self._build_page(results_dict, total, limit, offset, keys, peek)
 
     @override
     async def create(self, data: dict) -> ForestryProposalModel:
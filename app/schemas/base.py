@@ -1,4 +1,4 @@
-from typing import Generic, List, TypeVar
+from typing import Generic, List, Optional, TypeVar
 
 from pydantic import BaseModel, ConfigDict
 
@@ -22,7 +22,8 @@ class BaseSchema(BaseModel):
 
 class PaginatedResponse(BaseSchema, Generic[T]):
     items: List[T]
-    total: int
+    total: Optional[int]
     limit: int
     offset: int
     has_more: bool
+    next_cursor: Optional[str] = None
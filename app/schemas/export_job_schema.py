@@ -0,0 +1,31 @@
+from datetime import datetime
+from typing import List, Literal, Optional
+
+from pydantic import Field
+
+from app.core.data_types import ExportFormatEnum, ExportJobStatusEnum
+
+from .base import BaseSchema
+
+
+class ExportJobCreateSchema(BaseSchema):
+    resource: Literal["businesses", "proposal-forestry"] = Field(..., title="Resource")
+    format: ExportFormatEnum = Field(ExportFormatEnum.XLSX, title="Export Format")
+    filters: Optional[List[str]] = Field(None, title="Filters")
+    sort: Optional[List[str]] = Field(None, title="Sort")
+    search: str = Field("", title="Search")
+    searchable_columns: Optional[List[str]] = Field(None, title="Searchable Columns")
+    limit: int = Field(0, ge=0, title="Limit")
+
+
+class ExportJobSchema(BaseSchema):
+    id: str
+    resource: str
+    format: ExportFormatEnum
+    status: ExportJobStatusEnum
+    size: Optional[int] = None
+    error: Optional[str] = None
+    download_url: Optional[str] = None
+    created_at: Optional[datetime] = None
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
@@ -1,7 +1,7 @@
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 
-from pydantic import Field
+from pydantic import Field, model_validator
 
 from .base import BaseSchema
 
@@ -27,3 +27,14 @@ class FileUpdateSchema(BaseSchema):
     size: Optional[int] = Field(None, title="File Size")
     description: Optional[str] = Field(None, title="File Description")
     url: Optional[str] = Field(None, title="File URL")
+
+
+class FileZipSchema(BaseSchema):
+    ids: Optional[List[int]] = Field(None, title="File IDs", min_length=1)
+    prefix: Optional[str] = Field(None, title="Object Name Prefix", min_length=1)
+
+    @model_validator(mode="after")
+    def check_source(self):
+        if (self.ids is None) == (self.prefix is None):
+            raise ValueError("Isi salah satu: ids atau prefix")
+        return self
@@ -10,6 +10,7 @@ from .business_service_service import BusinessServiceService
 from .businesses_service import BusinessesService
 from .commodity_service import CommodityService
 from .economic_values_service import EconomicValuesService
+from .export_job_service import ExportJobService
 from .farmer_incomes_service import FarmerIncomesService
 from .file_service import FileService
 from .forestry_area_service import ForestryAreaService
@@ -58,4 +59,5 @@ __all__ = [
     "InfographicService",
     "MapsService",
     "SettingsService",
+    "ExportJobService",
 ]
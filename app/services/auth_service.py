@@ -17,6 +17,7 @@ from app.core.security import (
 from app.models.user_model import UserModel
 from app.repositories.token_repository import TokenRepository
 from app.repositories.user_repository import UserRepository
+from app.services.base import id_cache_tag
 from app.utils.cache import cache_manager
 
 logger = logging.getLogger(__name__)
@@ -31,7 +32,8 @@ async def get_user_cache(user_id: str):
 
 
 async def set_user_cache(user_id: str, user_data: dict, ttl: int = 300):
-    await cache_manager.set(user_cache_key(user_id), user_data, ttl=ttl)
+    # Tag sama dengan loader di get_user_from_cache_or_db: update/delete user ikut membuang entry ini
+    await cache_manager.set(user_cache_key(user_id), user_data, ttl=ttl, tags=[id_cache_tag(UserModel, user_id)])
 
 
 async def delete_user_cache(user_id: str):
@@ -138,7 +140,7 @@ class AuthService:
     async def logout(self, refresh_token: str) -> bool:
         """Logout user dengan merevoke refresh token."""
         with contextlib.suppress(Exception):
-            user_id = await decode_token(refresh_token).get("sub")
+            user_id = (await decode_token(refresh_token)).get("sub")
             await delete_user_cache(user_id)
 
         return await self.token_repository.revoke_token(refresh_token, exclude_revoke=True)
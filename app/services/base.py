@@ -1,8 +1,24 @@
+import copy
 from functools import lru_cache
-from typing import Any, Dict, Generic, List, Optional, Tuple, Type, TypeVar, Union
+from typing import (
+    Any,
+    AsyncGenerator,
+    Dict,
+    Generic,
+    List,
+    Optional,
+    Tuple,
+    Type,
+    TypeVar,
+    Union,
+)
 
-from sqlalchemy import or_
+from fastapi_async_sqlalchemy import db
+from sqlalchemy import bindparam, or_
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.config import settings
+from app.core.data_types import CountModeEnum
 from app.core.database import Base
 from app.core.exceptions import (
     DuplicateValueException,
@@ -10,11 +26,25 @@ from app.core.exceptions import (
     ValidationException,
 )
 from app.repositories import BaseRepository
+from app.utils.cache import cache_manager
+from app.utils.statement_cache import statement_cache
+
+from .infographic_store import infographic_store
 
 ModelType = TypeVar("ModelType", bound=Base)
 RepositoryType = TypeVar("RepositoryType", bound=BaseRepository)
 
 
+def model_cache_tag(model: Type[Base]) -> str:
+    """Tag cache untuk hasil yang bergantung pada banyak record model (mis. find_all)."""
+    return f"model:{model.__name__}"
+
+
+def id_cache_tag(model: Type[Base], id: Any) -> str:
+    """Tag cache untuk hasil yang bergantung pada satu record model (mis. find_by_id)."""
+    return f"id:{model.__name__}:{id}"
+
+
 class BaseService(Generic[ModelType, RepositoryType]):
     """Optimized base service dengan caching dan performance improvements."""
 
@@ -72,15 +102,18 @@ class BaseService(Generic[ModelType, RepositoryType]):
         except (ValueError, TypeError):
             return value
 
-    def _build_filters(self, filters: Union[str, List[str], None]) -> List[Any]:
-        """Build filters dengan optimization."""
-        list_model_filters: List[Any] = []
-
+    def _parse_filters(self, filters: Union[str, List[str], None]) -> List[Any]:
+        """
+        Parse, validasi, dan konversi filter menjadi (col, operator, value).
+        Filter berupa list (OR) menjadi tuple berisi beberapa (col, operator, value).
+        """
         # Pastikan filters adalah list
         if filters is None:
             filters = []
         elif isinstance(filters, str):
             filters = [filters]
+        else:
+            filters = list(filters)
 
         # Soft delete: tambahkan filter is_deleted jika ada kolomnya
         if self._has_soft_delete and "is_deleted" not in [
@@ -88,50 +121,74 @@ class BaseService(Generic[ModelType, RepositoryType]):
         ]:
             filters.append("is_deleted=false")
 
+        parsed: List[Any] = []
         for filter_item in filters:
             # Mendukung OR: filter_item bisa berupa list
             if isinstance(filter_item, list):
-                or_conditions = []
-                for value_item in filter_item:
-                    col, operator, value = self._parse_filter_item(value_item)
-                    self._validate_column(col)
-                    converted_value = self._convert_value(col, value)
-
-                    if isinstance(converted_value, bool):
-                        or_conditions.append(getattr(self.model_class, col).is_(converted_value))
-                    else:
-                        if operator == "=":
-                            or_conditions.append(getattr(self.model_class, col) == converted_value)
-                        elif operator == "!=":
-                            or_conditions.append(getattr(self.model_class, col) != converted_value)
-                        elif operator == ">=":
-                            or_conditions.append(getattr(self.model_class, col) >= converted_value)
-                        elif operator == "<=":
-                            or_conditions.append(getattr(self.model_class, col) <= converted_value)
-                        else:
-                            raise ValidationException(f"Invalid operator '{operator}' for {col}")
-                if or_conditions:
-                    list_model_filters.append(or_(*or_conditions))
+                group = tuple(self._parse_condition(value_item) for value_item in filter_item)
+                if group:
+                    parsed.append(group)
             else:
-                col, operator, value = self._parse_filter_item(filter_item)
-                self._validate_column(col)
-                converted_value = self._convert_value(col, value)
-
-                if isinstance(converted_value, bool):
-                    list_model_filters.append(getattr(self.model_class, col).is_(converted_value))
-                else:
-                    if operator == "=":
-                        list_model_filters.append(getattr(self.model_class, col) == converted_value)
-                    elif operator == "!=":
-                        list_model_filters.append(getattr(self.model_class, col) != converted_value)
-                    elif operator == ">=":
-                        list_model_filters.append(getattr(self.model_class, col) >= converted_value)
-                    elif operator == "<=":
-                        list_model_filters.append(getattr(self.model_class, col) <= converted_value)
-                    else:
-                        raise ValidationException(f"Invalid operator '{operator}' for {col}")
-
-        return list_model_filters
+                parsed.append(self._parse_condition(filter_item))
+        return parsed
+
+    def _parse_condition(self, filter_item: str) -> Tuple[str, str, Any]:
+        col, operator, value = self._parse_filter_item(filter_item)
+        self._validate_column(col)
+        return col, operator, self._convert_value(col, value)
+
+    @staticmethod
+    def _is_or_group(item: Tuple[Any, ...]) -> bool:
+        return isinstance(item[0], tuple)
+
+    def _filter_clause(self, col: str, operator: str, value: Any) -> Any:
+        column = getattr(self.model_class, col)
+        if isinstance(value, bool):
+            return column.is_(value)
+        if operator == "=":
+            return column == value
+        if operator == "!=":
+            return column != value
+        if operator == ">=":
+            return column >= value
+        if operator == "<=":
+            return column <= value
+        raise ValidationException(f"Invalid operator '{operator}' for {col}")
+
+    def _filter_clauses(self, parsed: List[Any], bound: bool = False) -> List[Any]:
+        """Ubah hasil _parse_filters menjadi ekspresi; bound=True berarti value adalah nama bindparam."""
+
+        def clause(col: str, operator: str, value: Any) -> Any:
+            if bound and not isinstance(value, bool):
+                value = bindparam(value)
+            return self._filter_clause(col, operator, value)
+
+        return [
+            or_(*[clause(*condition) for condition in item]) if self._is_or_group(item) else clause(*item)
+            for item in parsed
+        ]
+
+    def _bind_filters(self, parsed: List[Any], params: Dict[str, Any]) -> Tuple[Any, ...]:
+        """
+        Bentuk filter untuk statement cache: value diganti nama bindparam (nilainya masuk params).
+        Boolean tetap literal karena dirender sebagai IS true/false.
+        """
+
+        def bind(col: str, operator: str, value: Any) -> Tuple[str, str, Any]:
+            if isinstance(value, bool):
+                return col, operator, value
+            name = f"f{len(params)}"
+            params[name] = value
+            return col, operator, name
+
+        return tuple(
+            tuple(bind(*condition) for condition in item) if self._is_or_group(item) else bind(*item)
+            for item in parsed
+        )
+
+    def _build_filters(self, filters: Union[str, List[str], None]) -> List[Any]:
+        """Build filters dengan nilai literal."""
+        return self._filter_clauses(self._parse_filters(filters))
 
     def _build_sort(self, sort: Union[str, List[str], None]) -> List[Any]:
         """Build sort dengan optimization."""
@@ -173,14 +230,29 @@ class BaseService(Generic[ModelType, RepositoryType]):
         offset: int = 0,
         relationships: Optional[List[str]] = None,
         searchable_columns: Optional[List[str]] = None,
+        cursor: Optional[str] = None,
+        count: str = CountModeEnum.EXACT,
     ) -> Tuple[List[ModelType], int]:
-        """Optimized find_all."""
+        """
+        Optimized find_all.
+        Isi cursor (boleh string kosong) untuk keyset pagination; count memilih exact/estimate/none.
+        """
 
         if group_by:
             self._validate_column(group_by)
 
-        list_model_filters = self._build_filters(filters)
-        list_sort = self._build_sort(sort)
+        # Ekspresi filter/sort di-cache per bentuk; nilai filter dikirim sebagai bound parameter
+        params: Dict[str, Any] = {}
+        filter_shape = self._bind_filters(self._parse_filters(filters), params)
+        sort_shape = tuple(self._parse_sort_item(item) for item in ([sort] if isinstance(sort, str) else sort or []))
+
+        list_model_filters = statement_cache.get_or_build(
+            (self.model_class, "filters", filter_shape),
+            lambda: self._filter_clauses(filter_shape, bound=True),
+        )
+        list_sort = statement_cache.get_or_build(
+            (self.model_class, "sort", sort_shape), lambda: self._build_sort(sort)
+        )
 
         return await self.repository.find_all(
             filters=list_model_filters,
@@ -191,17 +263,84 @@ class BaseService(Generic[ModelType, RepositoryType]):
             offset=offset,
             relationships=relationships or [],
             searchable_columns=searchable_columns or [],
+            cursor=cursor,
+            count=count,
+            shape=(filter_shape, sort_shape),
+            params=params,
         )
 
+    def iter_all(
+        self,
+        filters: Optional[Union[str, List[str]]] = None,
+        sort: Optional[Union[str, List[str]]] = None,
+        search: str = "",
+        group_by: Optional[str] = None,
+        limit: int = 0,
+        offset: int = 0,
+        relationships: Optional[List[str]] = None,
+        searchable_columns: Optional[List[str]] = None,
+        batch_size: Optional[int] = None,
+    ) -> AsyncGenerator[Any, None]:
+        """
+        Iterasi semua record per batch dengan keyset cursor (tanpa COUNT), untuk export.
+        Filter/sort divalidasi langsung agar error muncul sebelum response streaming dimulai.
+        """
+        self._parse_filters(filters)
+        self._build_sort(sort)
+        if group_by:
+            self._validate_column(group_by)
+
+        list_params = dict(
+            filters=filters,
+            sort=sort,
+            search=search,
+            group_by=group_by,
+            relationships=relationships,
+            searchable_columns=searchable_columns,
+        )
+        return self._iter_pages(list_params, limit, offset, batch_size or settings.EXPORT_BATCH_SIZE)
+
+    async def _iter_pages(
+        self, list_params: Dict[str, Any], limit: int, offset: int, batch_size: int
+    ) -> AsyncGenerator[Any, None]:
+        # Biasanya dikonsumsi StreamingResponse/job export setelah session request ditutup,
+        # jadi query dijalankan lewat repository yang memakai session db() sendiri
+        remaining = limit or None
+        cursor = ""
+
+        async with db():
+            service = self.with_session(db.session)
+            while cursor is not None:
+                page = await service.find_all(**list_params, limit=batch_size, cursor=cursor, count=CountModeEnum.NONE)
+                items = page.items
+                if offset:
+                    skipped = min(offset, len(items))
+                    items, offset = items[skipped:], offset - skipped
+                for item in items[:remaining]:
+                    yield item
+                if remaining is not None:
+                    remaining -= min(remaining, len(items))
+                    if not remaining:
+                        return
+                cursor = page.next_cursor
+
+    def with_session(self, session: AsyncSession) -> "BaseService[ModelType, RepositoryType]":
+        """Salinan service dengan repository yang memakai `session` lain."""
+        service = copy.copy(self)
+        service.repository = self.repository.with_session(session)
+        return service
+
     async def create(self, data: Dict[str, Any]) -> ModelType:
         """Create new record."""
         try:
-            return await self.repository.create(data)
+            record = await self.repository.create(data)
         except Exception as e:
             # Handle duplicate key errors
             if "duplicate" in str(e).lower() or "unique" in str(e).lower():
                 raise DuplicateValueException(f"Record already exists: {str(e)}")
             raise
+        await self._after_write()
+        return record
 
     async def update(self, id: str, data: Dict[str, Any], refresh: bool = True) -> ModelType:
         """Update existing record."""
@@ -213,12 +352,13 @@ class BaseService(Generic[ModelType, RepositoryType]):
             updated = await self.repository.update(id, data, refresh=refresh)
             if not updated:
                 raise NotFoundException(f"{self.model_class.__name__} with id {id} not found.")
-            return updated
         except Exception as e:
             # Handle duplicate key errors
             if "duplicate" in str(e).lower() or "unique" in str(e).lower():
                 raise DuplicateValueException(f"Update would create duplicate: {str(e)}")
             raise
+        await self._after_write(id)
+        return updated
 
     async def delete(self, id: str, permanent: bool = False) -> None:
         """Delete record dengan soft delete support."""
@@ -232,10 +372,28 @@ class BaseService(Generic[ModelType, RepositoryType]):
             await self.repository.update(id, delete_data, refresh=False)
         else:
             await self.repository.delete(id)
+        await self._after_write(id)
 
     async def bulk_create(self, data_list: List[Dict[str, Any]], batch_size: int = 1000) -> List[ModelType]:
         """Bulk create dengan validation."""
-        return await self.repository.bulk_create(data_list, batch_size=batch_size, return_records=True)
+        records = await self.repository.bulk_create(data_list, batch_size=batch_size, return_records=True)
+        await self._after_write()
+        return records
+
+    @property
+    def model_cache_tag(self) -> str:
+        return model_cache_tag(self.model_class)
+
+    def id_cache_tag(self, id: Any) -> str:
+        return id_cache_tag(self.model_class, id)
+
+    async def _after_write(self, *ids: Any) -> None:
+        """
+        Hook setelah create/update/delete: tandai snapshot infografis yang membaca tabel ini dan
+        invalidasi cache bertag model ini (serta tag id record yang berubah).
+        """
+        infographic_store.invalidate(self.model_class.__tablename__)
+        await cache_manager.invalidate_tags(self.model_cache_tag, *(self.id_cache_tag(id) for id in ids))
 
     async def exists_by_id(self, id: str) -> bool:
         """Check existence tanpa fetch object."""
@@ -1,9 +1,19 @@
-from typing import Any, Dict, override
+from typing import (
+    Any,
+    AsyncGenerator,
+    AsyncIterable,
+    Dict,
+    List,
+    Optional,
+    Union,
+    override,
+)
 
+from app.core.data_types import ExportFormatEnum
 from app.models import BusinessesModel
 from app.repositories import BusinessesRepository
 from app.schemas.user_schema import UserSchema
-from app.utils.helpers import export_to_xlsx
+from app.utils.helpers import stream_export
 
 from . import BaseService
 
@@ -22,19 +32,32 @@ class BusinessesService(BaseService[BusinessesModel, BusinessesRepository]):
         data["updated_by"] = current_user.id
         return await super().update(id, data)
 
-    async def export_to_excel(
+    # Kolom export: header -> tipe (dipakai skema Parquet)
+    EXPORT_COLUMNS: Dict[str, type] = {
+        "No": int,
+        "Nama KUPS": str,
+        "Kelas KUPS": str,
+        "Nama KPS": str,
+        "Nama KPH": str,
+        "Komoditas": str,
+        "Dibuat": str,
+        "Diperbarui": str,
+    }
+
+    def export(
         self,
-        filters: list = [],
-        sort: list = [],
+        export_format: ExportFormatEnum = ExportFormatEnum.XLSX,
+        filters: Optional[Union[str, List[str]]] = None,
+        sort: Optional[Union[str, List[str]]] = None,
         search: str = "",
-        group_by: str = None,
+        group_by: Optional[str] = None,
         limit: int = 0,
         offset: int = 0,
-        relationships: list = [],
-        searchable_columns: list = [],
-    ) -> bytes:
-
-        businesses_data, _ = await self.repository.find_all(
+        relationships: Optional[List[str]] = None,
+        searchable_columns: Optional[List[str]] = None,
+    ) -> AsyncGenerator[bytes, None]:
+        """Stream file export KUPS dalam format xlsx, csv, atau parquet."""
+        records = self.iter_all(
             filters=filters,
             sort=sort,
             search=search,
@@ -43,54 +66,42 @@ class BusinessesService(BaseService[BusinessesModel, BusinessesRepository]):
             offset=offset,
             relationships=relationships,
             searchable_columns=searchable_columns,
-            all=True,
         )
+        return stream_export(export_format, self.EXPORT_COLUMNS, self.export_rows(records), sheet_name="kups")
 
-        # Header sesuai gambar dan model
-        data = [
-            [
-                "No",
-                "Nama KUPS",
-                "Kelas KUPS",
-                "Nama KPS",
-                "Nama KPH",
-                "Komoditas",
-                "Dibuat",
-                "Diperbarui",
-            ]
-        ]
+    async def export_rows(self, records: AsyncIterable[Dict[str, Any]]) -> AsyncGenerator[List[Any], None]:
+        """Baris export KUPS (tanpa header)."""
+        idx = 0
+        async for item in records:
+            idx += 1
+            yield self._export_row(idx, item)
 
-        for idx, item in enumerate(businesses_data, start=1):
-            # Defensive: handle possible None for nested dicts (patokannya ke find_all mapping)
-            business_class = item.get("business_class") or item.get("class") or {}
-            forestry = item.get("forestry") or {}
-            kph_account = forestry.get("kph_account") or {}
+    @staticmethod
+    def _export_row(idx: int, item: Dict[str, Any]) -> List[Any]:
+        # Defensive: handle possible None for nested dicts (patokannya ke find_all mapping)
+        business_class = item.get("business_class") or item.get("class") or {}
+        forestry = item.get("forestry") or {}
+        kph_account = forestry.get("kph_account") or {}
 
-            # Komoditas bisa berupa list of dict, string, atau None
-            commodities = item.get("commodities", "")
-            if isinstance(commodities, list):
-                # Jika list of dict, ambil field 'name' jika ada
-                commodities_str = ", ".join(
-                    c.get("name", "") if isinstance(c, dict) else str(c) for c in commodities if c
-                )
-            elif isinstance(commodities, dict):
-                # Jika dict, ambil field 'name'
-                commodities_str = commodities.get("name", "")
-            else:
-                # Jika string atau None
-                commodities_str = str(commodities) if commodities else ""
+        # Komoditas bisa berupa list of dict, string, atau None
+        commodities = item.get("commodities", "")
+        if isinstance(commodities, list):
+            # Jika list of dict, ambil field 'name' jika ada
+            commodities_str = ", ".join(c.get("name", "") if isinstance(c, dict) else str(c) for c in commodities if c)
+        elif isinstance(commodities, dict):
+            # Jika dict, ambil field 'name'
+            commodities_str = commodities.get("name", "")
+        else:
+            # Jika string atau None
+            commodities_str = str(commodities) if commodities else ""
 
-            data.append(
-                [
-                    idx,
-                    item.get("name", ""),
-                    business_class.get("name", ""),
-                    forestry.get("name", ""),
-                    kph_account.get("name", ""),
-                    commodities_str,
-                    (item.get("created_at", "").strftime("%d-%m-%Y") if item.get("created_at") else ""),
-                    (item.get("updated_at", "").strftime("%d-%m-%Y") if item.get("updated_at") else ""),
-                ]
-            )
-
-        return export_to_xlsx(data, sheet_name="kups")
+        return [
+            idx,
+            item.get("name", ""),
+            business_class.get("name", ""),
+            forestry.get("name", ""),
+            kph_account.get("name", ""),
+            commodities_str,
+            (item.get("created_at", "").strftime("%d-%m-%Y") if item.get("created_at") else ""),
+            (item.get("updated_at", "").strftime("%d-%m-%Y") if item.get("updated_at") else ""),
+        ]
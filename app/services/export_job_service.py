@@ -0,0 +1,172 @@
+import logging
+import os
+import socket
+import tempfile
+import uuid
+from datetime import datetime, timedelta
+from typing import Any, AsyncIterable, Dict
+
+from fastapi_async_sqlalchemy import db
+from pytz import timezone
+
+from app.core.config import settings
+from app.core.data_types import ExportFormatEnum, ExportJobStatusEnum
+from app.core.exceptions import (
+    NotFoundException,
+    ServiceUnavailableException,
+    TooManyRequestsException,
+    ValidationException,
+)
+from app.core.minio_client import MinioClient
+from app.models import ExportJobModel
+from app.repositories import ExportJobRepository
+from app.utils.helpers import EXPORT_SPOOL_SIZE, export_media_type
+
+from . import BaseService
+from .export_runner import ExportJobRunner, export_runner
+
+logger = logging.getLogger(__name__)
+
+# Parameter list yang diteruskan ke method export() service sumber
+EXPORT_PARAMS = ("filters", "sort", "search", "searchable_columns", "limit")
+
+# Pemilik job di export_jobs: unik per proses worker uvicorn (pid bisa dipakai ulang setelah restart)
+WORKER_ID = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+
+class ExportJobService(BaseService[ExportJobModel, ExportJobRepository]):
+    def __init__(
+        self,
+        repository: ExportJobRepository,
+        minio_client: MinioClient,
+        exporters: Dict[str, Any],
+        runner: ExportJobRunner = export_runner,
+    ):
+        super().__init__(ExportJobModel, repository)
+        self.minio_client = minio_client
+        self.exporters = exporters
+        self.runner = runner
+
+    async def create_job(self, data: Dict[str, Any], user_id: str) -> Dict[str, Any]:
+        """Validasi parameter, simpan job (status queued), lalu masukkan ke antrian export."""
+        exporter = self.exporters.get(data["resource"])
+        if exporter is None:
+            raise ValidationException(f"Unsupported export resource: {data['resource']}")
+
+        export_format = ExportFormatEnum(data.get("format") or ExportFormatEnum.XLSX)
+        params = {key: data.get(key) for key in EXPORT_PARAMS if data.get(key) is not None}
+
+        # export() memvalidasi filter/sort/format sekarang, file baru dibuat oleh worker
+        content = exporter.export(export_format=export_format, **params)
+        self.runner.check()
+        # Dihitung dari tabel agar batas berlaku untuk semua worker, bukan per proses
+        if await self.repository.count_active(user_id) >= settings.EXPORT_MAX_JOBS_PER_USER:
+            raise TooManyRequestsException(
+                f"Maximum of {settings.EXPORT_MAX_JOBS_PER_USER} export jobs in progress per user, try again later"
+            )
+
+        job = await self.repository.create(
+            {
+                "user_id": user_id,
+                "resource": data["resource"],
+                "format": export_format.value,
+                "params": params,
+                "status": ExportJobStatusEnum.QUEUED.value,
+                "worker_id": WORKER_ID,
+                "updated_at": self._now(),
+            }
+        )
+        # Dibaca sebelum submit: setelah itu job sudah bisa berjalan di worker
+        result = await self.get_job(job.id, user_id)
+        try:
+            self.runner.submit(lambda: self._run(job.id, data["resource"], export_format, content))
+        except ServiceUnavailableException as e:
+            # Antrian penuh setelah insert: job tidak akan pernah jalan, jangan biarkan tetap queued
+            await self._set_status(job.id, ExportJobStatusEnum.FAILED, error=e.message, finished_at=self._now())
+            raise
+        return result
+
+    async def get_job(self, id: str, user_id: str) -> Dict[str, Any]:
+        job = await self.repository.find_by_id(id)
+        if not job or job.user_id != user_id:
+            raise NotFoundException(f"Export job with id {id} not found.")
+
+        result = {column: getattr(job, column) for column in job.__mapper__.c.keys()}
+        result["download_url"] = (
+            await self.minio_client.get_presigned_url(
+                job.object_name,
+                filename=f"{job.resource}.{job.format}",
+                content_type=export_media_type(ExportFormatEnum(job.format)),
+            )
+            if job.status == ExportJobStatusEnum.COMPLETED.value and job.object_name
+            else None
+        )
+        return result
+
+    async def _run(
+        self, job_id: str, resource: str, export_format: ExportFormatEnum, content: AsyncIterable[bytes]
+    ) -> None:
+        """Dijalankan worker dengan session db() sendiri; repository service ini milik session request."""
+        async with db():
+            await self.with_session(db.session)._export(job_id, resource, export_format, content)
+
+    async def _export(
+        self, job_id: str, resource: str, export_format: ExportFormatEnum, content: AsyncIterable[bytes]
+    ) -> None:
+        """Tulis file ke disk sementara, upload ke MinIO, catat hasilnya."""
+        if not await self._set_status(job_id, ExportJobStatusEnum.RUNNING, started_at=self._now()):
+            logger.warning("Job export %s sudah ditandai failed sebelum dijalankan", job_id)
+            return
+        try:
+            object_name = f"exports/{job_id}.{export_format.value}"
+            with tempfile.SpooledTemporaryFile(max_size=EXPORT_SPOOL_SIZE) as output:
+                async for chunk in content:
+                    output.write(chunk)
+                size = output.tell()
+                output.seek(0)
+                await self.minio_client.upload_file(
+                    file_data=output,
+                    object_name=object_name,
+                    content_type=export_media_type(export_format),
+                    content_length=size,
+                    metadata={"filename": f"{resource}.{export_format.value}", "export_job_id": job_id},
+                )
+        except Exception as e:
+            await self._set_status(job_id, ExportJobStatusEnum.FAILED, error=str(e), finished_at=self._now())
+            raise
+
+        if not await self._set_status(
+            job_id, ExportJobStatusEnum.COMPLETED, object_name=object_name, size=size, finished_at=self._now()
+        ):
+            logger.warning("Job export %s ditandai failed saat berjalan, hasilnya diabaikan", job_id)
+
+    async def _set_status(self, job_id: str, status: ExportJobStatusEnum, **fields: Any) -> bool:
+        """Status hanya berubah selama job masih aktif dan dipegang worker ini (lihat export_jobs_heartbeat)."""
+        return await self.repository.set_status(job_id, WORKER_ID, status, updated_at=self._now(), **fields)
+
+    @staticmethod
+    def _now() -> datetime:
+        return datetime.now(timezone(settings.TIMEZONE))
+
+
+async def export_jobs_heartbeat() -> int:
+    """
+    Dipanggil berkala oleh export_runner di setiap proses: perbarui updated_at job milik proses ini,
+    lalu tandai failed job aktif yang heartbeat-nya basi. Antrian export hanya ada di memori proses,
+    jadi job milik proses yang mati/di-restart tidak akan pernah selesai dan tidak boleh terus
+    memakai jatah job aktif user. Job proses lain yang masih hidup tidak tersentuh.
+    """
+    now = datetime.now(timezone(settings.TIMEZONE))
+    try:
+        async with db():
+            repository = ExportJobRepository(ExportJobModel)
+            await repository.touch(WORKER_ID, now)
+            count = await repository.fail_stale(
+                now - timedelta(seconds=settings.EXPORT_JOB_STALE_AFTER), "Interrupted: export worker stopped", now
+            )
+    except Exception as err:
+        logger.warning("Gagal memperbarui heartbeat job export: %r", err)
+        return 0
+    if count:
+        logger.info("%d job export tanpa heartbeat ditandai failed", count)
+    return count
@@ -0,0 +1,85 @@
+import asyncio
+import logging
+from typing import Awaitable, Callable, List, Optional
+
+from app.core.config import settings
+from app.core.exceptions import ServiceUnavailableException
+
+logger = logging.getLogger(__name__)
+
+Job = Callable[[], Awaitable[None]]
+
+
+class ExportJobRunner:
+    """
+    Antrian job export di dalam proses: queue terbatas dan sejumlah worker tetap.
+    Batas job aktif per user dihitung dari tabel export_jobs oleh ExportJobService,
+    karena antrian ini hanya melihat job milik satu worker.
+    """
+
+    def __init__(self, workers: int = 2, queue_size: int = 20, heartbeat_interval: float = 30):
+        self.workers = workers
+        self.queue_size = queue_size
+        self.heartbeat_interval = heartbeat_interval
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks: List[asyncio.Task] = []
+        self._heartbeat_task: Optional[asyncio.Task] = None
+
+    @property
+    def running(self) -> bool:
+        return any(not task.done() for task in self._tasks)
+
+    def check(self) -> None:
+        """Tolak lebih awal jika worker tidak berjalan atau antrian penuh."""
+        if self._queue is None:
+            raise ServiceUnavailableException("Export worker is not running")
+        if self._queue.full():
+            raise ServiceUnavailableException("Export queue is full, try again later")
+
+    def submit(self, job: Job) -> None:
+        self.check()
+        self._queue.put_nowait(job)
+
+    async def _worker(self) -> None:
+        while True:
+            job = await self._queue.get()
+            try:
+                await job()
+            except Exception:
+                logger.exception("Job export gagal")
+            finally:
+                self._queue.task_done()
+
+    async def _heartbeat(self, heartbeat: Job) -> None:
+        while True:
+            try:
+                await heartbeat()
+            except Exception:
+                logger.exception("Heartbeat job export gagal")
+            await asyncio.sleep(self.heartbeat_interval)
+
+    def start(self, heartbeat: Optional[Job] = None) -> None:
+        """Jalankan worker; `heartbeat` (jika ada) dipanggil saat start lalu setiap heartbeat_interval."""
+        if self.running:
+            return
+        self._queue = asyncio.Queue(maxsize=self.queue_size)
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+        if heartbeat is not None:
+            self._heartbeat_task = asyncio.create_task(self._heartbeat(heartbeat))
+
+    async def stop(self) -> None:
+        tasks = self._tasks + ([self._heartbeat_task] if self._heartbeat_task else [])
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._tasks = []
+        self._heartbeat_task = None
+        self._queue = None
+
+
+# Singleton instance
+export_runner = ExportJobRunner(
+    workers=settings.EXPORT_WORKERS,
+    queue_size=settings.EXPORT_QUEUE_SIZE,
+    heartbeat_interval=settings.EXPORT_HEARTBEAT_INTERVAL,
+)
@@ -1,17 +1,59 @@
+import asyncio
+import hashlib
 import io
+import logging
 import os
-from datetime import datetime
-from typing import Any, BinaryIO, Dict, List, Tuple
+import weakref
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Tuple
 
 from fastapi import HTTPException, UploadFile, status
-from pytz import timezone
 
 from app.core.config import settings
 from app.core.minio_client import MinioClient
 from app.models.file_model import FileModel
 from app.repositories.file_repository import FileRepository
+from app.utils.zip_stream import ZipMember, ZipSource, stream_zip
 
 from . import BaseService
+from .image_processor import DERIVABLE_CONTENT_TYPES, image_processor
+
+logger = logging.getLogger(__name__)
+
+HASH_CHUNK_SIZE = 1024 * 1024
+
+# Satu lock per objek turunan agar request bersamaan tidak me-render gambar yang sama berkali-kali
+_derivative_locks: "weakref.WeakValueDictionary[str, asyncio.Lock]" = weakref.WeakValueDictionary()
+
+
+def derivative_object_name(object_name: str, width: int) -> str:
+    """Key MinIO untuk turunan WebP; semua turunan satu objek berada di bawah prefix yang sama."""
+    return f"{derivative_prefix(object_name)}w{width}.webp"
+
+
+def derivative_prefix(object_name: str) -> str:
+    return f"derived/{object_name}/"
+
+
+class UploadStream:
+    """
+    Pembungkus UploadFile untuk put_object: membaca spool upload per chunk dan
+    menghentikan upload begitu ukurannya melewati max_size.
+    """
+
+    def __init__(self, file: UploadFile, max_size: int, on_exceeded: Callable[[int], Any]):
+        self.file = file
+        self.max_size = max_size
+        self.on_exceeded = on_exceeded
+        self.size = 0
+
+    async def read(self, size: int = -1) -> bytes:
+        # Baca paling banyak satu byte di atas batas agar file yang melebihi batas terdeteksi
+        remaining = self.max_size - self.size + 1
+        chunk = await self.file.read(remaining if size < 0 else min(size, remaining))
+        self.size += len(chunk)
+        if self.size > self.max_size:
+            await self.on_exceeded(self.size)
+        return chunk
 
 
 class FileService(BaseService[FileModel, FileRepository]):
@@ -59,41 +101,52 @@ class FileService(BaseService[FileModel, FileRepository]):
         try:
             await self.validate_file_extension(file.filename)
 
-            object_name = f"{datetime.now(timezone(settings.TIMEZONE)).strftime('%Y%m%d%S')}-{file.filename}"
-
-            content = await file.read()
-            content_length = len(content)
-
-            await self.validate_file_size(content_length)
-
-            file_data = io.BytesIO(content)
-
-            metadata = {
-                "filename": file.filename,
-                "description": description or "",
-                "uploaded_by": str(user_id) if user_id else None,
-            }
-
-            url = await self.minio_client.upload_file(
-                file_data=file_data,
-                object_name=object_name,
-                content_type=file.content_type,
-                content_length=content_length,
-                metadata=metadata,
-            )
+            # Tolak lebih awal jika ukuran sudah diketahui dari request multipart
+            if file.size is not None:
+                await self.validate_file_size(file.size)
 
+            content_hash, content_length = await self._hash_upload(file)
             file_data = {
                 "filename": file.filename,
-                "object_name": object_name,
                 "content_type": file.content_type,
                 "size": content_length,
                 "description": description,
-                "url": url,
                 "user_id": user_id if user_id else None,
+                "content_hash": content_hash,
             }
 
-            db_file = await self.create(file_data)
-            return db_file
+            # Isi yang sama sudah tersimpan: cukup tambah referensi blob, tanpa upload ulang
+            blob = await self.repository.add_reference(content_hash)
+            if blob is None:
+                ext = os.path.splitext(file.filename)[1].lower()
+                object_name = f"{content_hash}{ext}"
+
+                # Objek dipakai bersama oleh semua upload dengan isi yang sama; nama file, deskripsi,
+                # dan pengupload hanya disimpan di row `files` masing-masing (lihat get_download_name)
+                await self.minio_client.upload_file(
+                    file_data=UploadStream(file, settings.MAX_UPLOAD_SIZE, self.validate_file_size),
+                    object_name=object_name,
+                    content_type=file.content_type,
+                    content_length=content_length,
+                )
+
+                blob = await self.repository.create_blob(content_hash, object_name)
+                if blob is None:
+                    # Upload paralel dengan isi yang sama lebih dulu tersimpan
+                    blob = await self.repository.add_reference(content_hash)
+                    if blob is None:
+                        raise RuntimeError(f"Blob {content_hash} tidak ditemukan")
+                    if blob.object_name != object_name:
+                        await self.minio_client.delete_file(object_name)
+
+            file_data["object_name"] = blob.object_name
+            file_data["url"] = await self.minio_client.get_file_url(blob.object_name)
+            try:
+                # Referensi blob dan row file di-commit bersama
+                return await self.create(file_data)
+            except Exception:
+                await self.repository.session.rollback()
+                raise
 
         except HTTPException as e:
             raise e
@@ -103,15 +156,126 @@ class FileService(BaseService[FileModel, FileRepository]):
                 detail=f"Gagal mengupload file",
             )
 
+    async def _hash_upload(self, file: UploadFile) -> Tuple[str, int]:
+        """Hitung sha256 spool upload per chunk sambil menegakkan MAX_UPLOAD_SIZE."""
+        await file.seek(0)
+        digest = hashlib.sha256()
+        stream = UploadStream(file, settings.MAX_UPLOAD_SIZE, self.validate_file_size)
+        while chunk := await stream.read(HASH_CHUNK_SIZE):
+            digest.update(chunk)
+        await file.seek(0)
+        return digest.hexdigest(), stream.size
+
+    async def get_download_url(
+        self, object_name: str, filename: Optional[str] = None, content_type: Optional[str] = None
+    ) -> str:
+        """Presigned URL untuk download langsung dari MinIO (mode redirect)."""
+        return await self.minio_client.get_presigned_url(object_name, filename=filename, content_type=content_type)
+
+    async def get_download_name(
+        self, source_name: str, object_name: str, user_id: Optional[str]
+    ) -> Tuple[str, Optional[str]]:
+        """
+        Nama file dan content type download `object_name` (objek `source_name` atau turunannya).
+        Objek dipakai bersama oleh semua upload dengan isi yang sama, jadi keduanya diambil dari
+        row `files` milik pemanggil; tanpa row milik pemanggil dipakai nama objek agar nama file
+        pengupload lain tidak bocor. Content type None berarti content type objek.
+        """
+        file = await self.repository.find_by_object_name_for_user(source_name, user_id) if user_id else None
+        if file is None:
+            return os.path.basename(object_name), None
+        if object_name != source_name:
+            # Turunan gambar: nama file pemanggil dengan ekstensi turunan
+            return os.path.splitext(file.filename)[0] + os.path.splitext(object_name)[1], None
+        return file.filename, file.content_type
+
+    async def get_file_info(self, object_name: str) -> Dict[str, Any]:
+        """Ambil info objek di MinIO (ukuran, ETag, last modified) tanpa mengunduh isinya."""
+        return await self.minio_client.stat_file(object_name)
+
+    async def _stat_if_exists(self, object_name: str) -> Optional[Dict[str, Any]]:
+        try:
+            return await self.minio_client.stat_file(object_name)
+        except HTTPException as e:
+            if e.status_code == status.HTTP_404_NOT_FOUND:
+                return None
+            raise
+
+    async def get_image_derivative(self, object_name: str, width: int) -> Tuple[str, Dict[str, Any]]:
+        """
+        Turunan WebP selebar `width` dari gambar `object_name`, dibuat saat pertama diminta
+        lalu disimpan di MinIO. Jika objek bukan gambar yang didukung (atau Pillow tidak
+        terpasang), objek asli yang dikembalikan.
+
+        Returns:
+            Tuple dari (object name yang disajikan, object info)
+        """
+        if width not in settings.IMAGE_DERIVATIVE_WIDTHS:
+            allowed_widths = ", ".join(str(w) for w in settings.IMAGE_DERIVATIVE_WIDTHS)
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Lebar gambar tidak didukung. Lebar yang diperbolehkan: {allowed_widths}",
+            )
+
+        derived_name = derivative_object_name(object_name, width)
+        derived_info = await self._stat_if_exists(derived_name)
+        if derived_info:
+            return derived_name, derived_info
+
+        lock = _derivative_locks.get(derived_name)
+        if lock is None:
+            lock = _derivative_locks[derived_name] = asyncio.Lock()
+
+        async with lock:
+            # Request lain mungkin sudah membuatnya selama menunggu lock
+            derived_info = await self._stat_if_exists(derived_name)
+            if derived_info:
+                return derived_name, derived_info
+
+            object_info = await self.get_file_info(object_name)
+            if (
+                not image_processor.available
+                or object_info["_content_type"] not in DERIVABLE_CONTENT_TYPES
+                or object_info["_size"] > settings.IMAGE_MAX_SOURCE_SIZE
+            ):
+                return object_name, object_info
+
+            content, object_info = await self.minio_client.download_file(object_name, object_info=object_info)
+            data = b"".join([chunk async for chunk in content])
+            try:
+                rendered = await image_processor.to_webp(data, width)
+            except Exception as err:
+                # Gambar rusak/tidak terbaca: sajikan aslinya
+                logger.warning("Gagal membuat turunan %s: %r", derived_name, err)
+                return object_name, object_info
+
+            await self.minio_client.upload_file(
+                file_data=io.BytesIO(rendered),
+                object_name=derived_name,
+                content_type="image/webp",
+                content_length=len(rendered),
+                metadata={"source": object_name},
+            )
+            return derived_name, await self.minio_client.stat_file(derived_name)
+
     async def get_file_content(
-        self, file_id: int = None, object_name: str = None, db_check: bool = False
-    ) -> Tuple[BinaryIO, Dict[str, Any], FileModel]:
+        self,
+        file_id: int = None,
+        object_name: str = None,
+        db_check: bool = False,
+        offset: int = 0,
+        length: Optional[int] = None,
+        object_info: Optional[Dict[str, Any]] = None,
+    ) -> Tuple[AsyncIterator[bytes], Dict[str, Any]]:
         """
         Ambil konten file dari MinIO.
 
         Args:
             file_id: ID file di database
             object_name: Nama file di MinIO
+            offset: Byte awal (untuk Range request)
+            length: Jumlah byte, default sampai akhir file
+            object_info: Hasil get_file_info jika sudah diambil
 
         Returns:
             Tuple dari (file content, object info, file model)
@@ -136,16 +300,67 @@ class FileService(BaseService[FileModel, FileRepository]):
 
                 object_name = file_model.object_name
 
-            object_content, object_info = await self.minio_client.get_file(object_name=object_name)
+            object_content, object_info = await self.minio_client.download_file(
+                object_name=object_name, offset=offset, length=length, object_info=object_info
+            )
 
             return object_content, object_info
 
         except HTTPException as e:
             raise e
 
+    def _zip_source(self, object_name: str, name: str) -> ZipSource:
+        async def fetch() -> ZipMember:
+            content, object_info = await self.minio_client.download_file(object_name)
+            return ZipMember(name, object_info["_size"], object_info["_last_modified"], content)
+
+        return fetch
+
+    async def get_zip_content(
+        self, user_id: str, ids: Optional[List[int]] = None, prefix: Optional[str] = None
+    ) -> AsyncIterator[bytes]:
+        """
+        Arsip ZIP dari beberapa file yang dibangun sambil dialirkan.
+
+        Daftar file ditentukan (dan divalidasi) sebelum streaming dimulai, sehingga error
+        seperti file tidak ditemukan tetap menjadi response 4xx biasa.
+
+        Args:
+            user_id: ID pengguna yang meminta arsip
+            ids: ID file di database; ID milik pengguna lain dianggap tidak ditemukan
+            prefix: Awalan object name; hanya file milik user_id yang diambil
+
+        Returns:
+            Iterator isi ZIP
+        """
+        if ids is not None:
+            files = await self.repository.find_by_ids(ids, user_id)
+            missing = set(ids) - {file.id for file in files}
+            if missing:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail=f"File tidak ditemukan: {', '.join(str(id) for id in sorted(missing))}",
+                )
+            by_id = {file.id: file for file in files}
+            sources = [self._zip_source(by_id[id].object_name, by_id[id].filename) for id in dict.fromkeys(ids)]
+        else:
+            # Mode prefix dibatasi ke row `files` milik pengguna, bukan seluruh isi bucket
+            files = await self.repository.find_by_user_and_prefix(user_id, prefix, limit=settings.ZIP_MAX_FILES + 1)
+            if not files:
+                raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="File tidak ditemukan")
+            sources = [self._zip_source(file.object_name, file.filename) for file in files]
+
+        if len(sources) > settings.ZIP_MAX_FILES:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Terlalu banyak file. Maksimal {settings.ZIP_MAX_FILES} file per arsip",
+            )
+
+        return stream_zip(sources, concurrency=settings.ZIP_CONCURRENCY, read_ahead=settings.ZIP_READ_AHEAD)
+
     async def delete_file_with_content(self, file_id: str, user_id: str) -> bool:
         """
-        Hapus file dari MinIO dan database.
+        Hapus row file dan lepas referensinya; objek MinIO baru dihapus saat referensi terakhir dilepas.
 
         Args:
             file_id: ID file di database
@@ -159,15 +374,19 @@ class FileService(BaseService[FileModel, FileRepository]):
             if not file_model:
                 raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="File tidak ditemukan")
 
-            if str(file_model.uploaded_by) != user_id:
+            if str(file_model.user_id) != user_id:
                 raise HTTPException(
                     status_code=status.HTTP_403_FORBIDDEN,
                     detail="Anda tidak memiliki akses untuk menghapus file ini",
                 )
 
-            await self.minio_client.delete_file(file_model.object_name)
+            async def delete_object(object_name: str) -> None:
+                await self.minio_client.delete_file(object_name)
+                for derived in await self.minio_client.list_files(prefix=derivative_prefix(object_name)):
+                    await self.minio_client.delete_file(derived["name"])
 
-            await self.delete(file_id)
+            await self.repository.release_reference(file_model.id, on_last=delete_object)
+            await self._after_write(file_model.id)
 
             return True
 
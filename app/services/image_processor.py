@@ -0,0 +1,70 @@
+import asyncio
+import importlib.util
+import io
+import logging
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Content type yang bisa dibuatkan turunan; format lain (mis. GIF animasi) disajikan apa adanya
+DERIVABLE_CONTENT_TYPES = {"image/jpeg", "image/jpg", "image/png", "image/webp"}
+
+
+def render_webp(data: bytes, width: int, quality: int) -> bytes:
+    """
+    Ubah ukuran gambar ke lebar `width` (rasio dipertahankan, tidak diperbesar) lalu encode ke WebP.
+    Dijalankan di process pool, jadi harus berupa fungsi top-level.
+    """
+    from PIL import Image, ImageOps
+
+    with Image.open(io.BytesIO(data)) as source:
+        # Foto dari kamera sering hanya menyimpan orientasi di EXIF
+        image = ImageOps.exif_transpose(source)
+        if image.mode not in ("RGB", "RGBA"):
+            image = image.convert("RGBA" if "A" in image.getbands() or "transparency" in image.info else "RGB")
+        if image.width > width:
+            height = max(1, round(image.height * width / image.width))
+            image = image.resize((width, height), Image.Resampling.LANCZOS)
+
+        output = io.BytesIO()
+        image.save(output, format="WEBP", quality=quality, method=4)
+        return output.getvalue()
+
+
+def pillow_available() -> bool:
+    return importlib.util.find_spec("PIL") is not None
+
+
+class ImageProcessor:
+    """
+    Process pool untuk resize/encode gambar agar pekerjaan CPU tidak memblok event loop.
+    Pool dibuat saat start() (atau saat pertama dipakai) dan ditutup saat stop().
+    """
+
+    def __init__(self, workers: int = 2, quality: int = 80):
+        self.workers = workers
+        self.quality = quality
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self.available = pillow_available()
+        if not self.available:
+            logger.warning("Pillow tidak terpasang, turunan gambar (?w=) dinonaktifkan")
+
+    def start(self) -> None:
+        if self.available and self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.workers)
+
+    def stop(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+    async def to_webp(self, data: bytes, width: int) -> bytes:
+        self.start()
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._pool, render_webp, data, width, self.quality)
+
+
+image_processor = ImageProcessor(workers=settings.IMAGE_WORKERS, quality=settings.IMAGE_WEBP_QUALITY)
@@ -1,36 +1,72 @@
+import asyncio
+import logging
+from typing import Any, Dict
+
+from app.core.config import settings
 from app.repositories import InfographicRepository
 
+from .infographic_store import SECTIONS, InfographicStore, infographic_store
+
+logger = logging.getLogger(__name__)
+
 
 class InfographicService:
-    def __init__(self, repository: InfographicRepository):
+    """Data infografis disajikan dari snapshot InfographicStore, bukan query langsung."""
+
+    def __init__(self, repository: InfographicRepository, store: InfographicStore = infographic_store):
         self.repository = repository
+        self.store = store
+
+    async def get_all(self, fan_out: bool = True) -> Dict[str, Any]:
+        """
+        Semua section infografis sekaligus.
+        fan_out=True: section yang perlu dihitung berjalan paralel, masing-masing dengan session
+        dan timeout sendiri; section yang gagal diganti penanda error tanpa menggagalkan yang lain.
+        """
+        if not fan_out:
+            return {section: await self.store.get(section, self.repository) for section in SECTIONS}
+
+        results = await asyncio.gather(
+            *(self.store.get(section, self.repository, isolated=True) for section in SECTIONS),
+            return_exceptions=True,
+        )
+        return {
+            section: self._section_error(section, result) if isinstance(result, BaseException) else result
+            for section, result in zip(SECTIONS, results)
+        }
+
+    @staticmethod
+    def _section_error(section: str, exc: BaseException) -> Dict[str, Any]:
+        logger.error("Section infografis %s gagal: %r", section, exc)
+        message = "Query timed out" if isinstance(exc, asyncio.TimeoutError) else "Query failed"
+        return {"error": message, "detail": str(exc) if settings.DEBUG else None}
 
     async def get_farmer_incomes(self):
-        return await self.repository.get_farmer_incomes()
+        return await self.store.get("farmer_incomes", self.repository)
 
     async def get_social_forestry_achievement_by_schema(self):
-        return await self.repository.get_social_forestry_achievement_by_schema()
+        return await self.store.get("social_forestry_achievement_by_schema", self.repository)
 
     async def get_businesses_class_progress(self):
-        return await self.repository.get_businesses_class_progress()
+        return await self.store.get("businesses_class_progress", self.repository)
 
     async def get_growth_forestry_business_unit(self):
-        return await self.repository.get_growth_forestry_business_unit()
+        return await self.store.get("growth_forestry_business_unit", self.repository)
 
     async def get_summary_infographic(self):
-        return await self.repository.get_summary_infographic()
+        return await self.store.get("summary", self.repository)
 
     async def get_forestry_area_by_regional(self):
-        return await self.repository.get_forestry_area_by_regional()
+        return await self.store.get("forestry_area_by_regional", self.repository)
 
     async def get_households_by_regional(self):
-        return await self.repository.get_households_by_regional()
+        return await self.store.get("households_by_regional", self.repository)
 
     async def get_social_forestry_commodities_by_regency(self):
-        return await self.repository.get_social_forestry_commodities_by_regency()
+        return await self.store.get("social_forestry_commodities_by_regency", self.repository)
 
     async def get_sum_businesses_class_by_regency(self):
-        return await self.repository.get_sum_businesses_class_by_regency()
+        return await self.store.get("sum_businesses_class_by_regency", self.repository)
 
     async def get_sum_forestry_schema_by_regency(self):
-        return await self.repository.get_sum_forestry_schema_by_regency()
+        return await self.store.get("sum_forestry_schema_by_regency", self.repository)
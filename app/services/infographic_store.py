@@ -0,0 +1,209 @@
+import asyncio
+import logging
+import time
+from typing import (
+    Any,
+    AsyncContextManager,
+    Callable,
+    Dict,
+    FrozenSet,
+    Iterable,
+    Optional,
+    Set,
+    Tuple,
+)
+
+from fastapi_async_sqlalchemy import db
+
+from app.core.config import settings
+from app.repositories import InfographicRepository
+
+logger = logging.getLogger(__name__)
+
+# Section infografis -> (method InfographicRepository, tabel sumber)
+SECTIONS: Dict[str, Tuple[str, FrozenSet[str]]] = {
+    "summary": (
+        "get_summary_infographic",
+        frozenset({"forestry", "businesses", "businesses_product"}),
+    ),
+    "farmer_incomes": (
+        "get_farmer_incomes",
+        frozenset({"pendapatan"}),
+    ),
+    "social_forestry_achievement_by_schema": (
+        "get_social_forestry_achievement_by_schema",
+        frozenset({"forestry", "businesses", "stat_forestry_skema"}),
+    ),
+    "businesses_class_progress": (
+        "get_businesses_class_progress",
+        frozenset({"forestry", "businesses", "stat_businesses_class"}),
+    ),
+    "growth_forestry_business_unit": (
+        "get_growth_forestry_business_unit",
+        frozenset({"businesses", "stat_businesses_operational"}),
+    ),
+    "forestry_area_by_regional": (
+        "get_forestry_area_by_regional",
+        frozenset({"forestry", "regional"}),
+    ),
+    "households_by_regional": (
+        "get_households_by_regional",
+        frozenset({"forestry", "regional"}),
+    ),
+    "social_forestry_commodities_by_regency": (
+        "get_social_forestry_commodities_by_regency",
+        frozenset({"forestry", "businesses", "businesses_product", "komoditas", "regional"}),
+    ),
+    "sum_businesses_class_by_regency": (
+        "get_sum_businesses_class_by_regency",
+        frozenset({"forestry", "businesses", "stat_businesses_class", "regional"}),
+    ),
+    "sum_forestry_schema_by_regency": (
+        "get_sum_forestry_schema_by_regency",
+        frozenset({"forestry", "regional"}),
+    ),
+}
+
+
+class InfographicStore:
+    """
+    Snapshot agregat infografis di memori proses.
+
+    Setiap section dihitung sekali lalu disajikan dari snapshot. Write pada tabel sumber
+    hanya menandai section yang bergantung padanya sebagai dirty; scheduler menghitung
+    ulang section dirty tersebut (debounce) dan seluruh snapshot tiap refresh_interval.
+    Selama perhitungan ulang berjalan, request tetap mendapat snapshot lama.
+    """
+
+    def __init__(
+        self,
+        refresh_interval: int = 300,
+        query_timeout: float = 30.0,
+        max_concurrency: int = len(SECTIONS),
+        debounce: float = 2.0,
+        session_scope: Callable[[], AsyncContextManager[Any]] = db,
+    ):
+        self.refresh_interval = refresh_interval
+        self.query_timeout = query_timeout
+        self.debounce = debounce
+        self.session_scope = session_scope
+        self._snapshot: Dict[str, Any] = {}
+        self._built_at: Dict[str, float] = {}
+        self._dirty: Set[str] = set()
+        self._locks: Dict[str, asyncio.Lock] = {}
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    async def get(self, section: str, repository: InfographicRepository, isolated: bool = False) -> Any:
+        """
+        Ambil section dari snapshot; hitung langsung hanya jika belum ada (atau dirty tanpa scheduler).
+        isolated=True menghitungnya di session sendiri sehingga beberapa section bisa berjalan paralel.
+        """
+        if section not in self._snapshot or (section in self._dirty and not self.running):
+            if isolated:
+                await self.refresh_isolated(section, repository)
+            else:
+                await self.refresh(section, repository)
+        return self._snapshot[section]
+
+    async def refresh(self, section: str, repository: InfographicRepository, force: bool = False) -> None:
+        lock = self._locks.setdefault(section, asyncio.Lock())
+        async with lock:
+            # Request lain mungkin sudah menghitungnya selama menunggu lock
+            if not force and section in self._snapshot and section not in self._dirty:
+                return
+            # Dibuang sebelum query agar write yang terjadi selama query menandainya dirty lagi
+            self._dirty.discard(section)
+            method_name, _ = SECTIONS[section]
+            try:
+                self._snapshot[section] = await getattr(repository, method_name)()
+            except BaseException:
+                self._dirty.add(section)
+                raise
+            self._built_at[section] = time.monotonic()
+
+    async def refresh_isolated(self, section: str, repository: InfographicRepository, force: bool = False) -> None:
+        """Refresh dengan koneksi pool sendiri dan batas waktu query_timeout."""
+        async with self._semaphore, self.session_scope():
+            await asyncio.wait_for(self.refresh(section, repository, force), timeout=self.query_timeout)
+
+    def invalidate(self, *tables: str) -> Set[str]:
+        """Tandai section yang membaca salah satu tabel sebagai dirty."""
+        changed = set(tables)
+        sections = {name for name, (_, sources) in SECTIONS.items() if sources & changed}
+        if sections:
+            self._dirty |= sections
+            if self._wakeup is not None:
+                self._wakeup.set()
+        return sections
+
+    async def rebuild(self, sections: Optional[Iterable[str]] = None) -> None:
+        """Hitung ulang section (default semua) secara paralel, di luar request."""
+        sections = list(SECTIONS if sections is None else sections)
+        repository = InfographicRepository()
+        results = await asyncio.gather(
+            *(self.refresh_isolated(section, repository, force=True) for section in sections),
+            return_exceptions=True,
+        )
+        for section, result in zip(sections, results):
+            if isinstance(result, BaseException):
+                logger.error("Gagal refresh section infografis %s: %r", section, result)
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.refresh_interval)
+                # Gabungkan beberapa write beruntun menjadi satu refresh
+                await asyncio.sleep(self.debounce)
+                sections = set(self._dirty)
+            except asyncio.TimeoutError:
+                sections = None
+            self._wakeup.clear()
+
+            await self.rebuild(sections)
+
+    def start(self) -> None:
+        if self.running:
+            return
+        self._wakeup = asyncio.Event()
+        self._dirty |= set(SECTIONS) - set(self._snapshot)
+        self._wakeup.set()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        self._wakeup = None
+
+    def clear(self) -> None:
+        self._snapshot.clear()
+        self._built_at.clear()
+        self._dirty.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        now = time.monotonic()
+        return {
+            "sections": len(self._snapshot),
+            "dirty": sorted(self._dirty),
+            "age": {name: round(now - built_at, 3) for name, built_at in self._built_at.items()},
+            "running": self.running,
+        }
+
+
+# Singleton instance
+infographic_store = InfographicStore(
+    refresh_interval=settings.INFOGRAPHIC_REFRESH_INTERVAL,
+    query_timeout=settings.INFOGRAPHIC_QUERY_TIMEOUT,
+    max_concurrency=settings.INFOGRAPHIC_MAX_CONCURRENCY,
+)
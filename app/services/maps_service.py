@@ -1,3 +1,4 @@
+from app.core.data_types import CountModeEnum
 from app.repositories import MapsRepository
 
 
@@ -5,5 +6,11 @@ class MapsService:
     def __init__(self, repository: MapsRepository):
         self.repository = repository
 
-    async def get_all(self, filters: dict = None, limit: int = 100, offset: int = 0):
-        return await self.repository.get_all(filters, limit, offset)
+    async def get_all(
+        self,
+        filters: dict = None,
+        limit: int = 100,
+        offset: int = 0,
+        count: CountModeEnum = CountModeEnum.EXACT,
+    ):
+        return await self.repository.get_all(filters, limit, offset, count)
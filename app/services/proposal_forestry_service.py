@@ -1,9 +1,19 @@
-from typing import Dict, List, Optional, Union, override
+from typing import (
+    Any,
+    AsyncGenerator,
+    AsyncIterable,
+    Dict,
+    List,
+    Optional,
+    Union,
+    override,
+)
 
+from app.core.data_types import ExportFormatEnum
 from app.models import ForestryProposalModel
 from app.repositories import ForestryProposalRepository
 from app.schemas.user_schema import UserSchema
-from app.utils.helpers import export_to_xlsx
+from app.utils.helpers import stream_export
 
 from . import BaseService
 
@@ -30,8 +40,22 @@ class ForestyProposalService(BaseService[ForestryProposalModel, ForestryProposal
         forestry_data["updated_by"] = current_user.id
         return await super().update(id, forestry_data, refresh)
 
-    async def export_to_excel(
+    # Kolom export: header -> tipe (dipakai skema Parquet)
+    EXPORT_COLUMNS: Dict[str, type] = {
+        "No": int,
+        "Nama PPS": str,
+        "Lokasi Kabupaten": str,
+        "Nama KPH": str,
+        "Skema PS": str,
+        "Luas PS": float,
+        "Status Proses": str,
+        "Dibuat": str,
+        "Diperbarui": str,
+    }
+
+    def export(
         self,
+        export_format: ExportFormatEnum = ExportFormatEnum.XLSX,
         filters: Optional[Union[str, List[str]]] = None,
         sort: Optional[Union[str, List[str]]] = None,
         search: str = "",
@@ -40,9 +64,9 @@ class ForestyProposalService(BaseService[ForestryProposalModel, ForestryProposal
         offset: int = 0,
         relationships: Optional[List[str]] = None,
         searchable_columns: Optional[List[str]] = None,
-    ) -> bytes:
-
-        forestry_data, _ = await self.repository.find_all(
+    ) -> AsyncGenerator[bytes, None]:
+        """Stream file export proposal kehutanan dalam format xlsx, csv, atau parquet."""
+        records = self.iter_all(
             filters=filters,
             sort=sort,
             search=search,
@@ -51,35 +75,24 @@ class ForestyProposalService(BaseService[ForestryProposalModel, ForestryProposal
             offset=offset,
             relationships=relationships,
             searchable_columns=searchable_columns,
-            all=True,
+        )
+        return stream_export(
+            export_format, self.EXPORT_COLUMNS, self.export_rows(records), sheet_name="proposal_kehutanan"
         )
 
-        data = [
-            [
-                "No",
-                "Nama PPS",
-                "Lokasi Kabupaten",
-                "Nama KPH",
-                "Skema PS",
-                "Luas PS",
-                "Status Proses",
-                "Dibuat",
-                "Diperbarui",
+    async def export_rows(self, records: AsyncIterable[Dict[str, Any]]) -> AsyncGenerator[List[Any], None]:
+        """Baris export proposal kehutanan (tanpa header)."""
+        idx = 0
+        async for item in records:
+            idx += 1
+            yield [
+                idx,
+                item.get("name", ""),
+                (item.get("regional") or {}).get("name", ""),
+                (item.get("kph_account") or {}).get("name", ""),
+                (item.get("schema") or {}).get("name", ""),
+                item.get("area", ""),
+                item.get("status", ""),
+                (item.get("created_at", "").strftime("%d-%m-%Y") if item.get("created_at") else ""),
+                (item.get("updated_at", "").strftime("%d-%m-%Y") if item.get("updated_at") else ""),
             ]
-        ]
-        for idx, item in enumerate(forestry_data, start=1):
-            data.append(
-                [
-                    idx,
-                    item.get("name", ""),
-                    (item.get("regional") or {}).get("name", ""),
-                    (item.get("kph_account") or {}).get("name", ""),
-                    (item.get("schema") or {}).get("name", ""),
-                    item.get("area", ""),
-                    item.get("status", ""),
-                    (item.get("created_at", "").strftime("%d-%m-%Y") if item.get("created_at") else ""),
-                    (item.get("updated_at", "").strftime("%d-%m-%Y") if item.get("updated_at") else ""),
-                ]
-            )
-
-        return export_to_xlsx(data, sheet_name="proposal_kehutanan")
@@ -38,7 +38,9 @@ class UserService(BaseService[UserModel, UserRepository]):
         user_data["password"] = get_password_hash(user_data["password"])
         user_data["created_by"] = current_user.id
 
-        return await self.repository.create(user_data)
+        user = await self.repository.create(user_data)
+        await self._after_write()
+        return user
 
     @override
     async def update(self, id: str, user_data: Dict[str, Union[str, int]], current_user: UserSchema) -> UserModel:
@@ -70,7 +72,9 @@ class UserService(BaseService[UserModel, UserRepository]):
         # Add audit field
         user_data["updated_by"] = current_user.id
 
-        return await self.repository.update(id, user_data)
+        user = await self.repository.update(id, user_data)
+        await self._after_write(id)
+        return user
 
     async def find_by_id_with_permissions(self, id: str) -> Optional[Dict]:
         """Find user by ID with role and permissions."""
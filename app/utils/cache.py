@@ -1,28 +1,457 @@
-import os
+import asyncio
+import logging
+import math
+import pickle
+import random
+import sys
+import time
+import uuid
+from collections import OrderedDict
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+    TypeVar,
+)
 
 from aiocache import SimpleMemoryCache
 
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+_ATOMIC_TYPES = (str, bytes, bytearray, int, float, bool, type(None))
+
+# Key versi tag di cache
+TAG_KEY_PREFIX = "tag:"
+
+
+def estimate_size(value: Any, _seen: Optional[set] = None) -> int:
+    """Perkiraan memori (byte) sebuah nilai beserta isinya: dict/list/tuple/set dan atribut objek (mis. schema)."""
+    size = sys.getsizeof(value)
+    if isinstance(value, _ATOMIC_TYPES):
+        return size
+
+    _seen = _seen if _seen is not None else set()
+    if id(value) in _seen:
+        return 0
+    _seen.add(id(value))
+
+    if isinstance(value, dict):
+        return size + sum(estimate_size(k, _seen) + estimate_size(v, _seen) for k, v in value.items())
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return size + sum(estimate_size(item, _seen) for item in value)
+    if hasattr(value, "__dict__"):
+        return size + estimate_size(vars(value), _seen)
+    return size
+
+
+class LRUMemoryCache:
+    """
+    Backend cache di memori proses dengan batas jumlah entry dan perkiraan ukuran (byte).
+    Entry yang paling lama tidak dipakai dibuang lebih dulu; entry kedaluwarsa (TTL)
+    dibuang saat dibaca atau tergeser LRU. Interface async sama dengan SimpleMemoryCache.
+    """
+
+    def __init__(self, max_entries: int = 10000, max_bytes: int = 64 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        # key -> (value, waktu kedaluwarsa monotonic atau None, perkiraan ukuran)
+        self._entries: "OrderedDict[str, Tuple[Any, Optional[float], int]]" = OrderedDict()
+
+    async def get(self, key: str, default: Any = None) -> Any:
+        entry = self._entries.get(key)
+        if entry is not None and entry[1] is not None and time.monotonic() >= entry[1]:
+            self._remove(key)
+            self.expirations += 1
+            entry = None
+        if entry is None:
+            self.misses += 1
+            return default
+
+        self.hits += 1
+        self._entries.move_to_end(key)
+        return entry[0]
+
+    async def set(self, key: str, value: Any, ttl: Optional[float] = None) -> bool:
+        self._remove(key)
+        size = estimate_size(key) + estimate_size(value)
+        # Nilai yang lebih besar dari seluruh budget tidak disimpan (tidak boleh mengosongkan cache)
+        if size > self.max_bytes:
+            return False
+
+        self._entries[key] = (value, time.monotonic() + ttl if ttl else None, size)
+        self.bytes += size
+        while len(self._entries) > self.max_entries or self.bytes > self.max_bytes:
+            _, (_, _, evicted_size) = self._entries.popitem(last=False)
+            self.bytes -= evicted_size
+            self.evictions += 1
+        return True
+
+    async def delete(self, key: str) -> int:
+        return int(self._remove(key))
+
+    async def clear(self) -> bool:
+        self._entries.clear()
+        self.bytes = 0
+        return True
+
+    def _remove(self, key: str) -> bool:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return False
+        self.bytes -= entry[2]
+        return True
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "entries": len(self._entries),
+            "bytes": self.bytes,
+            "max_entries": self.max_entries,
+            "max_bytes": self.max_bytes,
+        }
+
+
+def create_cache_backend(backend: str):
+    """Backend sesuai CACHE_BACKEND: "lru" (terbatas) atau "simple" (SimpleMemoryCache aiocache, tanpa batas)."""
+    if backend == "simple":
+        return SimpleMemoryCache()
+    return LRUMemoryCache(max_entries=settings.CACHE_MAX_ENTRIES, max_bytes=settings.CACHE_MAX_BYTES)
+
+
+class LocalSharedCache:
+    """
+    Pengganti L2 di dalam proses (test/development tanpa Redis). Satu instance dapat dipakai
+    bersama beberapa CacheManager untuk meniru beberapa worker; nilai disimpan sebagai bytes
+    dan pesan publish diteruskan ke semua subscriber, sama seperti RedisSharedCache.
+    """
+
+    def __init__(self):
+        self._entries: Dict[str, Tuple[bytes, Optional[float]]] = {}
+        self._subscribers: List[asyncio.Queue] = []
+
+    async def get(self, key: str) -> Tuple[Optional[bytes], Optional[float]]:
+        data, expires_at = self._entries.get(key, (None, None))
+        if expires_at is None:
+            return data, None
+        remaining = expires_at - time.monotonic()
+        if remaining <= 0:
+            self._entries.pop(key, None)
+            return None, None
+        return data, remaining
+
+    async def set(self, key: str, data: bytes, ttl: Optional[float] = None) -> None:
+        self._entries[key] = (data, time.monotonic() + ttl if ttl else None)
+
+    async def delete(self, key: str) -> None:
+        self._entries.pop(key, None)
+
+    async def publish(self, message: str) -> None:
+        for queue in self._subscribers:
+            queue.put_nowait(message)
+
+    async def subscribe(self) -> AsyncIterator[Optional[str]]:
+        queue: asyncio.Queue = asyncio.Queue()
+        self._subscribers.append(queue)
+        try:
+            yield None
+            while True:
+                yield await queue.get()
+        finally:
+            self._subscribers.remove(queue)
+
+    async def close(self) -> None:
+        pass
+
+
+class RedisSharedCache:
+    """L2 bersama semua worker di Redis; invalidasi disebar lewat pub/sub."""
+
+    def __init__(self, url: str, prefix: str = "sips:cache:"):
+        import redis.asyncio as redis
+
+        self.client = redis.from_url(url)
+        self.prefix = prefix
+        self.channel = f"{prefix}invalidate"
+
+    async def get(self, key: str) -> Tuple[Optional[bytes], Optional[float]]:
+        async with self.client.pipeline(transaction=False) as pipe:
+            data, pttl = await pipe.get(self.prefix + key).pttl(self.prefix + key).execute()
+        return data, (pttl / 1000 if pttl and pttl > 0 else None)
+
+    async def set(self, key: str, data: bytes, ttl: Optional[float] = None) -> None:
+        await self.client.set(self.prefix + key, data, px=int(ttl * 1000) if ttl else None)
+
+    async def delete(self, key: str) -> None:
+        await self.client.delete(self.prefix + key)
+
+    async def publish(self, message: str) -> None:
+        await self.client.publish(self.channel, message)
+
+    async def subscribe(self) -> AsyncIterator[Optional[str]]:
+        """Pesan invalidasi; None dikirim sekali saat Redis mengonfirmasi SUBSCRIBE."""
+        pubsub = self.client.pubsub()
+        await pubsub.subscribe(self.channel)
+        try:
+            async for message in pubsub.listen():
+                if message["type"] == "subscribe":
+                    yield None
+                elif message["type"] == "message":
+                    yield message["data"].decode()
+        finally:
+            await pubsub.aclose()
+
+    async def close(self) -> None:
+        await self.client.aclose()
+
+
+def create_shared_cache():
+    """L2 sesuai CACHE_REDIS_URL; None berarti cache hanya di memori proses."""
+    if not settings.CACHE_REDIS_URL:
+        return None
+    return RedisSharedCache(settings.CACHE_REDIS_URL, prefix=settings.CACHE_REDIS_PREFIX)
+
+
+class LoadedValue(NamedTuple):
+    """Nilai hasil get_or_load beserta batas segar (epoch detik) dan durasi loader untuk early refresh."""
+
+    value: Any
+    fresh_until: float
+    delta: float
+
+
+class TaggedValue(NamedTuple):
+    """Nilai bertag beserta versi tiap tag saat disimpan; basi jika salah satu versi tag sudah berganti."""
+
+    value: Any
+    tags: Tuple[str, ...]
+    versions: Tuple[Optional[str], ...]
+
 
 class CacheManager:
     """
     Class agnostik untuk handle operasi cache: get, set, delete.
-    Menggunakan SimpleMemoryCache sebagai backend.
+
+    Dua tingkat: L1 di memori proses (backend dipilih lewat CACHE_BACKEND) dan, jika
+    `shared` diisi, L2 bersama semua worker (Redis). Nilai di L1 hanya disimpan paling lama
+    l1_ttl detik; set/delete menyebarkan invalidasi lewat pub/sub agar L1 worker lain
+    membuang key tersebut. Jika L2 tidak bisa dihubungi, cache tetap berjalan dengan L1 saja.
+
+    Entry dapat diberi tag (mis. "model:BusinessesModel", "id:BusinessesModel:1"); setiap tag
+    punya versi di cache, dan invalidate_tags() cukup mengganti versi tag sehingga semua entry
+    yang disimpan dengan versi lama dianggap miss di semua worker.
     """
 
-    def __init__(self, ttl: int = None):
-        self.ttl = ttl or int(os.getenv("CACHE_TTL", 300))  # default 5 menit
-        self.cache = SimpleMemoryCache()
+    def __init__(self, ttl: int = None, backend: str = None, shared=None, l1_ttl: int = None):
+        self.ttl = ttl or settings.CACHE_TTL
+        self.cache = create_cache_backend(backend or settings.CACHE_BACKEND)
+        self.shared = shared
+        self.l1_ttl = l1_ttl or settings.CACHE_L1_TTL
+        self.stale_ttl = settings.CACHE_STALE_TTL
+        self.early_refresh_beta = settings.CACHE_EARLY_REFRESH_BETA
+        # Penanda worker ini agar invalidasi yang dikirim sendiri tidak diproses ulang
+        self._origin = uuid.uuid4().hex
+        self._listener: Optional[asyncio.Task] = None
+        # Loader yang sedang berjalan per key (single-flight)
+        self._inflight: Dict[str, asyncio.Task] = {}
 
     async def get(self, key: str):
-        return await self.cache.get(key)
+        value = await self._get(key)
+        if isinstance(value, TaggedValue):
+            if await self._tag_versions(value.tags) != value.versions:
+                return None
+            return value.value
+        return value
+
+    async def set(self, key: str, value, ttl: int = None, tags: Optional[List[str]] = None):
+        if tags:
+            tags = tuple(tags)
+            value = TaggedValue(value, tags, await self._tag_versions(tags, create=True))
+        await self._set(key, value, ttl)
+
+    async def _get(self, key: str):
+        value = await self.cache.get(key)
+        if value is not None or self.shared is None:
+            return value
+
+        data, remaining = await self._shared_call(f"get {key}", self.shared.get(key), (None, None))
+        if data is None:
+            return None
+        value = pickle.loads(data)
+        await self.cache.set(key, value, ttl=min(self.l1_ttl, remaining) if remaining else self.l1_ttl)
+        return value
 
-    async def set(self, key: str, value, ttl: int = None):
+    async def _set(self, key: str, value, ttl: int = None):
         ttl = ttl or self.ttl
-        await self.cache.set(key, value, ttl=ttl)
+        if self.shared is None:
+            await self.cache.set(key, value, ttl=ttl)
+            return
+
+        await self.cache.set(key, value, ttl=min(ttl, self.l1_ttl))
+        await self._shared_call(f"set {key}", self.shared.set(key, pickle.dumps(value), ttl))
+        await self._invalidate_others(key)
+
+    async def _tag_versions(self, tags: Tuple[str, ...], create: bool = False) -> Tuple[Optional[str], ...]:
+        versions = []
+        for tag in tags:
+            version = await self._get(TAG_KEY_PREFIX + tag)
+            if version is None and create:
+                version = uuid.uuid4().hex
+                await self._set(TAG_KEY_PREFIX + tag, version, ttl=settings.CACHE_TAG_TTL)
+            versions.append(version)
+        return tuple(versions)
+
+    async def invalidate_tags(self, *tags: str) -> None:
+        """Anggap basi semua entry yang membawa salah satu tag ini (di semua worker)."""
+        for tag in dict.fromkeys(tags):
+            # Versi baru (bukan increment) agar tidak perlu operasi atomik di L2
+            await self._set(TAG_KEY_PREFIX + tag, uuid.uuid4().hex, ttl=settings.CACHE_TAG_TTL)
 
     async def delete(self, key: str):
+        self._inflight.pop(key, None)
         await self.cache.delete(key)
+        if self.shared is not None:
+            await self._shared_call(f"delete {key}", self.shared.delete(key))
+            await self._invalidate_others(key)
+
+    async def get_or_load(
+        self,
+        key: str,
+        loader: Callable[[], Awaitable[T]],
+        ttl: int = None,
+        stale_ttl: int = None,
+        tags: Optional[List[str]] = None,
+    ) -> Optional[T]:
+        """
+        Read-through cache dengan perlindungan stampede:
+
+        - single-flight: per worker hanya satu loader per key yang berjalan, request lain menunggu hasilnya;
+        - stale-while-revalidate: setelah ttl habis nilai lama masih disajikan hingga stale_ttl detik
+          sambil loader dijalankan di background;
+        - early refresh probabilistik: menjelang ttl habis, refresh background kadang dimulai lebih awal
+          (makin dekat batas dan makin lama loader, makin besar peluangnya), agar key populer tidak
+          kedaluwarsa serentak.
+
+        Loader harus mandiri (mis. membuka session DB sendiri) karena bisa tetap berjalan setelah
+        request pemicunya selesai. Hasil None tidak disimpan. Entry yang tag-nya di-invalidate
+        langsung dianggap miss (tidak disajikan sebagai nilai basi).
+        """
+        ttl = ttl or self.ttl
+        stale_ttl = self.stale_ttl if stale_ttl is None else stale_ttl
+
+        cached = await self.get(key)
+        if cached is not None and not isinstance(cached, LoadedValue):
+            # Disimpan lewat set() biasa (tanpa metadata refresh)
+            return cached
+        if cached is not None:
+            if self._should_refresh(cached):
+                self._load(key, loader, ttl, stale_ttl, tags)
+            return cached.value
+
+        # shield: request yang dibatalkan tidak ikut membatalkan loader yang ditunggu request lain
+        return await asyncio.shield(self._load(key, loader, ttl, stale_ttl, tags))
+
+    def _should_refresh(self, entry: LoadedValue) -> bool:
+        # XFetch: -log(U) berdistribusi eksponensial, dikali durasi loader dan beta
+        jitter = -entry.delta * self.early_refresh_beta * math.log(1.0 - random.random())
+        return time.time() + jitter >= entry.fresh_until
+
+    def _load(
+        self, key: str, loader: Callable[[], Awaitable[T]], ttl: int, stale_ttl: int, tags: Optional[List[str]]
+    ) -> asyncio.Task:
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.create_task(self._run_loader(key, loader, ttl, stale_ttl, tags))
+            self._inflight[key] = task
+            task.add_done_callback(lambda done: self._load_done(key, done))
+        return task
+
+    async def _run_loader(
+        self, key: str, loader: Callable[[], Awaitable[T]], ttl: int, stale_ttl: int, tags: Optional[List[str]]
+    ) -> T:
+        # Versi tag diambil sebelum loader: invalidasi selama loader berjalan membuat hasilnya langsung basi
+        tags = tuple(tags or ())
+        versions = await self._tag_versions(tags, create=True)
+        started = time.monotonic()
+        value = await loader()
+        # Key di-invalidate selama loader berjalan: hasilnya mungkin sudah basi, jangan disimpan
+        if value is not None and self._inflight.get(key) is asyncio.current_task():
+            entry = LoadedValue(value, time.time() + ttl, time.monotonic() - started)
+            await self._set(key, TaggedValue(entry, tags, versions) if tags else entry, ttl=ttl + stale_ttl)
+        return value
+
+    def _load_done(self, key: str, task: asyncio.Task) -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if not task.cancelled() and task.exception() is not None:
+            logger.warning("Gagal memuat cache %s: %r", key, task.exception())
+
+    def stats(self) -> Dict[str, int]:
+        """Statistik hit/miss/eviction L1; kosong untuk backend yang tidak mencatatnya."""
+        return self.cache.stats() if hasattr(self.cache, "stats") else {}
+
+    async def _shared_call(self, description: str, call: Awaitable[T], default: T = None) -> T:
+        try:
+            return await call
+        except Exception as err:
+            logger.warning("Cache L2 gagal %s: %r", description, err)
+            return default
+
+    async def _invalidate_others(self, key: str) -> None:
+        await self._shared_call(f"publish {key}", self.shared.publish(f"{self._origin} {key}"))
+
+    def start(self) -> None:
+        """Mulai mendengarkan invalidasi dari worker lain (dipanggil saat startup aplikasi)."""
+        if self.shared is not None and self._listener is None:
+            self._listener = asyncio.create_task(self._listen())
+
+    async def stop(self) -> None:
+        if self._listener is not None:
+            self._listener.cancel()
+            try:
+                await self._listener
+            except asyncio.CancelledError:
+                pass
+            self._listener = None
+        if self.shared is not None:
+            await self.shared.close()
+
+    async def _listen(self) -> None:
+        while True:
+            try:
+                async for message in self.shared.subscribe():
+                    if message is None:
+                        # Langganan aktif. Invalidasi sebelum titik ini (termasuk selama terputus)
+                        # tidak bisa diketahui, jadi L1 dikosongkan setelah konfirmasi, bukan sebelumnya
+                        await self.cache.clear()
+                        continue
+                    origin, _, key = message.partition(" ")
+                    if origin != self._origin:
+                        self._inflight.pop(key, None)
+                        await self.cache.delete(key)
+            except asyncio.CancelledError:
+                raise
+            except Exception as err:
+                logger.warning("Langganan invalidasi cache terputus: %r", err)
+                await asyncio.sleep(1)
 
 
 # Singleton instance
-cache_manager = CacheManager()
+cache_manager = CacheManager(shared=create_shared_cache())
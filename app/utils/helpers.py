@@ -1,15 +1,43 @@
+import asyncio
+import csv
+import importlib.util
+import io
 import secrets
 import string
-from io import BytesIO
-from typing import Any, AsyncGenerator, BinaryIO, Dict, Optional
+import tempfile
+from datetime import datetime
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import (
+    Any,
+    AsyncGenerator,
+    AsyncIterable,
+    Dict,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+)
 
 import orjson
-import pandas as pd
-from fastapi import Request
+from fastapi import HTTPException, Request
+from fastapi.security.utils import get_authorization_scheme_param
 from openpyxl import Workbook
 
+from app.core.data_types import ExportFormatEnum
+from app.core.exceptions import BadRequestException, RangeNotSatisfiableException
 from app.core.security import decode_token
 
+EXPORT_CHUNK_SIZE = 64 * 1024
+EXPORT_BATCH_ROWS = 1000
+# File export di atas batas ini dipindah dari memori ke disk
+EXPORT_SPOOL_SIZE = 8 * 1024 * 1024
+EXPORT_MEDIA_TYPES = {
+    ExportFormatEnum.XLSX: "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+    ExportFormatEnum.CSV: "text/csv; charset=utf-8",
+    ExportFormatEnum.PARQUET: "application/vnd.apache.parquet",
+}
+
 
 def generate_code(length: int = 12) -> str:
     """
@@ -53,15 +81,62 @@ def orjson_dumps(__obj: Any, *, default: Optional[Any] = None) -> str:
     ).decode("utf-8")
 
 
-async def iterfile(file_content: BinaryIO) -> AsyncGenerator[bytes, None]:
-    """Iterate over file content in chunks."""
+def parse_range_header(value: Optional[str], size: int) -> Optional[Tuple[int, int]]:
+    """
+    Parse header Range "bytes=start-end" menjadi (start, end) inklusif.
+    None jika header kosong, bukan bytes, atau berisi beberapa range (dilayani sebagai 200 utuh).
+    """
+    if not value or not value.startswith("bytes=") or "," in value:
+        return None
+    start, _, end = value[len("bytes=") :].strip().partition("-")
     try:
-        chunk = await file_content.content.read(8192)
-        while chunk:
-            yield chunk
-            chunk = await file_content.content.read(8192)
-    finally:
-        await file_content.release()
+        if not start:
+            # Suffix range: N byte terakhir
+            length = int(end)
+            if length <= 0:
+                raise ValueError
+            first, last = max(size - length, 0), size - 1
+        else:
+            first = int(start)
+            last = min(int(end), size - 1) if end else size - 1
+    except ValueError:
+        return None
+    # Objek kosong tidak punya byte yang bisa dipilih, termasuk untuk suffix range
+    if first >= size or last < first:
+        raise RangeNotSatisfiableException(headers={"Content-Range": f"bytes */{size}"})
+    return first, last
+
+
+def _etag_matches(header: str, etag: str) -> bool:
+    """Weak comparison ETag sesuai If-None-Match / If-Range."""
+    tags = [tag.strip().removeprefix("W/") for tag in header.split(",")]
+    return "*" in tags or f'"{etag}"' in tags
+
+
+def is_not_modified(headers: Mapping[str, str], etag: Optional[str], last_modified: Optional[datetime]) -> bool:
+    """Cek conditional GET: If-None-Match lebih diutamakan daripada If-Modified-Since."""
+    if_none_match = headers.get("if-none-match")
+    if if_none_match is not None:
+        return bool(etag) and _etag_matches(if_none_match, etag)
+
+    if_modified_since = headers.get("if-modified-since")
+    if if_modified_since and last_modified:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        return last_modified.replace(microsecond=0) <= since
+    return False
+
+
+def range_applies(headers: Mapping[str, str], etag: Optional[str], last_modified: Optional[datetime]) -> bool:
+    """If-Range: range hanya dilayani jika representasi belum berubah."""
+    if_range = headers.get("if-range")
+    if not if_range:
+        return True
+    if if_range.startswith(('"', "W/")):
+        return bool(etag) and if_range == f'"{etag}"'
+    return last_modified is not None and if_range == format_datetime(last_modified, usegmt=True)
 
 
 def safe_get_attr(obj: Any, attr: str, default: Any = None) -> Any:
@@ -93,32 +168,152 @@ def generate_incremental_id(existing_ids: list[str]) -> str:
     return str(max_id + 1)
 
 
-async def auth_from_jwt(request: Request):
-    auth = request.headers.get("Authorization", "")
-    if not auth.startswith("Bearer "):
-        return  # guest
-    token = auth.split(" ", 1)[1]
-    try:
-        payload = decode_token(token)
-        request.state.user_id = str(payload.get("sub"))
-    except:
-        return
-
-
-def export_to_xlsx(data: list, sheet_name: str = "Sheet1") -> bytes:
-    df = pd.DataFrame(data)
-    wb = Workbook()
-    ws = wb.active
-    ws.title = sheet_name
-
-    if not df.empty:
-        for col_idx, col_name in enumerate(df.columns, start=1):
-            ws.cell(row=1, column=col_idx, value=col_name)
-        for row_idx, row in enumerate(df.itertuples(index=False), start=2):
-            for col_idx, value in enumerate(row, start=1):
-                ws.cell(row=row_idx, column=col_idx, value=value)
-
-    output = BytesIO()
-    wb.save(output)
-    output.seek(0)
-    return output.read()
+class AuthContext:
+    """
+    Hasil autentikasi satu request: token diverifikasi sekali, lalu payload dan user
+    yang sudah di-resolve dipakai ulang oleh limiter, AuthManager, dan route.
+    """
+
+    __slots__ = ("token", "payload", "user", "user_with_permissions")
+
+    def __init__(self, token: Optional[str] = None, payload: Optional[Dict[str, Any]] = None):
+        self.token = token
+        # Hanya payload access token yang valid; None untuk guest atau token tidak valid
+        self.payload = payload
+        self.user: Any = None
+        self.user_with_permissions: Any = None
+
+    @property
+    def user_id(self) -> Optional[str]:
+        return str(self.payload["sub"]) if self.payload else None
+
+
+async def auth_from_jwt(request: Request) -> AuthContext:
+    """Ambil AuthContext request, memverifikasi token Bearer hanya pada panggilan pertama."""
+    context = getattr(request.state, "auth", None)
+    if context is not None:
+        return context
+
+    context = AuthContext()
+    scheme, token = get_authorization_scheme_param(request.headers.get("Authorization"))
+    if scheme.lower() == "bearer" and token:
+        context.token = token
+        try:
+            payload = await decode_token(token)
+        except HTTPException:
+            payload = None  # token kedaluwarsa/tidak valid: diperlakukan sebagai guest
+        if payload and payload.get("type") == "access" and payload.get("sub") is not None:
+            context.payload = payload
+
+    request.state.auth = context
+    request.state.user_id = context.user_id
+    return context
+
+
+def stream_export(
+    export_format: ExportFormatEnum,
+    columns: Dict[str, type],
+    rows: AsyncIterable[Sequence[Any]],
+    sheet_name: str = "Sheet1",
+) -> AsyncGenerator[bytes, None]:
+    """
+    Pipeline export bersama: columns adalah {header: tipe python (int/float/str)},
+    rows berisi nilai per baris dengan urutan yang sama. Hasilnya chunk bytes untuk StreamingResponse.
+    """
+    if export_format == ExportFormatEnum.CSV:
+        return stream_csv(list(columns), rows)
+    if export_format == ExportFormatEnum.PARQUET:
+        if importlib.util.find_spec("pyarrow") is None:
+            raise BadRequestException("Parquet export requires pyarrow to be installed")
+        return stream_parquet(columns, rows)
+    return stream_xlsx(list(columns), rows, sheet_name=sheet_name)
+
+
+def export_media_type(export_format: ExportFormatEnum) -> str:
+    return EXPORT_MEDIA_TYPES[ExportFormatEnum(export_format)]
+
+
+async def batched(rows: AsyncIterable[Any], size: int = EXPORT_BATCH_ROWS) -> AsyncGenerator[List[Any], None]:
+    """Kelompokkan async iterable menjadi list berukuran size."""
+    batch: List[Any] = []
+    async for row in rows:
+        batch.append(row)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+async def stream_csv(
+    header: Sequence[str],
+    rows: AsyncIterable[Sequence[Any]],
+    chunk_size: int = EXPORT_CHUNK_SIZE,
+) -> AsyncGenerator[bytes, None]:
+    """Tulis CSV baris per baris; buffer di-flush ke client setiap mencapai chunk_size."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(header)
+    async for row in rows:
+        writer.writerow(row)
+        if buffer.tell() >= chunk_size:
+            yield buffer.getvalue().encode("utf-8")
+            buffer.seek(0)
+            buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode("utf-8")
+
+
+async def stream_parquet(
+    columns: Dict[str, type],
+    rows: AsyncIterable[Sequence[Any]],
+    chunk_size: int = EXPORT_CHUNK_SIZE,
+) -> AsyncGenerator[bytes, None]:
+    """Tulis Parquet per batch Arrow (satu row group per batch) dengan skema tetap dari columns."""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    arrow_types = {int: pa.int64(), float: pa.float64(), str: pa.string()}
+    schema = pa.schema([(name, arrow_types.get(kind, pa.string())) for name, kind in columns.items()])
+    kinds = list(columns.values())
+
+    def cell(value: Any, kind: type) -> Any:
+        # Baris export memakai "" untuk nilai kosong; di Parquet jadi null
+        if value is None or value == "":
+            return None
+        return kind(value) if kind in arrow_types else str(value)
+
+    with tempfile.SpooledTemporaryFile(max_size=EXPORT_SPOOL_SIZE) as output:
+        with pq.ParquetWriter(output, schema, compression="snappy") as writer:
+            async for batch in batched(rows):
+                arrays = [
+                    pa.array([cell(row[idx], kind) for row in batch], type=schema.field(idx).type)
+                    for idx, kind in enumerate(kinds)
+                ]
+                await asyncio.to_thread(writer.write_table, pa.Table.from_arrays(arrays, schema=schema))
+        output.seek(0)
+        while chunk := output.read(chunk_size):
+            yield chunk
+
+
+async def stream_xlsx(
+    header: Sequence[str],
+    rows: AsyncIterable[Sequence[Any]],
+    sheet_name: str = "Sheet1",
+    chunk_size: int = EXPORT_CHUNK_SIZE,
+) -> AsyncGenerator[bytes, None]:
+    """
+    Tulis baris ke workbook write-only (baris langsung di-flush ke file sementara openpyxl),
+    lalu kirim file xlsx per chunk. Memori tetap konstan berapa pun jumlah barisnya.
+    """
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet(title=sheet_name)
+    ws.append(list(header))
+    async for row in rows:
+        ws.append(row)
+
+    with tempfile.SpooledTemporaryFile(max_size=EXPORT_SPOOL_SIZE) as output:
+        await asyncio.to_thread(wb.save, output)
+        output.seek(0)
+        while chunk := output.read(chunk_size):
+            yield chunk
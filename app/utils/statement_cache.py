@@ -0,0 +1,49 @@
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable
+
+from app.core.config import settings
+
+
+class StatementCache:
+    """
+    Cache LRU untuk statement SQLAlchemy per "bentuk" query
+    (repository, kolom+operator filter, sort, kolom search, mode pagination).
+
+    Nilai filter/search/limit dikirim sebagai bound parameter sehingga satu objek
+    Select bisa dipakai ulang lintas request. Cache key Select di-memoize SQLAlchemy,
+    jadi eksekusi berikutnya langsung mengenai compiled cache engine tanpa
+    membangun dan menelusuri ulang ekspresinya.
+    """
+
+    def __init__(self, maxsize: int = 256):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._items: "OrderedDict[Hashable, Any]" = OrderedDict()
+
+    def get_or_build(self, key: Hashable, builder: Callable[[], Any]) -> Any:
+        try:
+            value = self._items[key]
+        except KeyError:
+            self.misses += 1
+            value = builder()
+            self._items[key] = value
+            if len(self._items) > self.maxsize:
+                self._items.popitem(last=False)
+            return value
+
+        self.hits += 1
+        self._items.move_to_end(key)
+        return value
+
+    def stats(self) -> Dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses, "size": len(self._items), "maxsize": self.maxsize}
+
+    def clear(self) -> None:
+        self._items.clear()
+        self.hits = 0
+        self.misses = 0
+
+
+# Singleton instance
+statement_cache = StatementCache(settings.STATEMENT_CACHE_SIZE)
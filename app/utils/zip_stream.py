@@ -0,0 +1,125 @@
+import asyncio
+import os
+import zipfile
+from collections import Counter, deque
+from datetime import datetime
+from typing import AsyncIterator, Awaitable, Callable, Iterable, NamedTuple, Optional
+
+# Batas bawah tanggal di header ZIP (format DOS)
+MIN_ZIP_DATE = (1980, 1, 1, 0, 0, 0)
+
+
+class ZipMember(NamedTuple):
+    name: str
+    size: int
+    last_modified: Optional[datetime]
+    content: AsyncIterator[bytes]
+
+
+ZipSource = Callable[[], Awaitable[ZipMember]]
+
+
+class _ZipSink:
+    """Sink tanpa seek untuk ZipFile; byte yang sudah ditulis diambil per potong lewat drain()."""
+
+    def __init__(self):
+        self._buffer = bytearray()
+        self._position = 0
+
+    def write(self, data: bytes) -> int:
+        self._buffer += data
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def flush(self) -> None:
+        pass
+
+    def drain(self) -> bytes:
+        data = bytes(self._buffer)
+        self._buffer.clear()
+        return data
+
+
+def _entry_name(name: str, used: Counter) -> str:
+    """Nama entry yang aman (tanpa path absolut/..) dan unik di dalam arsip."""
+    name = "/".join(part for part in name.replace("\\", "/").split("/") if part not in ("", ".", "..")) or "file"
+    used[name] += 1
+    if used[name] == 1:
+        return name
+    stem, ext = os.path.splitext(name)
+    return _entry_name(f"{stem} ({used[name] - 1}){ext}", used)
+
+
+def _date_time(value: Optional[datetime]) -> tuple:
+    if value is None:
+        value = datetime.now()
+    return max(value.timetuple()[:6], MIN_ZIP_DATE)
+
+
+async def _prefetch(source: ZipSource, queue: asyncio.Queue) -> None:
+    # Urutan item di queue: ZipMember, chunk..., None; error diteruskan ke pembaca
+    try:
+        member = await source()
+        await queue.put(member)
+        async for chunk in member.content:
+            await queue.put(chunk)
+        await queue.put(None)
+    except Exception as err:
+        await queue.put(err)
+
+
+async def _get(queue: asyncio.Queue):
+    item = await queue.get()
+    if isinstance(item, Exception):
+        raise item
+    return item
+
+
+async def stream_zip(sources: Iterable[ZipSource], concurrency: int = 4, read_ahead: int = 2) -> AsyncIterator[bytes]:
+    """
+    Bangun ZIP (tanpa kompresi, ZIP64 bila perlu) sambil mengalirkannya per chunk.
+
+    Hingga `concurrency` file diambil bersamaan dan masing-masing hanya boleh mendahului
+    pembaca `read_ahead` chunk, jadi tidak ada file yang ditampung utuh di memori.
+    Entry ditulis berurutan sesuai `sources`.
+    """
+    sink = _ZipSink()
+    sources = iter(sources)
+    pending: deque = deque()
+    used: Counter = Counter()
+
+    def schedule() -> None:
+        while len(pending) < concurrency:
+            source = next(sources, None)
+            if source is None:
+                return
+            queue = asyncio.Queue(maxsize=read_ahead + 1)
+            pending.append((queue, asyncio.create_task(_prefetch(source, queue))))
+
+    try:
+        # File umumnya sudah terkompresi (gambar, PDF, XLSX), jadi STORED menghemat CPU event loop
+        with zipfile.ZipFile(sink, "w", compression=zipfile.ZIP_STORED, allowZip64=True) as archive:
+            schedule()
+            while pending:
+                queue, _ = pending[0]
+                member: ZipMember = await _get(queue)
+
+                info = zipfile.ZipInfo(_entry_name(member.name, used), date_time=_date_time(member.last_modified))
+                info.compress_type = zipfile.ZIP_STORED
+                # Ukuran diketahui dari stat agar header ZIP64 dipilih dengan benar
+                info.file_size = member.size
+                with archive.open(info, "w") as entry:
+                    while (chunk := await _get(queue)) is not None:
+                        entry.write(chunk)
+                        yield sink.drain()
+
+                pending.popleft()
+                schedule()
+
+        yield sink.drain()
+    finally:
+        for _, task in pending:
+            task.cancel()
@@ -0,0 +1,49 @@
+"""fulltext search index
+
+Revision ID: dc3cc30667d9
+Revises: ea436d811762
+Create Date: 2026-10-18 09:00:12.418305
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "dc3cc30667d9"
+down_revision: Union[str, None] = "ea436d811762"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        "ft_businesses_search",
+        "businesses",
+        ["kups_nama", "kups_nama_ketua", "kups_sk_no"],
+        unique=False,
+        mysql_prefix="FULLTEXT",
+    )
+    op.create_index(
+        "ft_articles_search",
+        "articles",
+        ["article_title", "article_content"],
+        unique=False,
+        mysql_prefix="FULLTEXT",
+    )
+    op.create_index(
+        "ft_forestry_search",
+        "forestry",
+        ["fore_name", "fore_nama_ketua", "fore_pps_sknagari", "fore_sk_bupati", "fore_sk_menlhk"],
+        unique=False,
+        mysql_prefix="FULLTEXT",
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ft_forestry_search", table_name="forestry")
+    op.drop_index("ft_articles_search", table_name="articles")
+    op.drop_index("ft_businesses_search", table_name="businesses")
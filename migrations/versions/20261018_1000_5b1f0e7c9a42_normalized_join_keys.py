@@ -0,0 +1,52 @@
+"""normalized join keys
+
+Revision ID: 5b1f0e7c9a42
+Revises: dc3cc30667d9
+Create Date: 2026-10-18 10:00:41.207316
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "5b1f0e7c9a42"
+down_revision: Union[str, None] = "dc3cc30667d9"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "forestry",
+        sa.Column("fore_kps_key", sa.CHAR(length=11), sa.Computed("UPPER(TRIM(fore_kps_id))", persisted=True)),
+    )
+    op.add_column(
+        "forestry",
+        sa.Column("fore_skema_key", sa.CHAR(length=4), sa.Computed("UPPER(TRIM(fore_skema_id))", persisted=True)),
+    )
+    op.add_column(
+        "businesses",
+        sa.Column(
+            "fore_kps_key",
+            sa.CHAR(length=11),
+            sa.Computed("UPPER(TRIM(fore_kps_id))", persisted=True),
+            comment="fore_kps_id ternormalisasi untuk join ke forestry",
+        ),
+    )
+    op.create_index("ix_forestry_kps_key", "forestry", ["fore_kps_key", "fore_skema_key"], unique=False)
+    op.create_index("ix_forestry_skema_key", "forestry", ["fore_skema_key"], unique=False)
+    op.create_index("ix_businesses_kps_key", "businesses", ["fore_kps_key"], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_businesses_kps_key", table_name="businesses")
+    op.drop_index("ix_forestry_skema_key", table_name="forestry")
+    op.drop_index("ix_forestry_kps_key", table_name="forestry")
+    op.drop_column("businesses", "fore_kps_key")
+    op.drop_column("forestry", "fore_skema_key")
+    op.drop_column("forestry", "fore_kps_key")
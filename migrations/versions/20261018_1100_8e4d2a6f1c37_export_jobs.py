@@ -0,0 +1,53 @@
+"""export jobs
+
+Revision ID: 8e4d2a6f1c37
+Revises: 5b1f0e7c9a42
+Create Date: 2026-10-18 11:00:05.731954
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "8e4d2a6f1c37"
+down_revision: Union[str, None] = "5b1f0e7c9a42"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "export_jobs",
+        sa.Column("id", sa.CHAR(length=36), nullable=False),
+        sa.Column("user_id", sa.String(length=36), nullable=False),
+        sa.Column("resource", sa.String(length=64), nullable=False),
+        sa.Column("format", sa.String(length=16), nullable=False),
+        sa.Column("params", sa.JSON(), nullable=True),
+        sa.Column(
+            "status",
+            sa.Enum("queued", "running", "completed", "failed", name="export_job_status_enum"),
+            nullable=False,
+        ),
+        sa.Column("object_name", sa.String(length=512), nullable=True),
+        sa.Column("size", sa.BigInteger(), nullable=True),
+        sa.Column("error", sa.Text(), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("started_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("finished_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("worker_id", sa.String(length=128), nullable=True),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_export_jobs_user_status", "export_jobs", ["user_id", "status"], unique=False)
+    op.create_index("ix_export_jobs_status_updated", "export_jobs", ["status", "updated_at"], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_export_jobs_status_updated", table_name="export_jobs")
+    op.drop_index("ix_export_jobs_user_status", table_name="export_jobs")
+    op.drop_table("export_jobs")
@@ -0,0 +1,47 @@
+"""file content hash
+
+Revision ID: 3c9e71d4b2a8
+Revises: 8e4d2a6f1c37
+Create Date: 2026-10-18 12:00:41.902117
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "3c9e71d4b2a8"
+down_revision: Union[str, None] = "8e4d2a6f1c37"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "file_blobs",
+        sa.Column("id", sa.BigInteger(), autoincrement=True, nullable=False),
+        sa.Column("content_hash", sa.CHAR(length=64), nullable=False),
+        sa.Column("object_name", sa.String(length=512), nullable=False),
+        sa.Column("ref_count", sa.Integer(), server_default=sa.text("1"), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("content_hash"),
+        sa.UniqueConstraint("object_name"),
+    )
+    op.add_column("files", sa.Column("content_hash", sa.CHAR(length=64), nullable=True))
+    op.create_index(op.f("ix_files_content_hash"), "files", ["content_hash"], unique=False)
+    # Beberapa row (upload berbeda dengan isi sama) kini menunjuk ke objek yang sama
+    op.create_index(op.f("ix_files_object_name"), "files", ["object_name"], unique=False)
+    op.drop_constraint("object_name", "files", type_="unique")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.create_unique_constraint("object_name", "files", ["object_name"])
+    op.drop_index(op.f("ix_files_object_name"), table_name="files")
+    op.drop_index(op.f("ix_files_content_hash"), table_name="files")
+    op.drop_column("files", "content_hash")
+    op.drop_table("file_blobs")
@@ -0,0 +1,86 @@
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from fastapi import Depends, FastAPI, HTTPException, Request
+from fastapi.testclient import TestClient
+
+from app.api.dependencies.auth import get_current_active_user, get_only_payload
+from app.utils.helpers import auth_from_jwt
+from app.utils.limiter import key_user_or_ip
+
+USER = {"id": "user-1", "name": "Budi", "email": "budi@example.com", "enable": "Y"}
+HEADERS = {"Authorization": "Bearer token-1"}
+
+
+class TestAuthContext:
+    """Test cases for the single-pass per-request auth context."""
+
+    @pytest.fixture
+    def decode_token(self):
+        with patch("app.utils.helpers.decode_token", new=AsyncMock()) as decode_token:
+            decode_token.return_value = {"sub": "user-1", "type": "access"}
+            yield decode_token
+
+    @pytest.fixture
+    def user_cache(self):
+        with patch("app.api.dependencies.auth.cache_manager") as cache_manager:
+            cache_manager.get_or_load = AsyncMock(return_value=USER)
+            yield cache_manager
+
+    @pytest.fixture
+    def client(self, decode_token, user_cache):
+        app = FastAPI()
+
+        @app.middleware("http")
+        async def auth_middleware(request: Request, call_next):
+            await auth_from_jwt(request)
+            return await call_next(request)
+
+        @app.get("/me")
+        async def me(
+            request: Request,
+            user=Depends(get_current_active_user),
+            payload_user=Depends(get_only_payload),
+        ):
+            return {"id": user.id, "same": user is payload_user, "key": key_user_or_ip(request)}
+
+        # UserService tidak dipakai karena user diambil dari cache
+        route = next(r for r in app.routes if getattr(r, "path", "") == "/me")
+        pending = list(route.dependant.dependencies)
+        while pending:
+            dependency = pending.pop()
+            if dependency.name == "user_service":
+                app.dependency_overrides[dependency.call] = lambda: None
+            pending.extend(dependency.dependencies)
+        return TestClient(app)
+
+    def test_token_verified_and_user_loaded_once(self, client, decode_token, user_cache):
+        response = client.get("/me", headers=HEADERS)
+
+        assert response.status_code == 200
+        assert response.json() == {"id": "user-1", "same": True, "key": "user:user-1"}
+        decode_token.assert_awaited_once_with("token-1")
+        assert user_cache.get_or_load.await_count == 1
+        assert user_cache.get_or_load.call_args.args[0] == "user:user-1"
+        assert user_cache.get_or_load.call_args.kwargs["tags"] == ["id:UserModel:user-1"]
+
+    def test_invalid_token_rejected(self, client, decode_token):
+        decode_token.side_effect = HTTPException(status_code=401, detail="Token expired")
+
+        assert client.get("/me", headers=HEADERS).status_code == 401
+
+    def test_refresh_token_not_accepted(self, client, decode_token):
+        decode_token.return_value = {"sub": "user-1", "type": "refresh"}
+
+        assert client.get("/me", headers=HEADERS).status_code == 401
+
+    @pytest.mark.asyncio
+    async def test_guest_keyed_by_ip(self, decode_token):
+        request = Request({"type": "http", "headers": [], "client": ("10.0.0.1", 1234)})
+
+        context = await auth_from_jwt(request)
+
+        assert context.token is None
+        assert key_user_or_ip(request) == "ip:10.0.0.1"
+        assert await auth_from_jwt(request) is context
+        decode_token.assert_not_called()
@@ -0,0 +1,177 @@
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import JSONResponse
+from fastapi.testclient import TestClient
+
+from app.api.dependencies.auth import get_auth_context, get_current_active_user
+from app.api.v1.routes.file_route import router
+from app.core.exceptions import APIException, RangeNotSatisfiableException
+from app.services import FileService
+from app.utils.helpers import AuthContext, parse_range_header
+
+CONTENT = bytes(range(256)) * 4
+OBJECT_INFO = {
+    "_size": len(CONTENT),
+    "_etag": "abc123",
+    "_last_modified": datetime(2026, 10, 1, 8, 30, tzinfo=timezone.utc),
+    "_content_type": "application/pdf",
+    "_metadata": {"x-amz-meta-filename": "milik-orang-lain.pdf"},
+}
+
+
+class TestFileRoute:
+    """Test cases for GET /files/{object_name} conditional and range requests."""
+
+    @pytest.fixture
+    def mock_service(self):
+        service = Mock(spec=FileService)
+        service.get_file_info = AsyncMock(return_value=OBJECT_INFO)
+        service.get_download_name = AsyncMock(return_value=("laporan.pdf", "application/pdf"))
+
+        async def get_file_content(object_name, offset=0, length=None, object_info=None):
+            async def content():
+                yield CONTENT[offset : offset + length]
+
+            return content(), object_info
+
+        service.get_file_content = AsyncMock(side_effect=get_file_content)
+        return service
+
+    @pytest.fixture
+    def client(self, mock_service):
+        app = FastAPI()
+        app.include_router(router)
+
+        @app.exception_handler(APIException)
+        async def api_exception_handler(request, exc):
+            return JSONResponse(status_code=exc.status_code, content={"detail": exc.message}, headers=exc.headers)
+
+        for path in ("/files/{object_name}", "/files/zip"):
+            route = next(r for r in app.routes if getattr(r, "path", "") == path)
+            dependency = next(d.call for d in route.dependant.dependencies if d.name == "service")
+            app.dependency_overrides[dependency] = lambda: mock_service
+        app.dependency_overrides[get_current_active_user] = lambda: Mock(id="user-1")
+        app.dependency_overrides[get_auth_context] = lambda: AuthContext(payload={"sub": "user-1"})
+        return TestClient(app)
+
+    def test_full_download_has_validators(self, client):
+        response = client.get("/files/laporan.pdf")
+
+        assert response.status_code == 200
+        assert response.content == CONTENT
+        assert response.headers["etag"] == '"abc123"'
+        assert response.headers["last-modified"] == "Thu, 01 Oct 2026 08:30:00 GMT"
+        assert response.headers["accept-ranges"] == "bytes"
+        assert response.headers["content-disposition"] == 'attachment; filename="laporan.pdf"'
+
+    def test_range_request_returns_partial_content(self, client, mock_service):
+        response = client.get("/files/laporan.pdf", headers={"Range": "bytes=100-199"})
+
+        assert response.status_code == 206
+        assert response.content == CONTENT[100:200]
+        assert response.headers["content-range"] == f"bytes 100-199/{len(CONTENT)}"
+        assert mock_service.get_file_content.call_args.kwargs["offset"] == 100
+        assert mock_service.get_file_content.call_args.kwargs["length"] == 100
+
+    def test_range_ignored_when_if_range_stale(self, client):
+        response = client.get("/files/laporan.pdf", headers={"Range": "bytes=0-9", "If-Range": '"old"'})
+
+        assert response.status_code == 200
+        assert len(response.content) == len(CONTENT)
+
+    def test_unsatisfiable_range(self, client):
+        response = client.get("/files/laporan.pdf", headers={"Range": "bytes=5000-"})
+
+        assert response.status_code == 416
+        assert response.headers["content-range"] == f"bytes */{len(CONTENT)}"
+
+    @pytest.mark.parametrize(
+        "headers",
+        [
+            {"If-None-Match": '"abc123"'},
+            {"If-None-Match": 'W/"abc123", "other"'},
+            {"If-Modified-Since": "Thu, 01 Oct 2026 08:30:00 GMT"},
+        ],
+    )
+    def test_not_modified(self, client, mock_service, headers):
+        response = client.get("/files/laporan.pdf", headers=headers)
+
+        assert response.status_code == 304
+        assert response.content == b""
+        mock_service.get_file_content.assert_not_called()
+
+    def test_if_none_match_takes_precedence(self, client):
+        response = client.get(
+            "/files/laporan.pdf",
+            headers={"If-None-Match": '"other"', "If-Modified-Since": "Thu, 01 Oct 2026 09:00:00 GMT"},
+        )
+
+        assert response.status_code == 200
+
+    @pytest.mark.parametrize(
+        "value, expected",
+        [
+            ("bytes=0-0", (0, 0)),
+            ("bytes=10-", (10, 99)),
+            ("bytes=-30", (70, 99)),
+            ("bytes=90-500", (90, 99)),
+            ("bytes=0-1,5-6", None),
+            ("items=0-1", None),
+            ("bytes=abc", None),
+        ],
+    )
+    def test_parse_range_header(self, value, expected):
+        assert parse_range_header(value, 100) == expected
+
+    @pytest.mark.parametrize("value", ["bytes=-5", "bytes=0-", "bytes=0-0"])
+    def test_parse_range_header_empty_object(self, value):
+        with pytest.raises(RangeNotSatisfiableException):
+            parse_range_header(value, 0)
+
+    def test_redirect_mode_returns_presigned_url(self, client, mock_service, monkeypatch):
+        monkeypatch.setattr("app.api.v1.routes.file_route.settings.FILE_DOWNLOAD_REDIRECT", True)
+        mock_service.get_download_url = AsyncMock(return_value="http://minio/sips/laporan.pdf?X-Amz-Signature=x")
+
+        response = client.get("/files/laporan.pdf", follow_redirects=False)
+
+        assert response.status_code == 302
+        assert response.headers["location"] == "http://minio/sips/laporan.pdf?X-Amz-Signature=x"
+        mock_service.get_download_url.assert_awaited_once_with(
+            "laporan.pdf", filename="laporan.pdf", content_type="application/pdf"
+        )
+        mock_service.get_file_content.assert_not_called()
+
+    def test_image_width_serves_derivative(self, client, mock_service):
+        derived_info = {**OBJECT_INFO, "_content_type": "image/webp", "_etag": "webp1"}
+        mock_service.get_image_derivative = AsyncMock(return_value=("derived/sampul.jpg/w320.webp", derived_info))
+        mock_service.get_download_name = AsyncMock(return_value=("sampul.webp", None))
+
+        response = client.get("/files/sampul.jpg?w=320")
+
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "image/webp"
+        assert response.headers["etag"] == '"webp1"'
+        mock_service.get_image_derivative.assert_awaited_once_with("sampul.jpg", 320)
+        mock_service.get_download_name.assert_awaited_once_with("sampul.jpg", "derived/sampul.jpg/w320.webp", "user-1")
+        mock_service.get_file_info.assert_not_called()
+        assert mock_service.get_file_content.call_args.kwargs["object_name"] == "derived/sampul.jpg/w320.webp"
+
+    def test_zip_download_streams_archive(self, client, mock_service):
+        async def content():
+            yield b"PK"
+
+        mock_service.get_zip_content = AsyncMock(return_value=content())
+
+        response = client.post("/files/zip", json={"ids": [1, 2]})
+
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/zip"
+        assert response.content == b"PK"
+        mock_service.get_zip_content.assert_awaited_once_with(user_id="user-1", ids=[1, 2], prefix=None)
+
+    @pytest.mark.parametrize("body", [{}, {"ids": [1], "prefix": "ab"}, {"ids": []}])
+    def test_zip_requires_exactly_one_source(self, client, body):
+        assert client.post("/files/zip", json=body).status_code == 422
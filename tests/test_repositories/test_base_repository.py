@@ -0,0 +1,351 @@
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from sqlalchemy import Column, Integer, MetaData, String, Table, create_engine, select
+from sqlalchemy.dialects import mysql
+
+from app.core.data_types import CountModeEnum
+from app.core.exceptions import ValidationException
+from app.core.pagination import (
+    build_seek_predicate,
+    build_sort_keys,
+    decode_cursor,
+    encode_cursor,
+)
+from app.models import BusinessesModel, BusinessProductModel
+from app.repositories import (
+    BaseRepository,
+    BusinessesRepository,
+    BusinessProductRepository,
+)
+
+
+class TestBaseRepositoryPagination:
+    """Test cases for offset and keyset (cursor) pagination in BaseRepository."""
+
+    @pytest.fixture
+    def repository(self):
+        with patch("app.repositories.base.db"):
+            return BaseRepository(BusinessesModel)
+
+    def compile(self, query):
+        return str(query.compile(dialect=mysql.dialect()))
+
+    def test_offset_mode(self, repository):
+        query, keys = repository._paginate(repository.build_base_query(), [], limit=10, offset=20)
+
+        assert keys is None
+        sql = self.compile(query)
+        assert "ORDER BY businesses.kups_id" in sql
+        assert "LIMIT %s, %s" in sql
+
+    def test_cursor_first_page(self, repository):
+        sort = [BusinessesModel.name.desc()]
+        query, keys = repository._paginate(repository.build_base_query(), sort, limit=10, offset=0, cursor="")
+
+        assert [(key.name, key.descending) for key in keys] == [("name", True), ("id", False)]
+        sql = self.compile(query)
+        assert "ORDER BY businesses.kups_nama DESC, businesses.kups_id ASC" in sql
+        assert "WHERE" not in sql
+        assert "LIMIT %s, %s" not in sql
+
+    def test_cursor_next_page_uses_seek_predicate(self, repository):
+        sort = [BusinessesModel.name.desc()]
+        _, keys = repository._paginate(repository.build_base_query(), sort, limit=10, offset=0, cursor="")
+        cursor = encode_cursor(keys, {"name": "KUPS A", "id": "ABC"})
+
+        query, _ = repository._paginate(repository.build_base_query(), sort, limit=10, offset=0, cursor=cursor)
+
+        sql = self.compile(query)
+        # kups_nama nullable: NULL berada di akhir urutan DESC, jadi ikut di halaman berikutnya
+        assert "(businesses.kups_nama <= %s OR businesses.kups_nama IS NULL)" in sql
+        assert (
+            "businesses.kups_nama < %s OR businesses.kups_nama IS NULL "
+            "OR businesses.kups_nama = %s AND businesses.kups_id > %s"
+        ) in sql
+
+    def test_build_page_trims_extra_row(self, repository):
+        _, keys = repository._paginate(repository.build_base_query(), [], limit=2, offset=0, cursor="")
+        records = [{"id": "A"}, {"id": "B"}, {"id": "C"}]
+
+        page = repository._build_page(records, 3, limit=2, offset=0, keys=keys)
+        items, total = page
+
+        assert items == [{"id": "A"}, {"id": "B"}]
+        assert total == 3
+        assert page.has_more is True
+        assert decode_cursor(page.next_cursor, keys) == ["B"]
+
+    def test_build_page_last_page(self, repository):
+        _, keys = repository._paginate(repository.build_base_query(), [], limit=2, offset=0, cursor="")
+
+        page = repository._build_page([{"id": "C"}], 3, limit=2, offset=0, keys=keys)
+
+        assert page.has_more is False
+        assert page.next_cursor is None
+
+    def test_cursor_sort_mismatch(self, repository):
+        _, keys = repository._paginate(repository.build_base_query(), [], limit=2, offset=0, cursor="")
+        cursor = encode_cursor(keys, {"id": "A"})
+
+        with pytest.raises(ValidationException):
+            repository._paginate(
+                repository.build_base_query(),
+                [BusinessesModel.name.asc()],
+                limit=2,
+                offset=0,
+                cursor=cursor,
+            )
+
+    def test_invalid_cursor(self, repository):
+        with pytest.raises(ValidationException):
+            repository._paginate(repository.build_base_query(), [], limit=2, offset=0, cursor="not-a-cursor")
+
+    def test_null_cursor_value_uses_is_null(self, repository):
+        sort = [BusinessesModel.name.asc()]
+        _, keys = repository._paginate(repository.build_base_query(), sort, limit=10, offset=0, cursor="")
+        cursor = encode_cursor(keys, {"name": None, "id": "ABC"})
+
+        query, _ = repository._paginate(repository.build_base_query(), sort, limit=10, offset=0, cursor=cursor)
+
+        sql = self.compile(query)
+        assert "businesses.kups_nama IS NOT NULL OR businesses.kups_nama IS NULL AND businesses.kups_id > %s" in sql
+
+    def test_unprojected_sort_key_added_to_select(self):
+        with patch("app.repositories.base.db"):
+            repository = BusinessProductRepository(BusinessProductModel)
+        sort = [BusinessProductModel.business_id.asc()]
+
+        query, keys = repository._paginate(repository._build_query(), sort, limit=10, offset=0, cursor="")
+
+        assert "business_id" in query.selected_columns
+        assert [key.name for key in keys] == ["business_id", "id"]
+
+    @pytest.mark.parametrize("descending", [False, True])
+    def test_keyset_walk_with_null_sort_values(self, descending):
+        table = Table("items", MetaData(), Column("id", Integer, primary_key=True), Column("name", String(16)))
+        names = [None, "b", "a", None, "b", None, "c"]
+        engine = create_engine("sqlite://")
+        table.metadata.create_all(engine)
+
+        # SQLite mengurutkan NULL seperti MySQL: paling awal di ASC, paling akhir di DESC
+        order = table.c.name.desc() if descending else table.c.name.asc()
+        keys = build_sort_keys([order], table.c.id, lambda column: column.key)
+        with engine.connect() as connection:
+            connection.execute(table.insert(), [{"id": idx, "name": name} for idx, name in enumerate(names)])
+            expected = connection.execute(select(table.c.id).order_by(order, table.c.id)).scalars().all()
+
+            walked, cursor = [], ""
+            while cursor is not None:
+                query = select(table).order_by(*[key.order_by() for key in keys]).limit(3)
+                if cursor:
+                    query = query.where(build_seek_predicate(keys, decode_cursor(cursor, keys)))
+                rows = connection.execute(query).mappings().all()
+                walked.extend(row["id"] for row in rows[:2])
+                cursor = encode_cursor(keys, rows[1]) if len(rows) > 2 else None
+
+        assert walked == expected
+
+
+class TestBaseRepositoryCount:
+    """Test cases for count=exact|estimate|none in BaseRepository."""
+
+    @pytest.fixture
+    def mock_session(self):
+        session = AsyncMock()
+        session.scalar = AsyncMock(return_value=42)
+        return session
+
+    @pytest.fixture
+    def repository(self, mock_session):
+        with patch("app.repositories.base.db") as mock_db:
+            mock_db.session = mock_session
+            return BusinessesRepository(BusinessesModel)
+
+    @pytest.mark.asyncio
+    async def test_exact_count_selects_only_primary_key(self, repository, mock_session):
+        query = repository._build_query().group_by(BusinessesModel.id)
+        total = await repository._count(query, CountModeEnum.EXACT)
+
+        assert total == 42
+        count_sql = str(mock_session.scalar.call_args.args[0].compile(dialect=mysql.dialect()))
+        assert "kups_nama" not in count_sql
+        assert "GROUP BY businesses.kups_id" in count_sql
+
+    @pytest.mark.asyncio
+    async def test_none_count_skips_query(self, repository, mock_session):
+        total = await repository._count(repository._build_query(), CountModeEnum.NONE)
+
+        assert total is None
+        mock_session.scalar.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_estimate_count_is_cached(self, repository, mock_session):
+        query = repository._build_query().where(BusinessesModel.name == "KUPS A")
+
+        with patch("app.repositories.base.cache_manager") as mock_cache:
+            mock_cache.get = AsyncMock(side_effect=[None, 42])
+            mock_cache.set = AsyncMock()
+
+            assert await repository._count(query, CountModeEnum.ESTIMATE) == 42
+            assert await repository._count(query, CountModeEnum.ESTIMATE) == 42
+
+        assert mock_session.scalar.await_count == 1
+        mock_cache.set.assert_awaited_once()
+
+    def test_build_page_without_total_uses_extra_row(self, repository):
+        page = repository._build_page([{"id": "A"}, {"id": "B"}, {"id": "C"}], None, limit=2, offset=0)
+
+        assert page.items == [{"id": "A"}, {"id": "B"}]
+        assert page.total is None
+        assert page.has_more is True
+        assert page.next_cursor is None
+
+    def test_build_page_with_estimate_ignores_total(self, repository):
+        # Statistik tabel menyebut 1000 baris, tetapi tidak ada baris ekstra: ini halaman terakhir
+        page = repository._build_page([{"id": "A"}, {"id": "B"}], 1000, limit=2, offset=0, peek=True)
+
+        assert page.total == 1000
+        assert page.has_more is False
+
+    @pytest.mark.asyncio
+    async def test_estimate_count_fetches_extra_row(self, repository, mock_session):
+        mock_session.execute = AsyncMock(return_value=MagicMock())
+
+        with patch("app.repositories.base.cache_manager") as mock_cache:
+            mock_cache.get = AsyncMock(return_value=5)
+            await repository.find_all(limit=10, offset=0, count=CountModeEnum.ESTIMATE)
+
+        assert mock_session.execute.call_args.args[1]["_limit"] == 11
+
+    @pytest.mark.asyncio
+    async def test_with_session_queries_new_session(self, repository, mock_session):
+        other_session = AsyncMock()
+        other_session.scalar = AsyncMock(return_value=7)
+
+        rebound = repository.with_session(other_session)
+
+        assert await rebound._count(rebound._build_query(), CountModeEnum.EXACT) == 7
+        assert repository.session is mock_session
+        mock_session.scalar.assert_not_called()
+
+
+class TestStatementCache:
+    """Test cases for the statement-shape cache used by BaseService.find_all."""
+
+    @pytest.fixture
+    def mock_session(self):
+        session = AsyncMock()
+        session.scalar = AsyncMock(return_value=0)
+        session.execute = AsyncMock(return_value=MagicMock())
+        return session
+
+    @pytest.fixture
+    def service(self, mock_session):
+        from app.services.base import BaseService
+
+        with patch("app.repositories.base.db") as mock_db:
+            mock_db.session = mock_session
+            return BaseService(BusinessesModel, BaseRepository(BusinessesModel))
+
+    @pytest.mark.asyncio
+    async def test_same_shape_reuses_statement(self, service, mock_session):
+        from app.utils.statement_cache import statement_cache
+
+        await service.find_all(filters=["name=KUPS A"], sort="name:desc", search="a", limit=10, offset=0)
+        hits = statement_cache.hits
+        await service.find_all(filters=["name=KUPS B"], sort="name:desc", search="b", limit=20, offset=40)
+
+        first, second = mock_session.execute.call_args_list
+        assert first.args[0] is second.args[0]
+        assert statement_cache.hits > hits
+        assert first.args[1]["f0"] == "KUPS A" and second.args[1]["f0"] == "KUPS B"
+        assert second.args[1]["search"] == "%b%"
+        assert (second.args[1]["_limit"], second.args[1]["_offset"]) == (20, 40)
+
+        sql = str(second.args[0].compile(dialect=mysql.dialect()))
+        assert "KUPS" not in sql
+        assert "LIMIT %s, %s" in sql
+
+    @pytest.mark.asyncio
+    async def test_different_shape_builds_new_statement(self, service, mock_session):
+        await service.find_all(filters=["name=KUPS A"], limit=10, offset=0)
+        await service.find_all(filters=["sk_number=KUPS A"], limit=10, offset=0)
+
+        first, second = mock_session.execute.call_args_list
+        assert first.args[0] is not second.args[0]
+
+    @pytest.mark.asyncio
+    async def test_cursor_values_are_bound(self, service, mock_session):
+        _, keys = service.repository._paginate(service.repository.build_base_query(), [], 2, 0, cursor="")
+        cursor = encode_cursor(keys, {"id": "ABC"})
+
+        await service.find_all(limit=2, cursor=cursor)
+
+        statement, params = mock_session.execute.call_args.args
+        assert params["_k0"] == "ABC"
+        assert "ABC" not in str(statement.compile(dialect=mysql.dialect()))
+
+    @pytest.mark.asyncio
+    async def test_null_cursor_value_not_bound(self, service, mock_session):
+        sort = [BusinessesModel.name.asc()]
+        _, keys = service.repository._paginate(service.repository.build_base_query(), sort, 2, 0, cursor="")
+
+        await service.find_all(sort="name:asc", limit=2, cursor=encode_cursor(keys, {"name": "KUPS A", "id": "A"}))
+        await service.find_all(sort="name:asc", limit=2, cursor=encode_cursor(keys, {"name": None, "id": "B"}))
+
+        (filled, filled_params), (null, null_params) = [call.args for call in mock_session.execute.call_args_list]
+        assert filled is not null
+        assert "_k0" not in null_params and null_params["_k1"] == "B"
+        assert "kups_nama IS NULL" in str(null.compile(dialect=mysql.dialect()))
+
+    def test_lru_eviction_and_stats(self):
+        from app.utils.statement_cache import StatementCache
+
+        cache = StatementCache(maxsize=1)
+        cache.get_or_build("a", lambda: 1)
+        cache.get_or_build("a", lambda: 2)
+        assert cache.get_or_build("b", lambda: 3) == 3
+        assert cache.get_or_build("a", lambda: 4) == 4
+        assert cache.stats() == {"hits": 1, "misses": 3, "size": 1, "maxsize": 1}
+
+
+class TestBaseRepositorySearch:
+    """Test cases for FULLTEXT search mode with LIKE fallback."""
+
+    @pytest.fixture
+    def repository(self):
+        with patch("app.repositories.base.db"):
+            return BaseRepository(BusinessesModel)
+
+    def compile(self, clause):
+        return str(clause.compile(dialect=mysql.dialect()))
+
+    def test_fulltext_uses_match_against(self, repository):
+        params = repository._list_params(None, "hutan nagari", [])
+        sql = self.compile(repository._search_clause("hutan nagari", []))
+
+        assert "MATCH (businesses.kups_nama, businesses.kups_nama_ketua, businesses.kups_sk_no)" in sql
+        assert "IN BOOLEAN MODE" in sql
+        assert params["search"] == "+hutan* +nagari*"
+
+    def test_short_or_numeric_term_falls_back_to_like(self, repository):
+        for term in ("ab", "2021"):
+            params = repository._list_params(None, term, [])
+            sql = self.compile(repository._search_clause(term, []))
+
+            assert "MATCH" not in sql
+            assert "LIKE" in sql
+            assert params["search"] == f"%{term}%"
+
+    def test_custom_columns_fall_back_to_like(self, repository):
+        assert repository._search_mode("hutan", ["name"]) == "like"
+        assert repository._search_mode("hutan", ["sk_number", "name", "chairman_name"]) == "fulltext"
+
+    def test_model_without_searchable_uses_like(self):
+        from app.models import BusinessProductModel
+
+        with patch("app.repositories.base.db"):
+            repository = BaseRepository(BusinessProductModel)
+
+        assert repository._search_mode("hutan", []) == "like"
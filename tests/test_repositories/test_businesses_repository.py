@@ -143,3 +143,84 @@ class TestBusinessesRepository:
 
             result = await repository.delete("test_id")
             assert result is True
+
+
+class TestBusinessesRepositoryHydration:
+    """Test cases for batch hydration of business relations."""
+
+    ROWS = {
+        "user_account": [
+            {"id": "U1", "name": "User 1", "email": "u1@example.com"},
+            {"id": "U2", "name": "User 2", "email": "u2@example.com"},
+            {"id": "K1", "name": "KPH", "email": "kph@example.com"},
+        ],
+        "stat_businesses_class": [{"id": 1, "name": "Biru", "type": "BIRU"}],
+        "stat_businesses_operational": [],
+        "forestry": [
+            {
+                "id": "10",
+                "name": "LPHN A",
+                "regional_id": "R1",
+                "kph_account_id": "K1",
+                "schema_id": "HN",
+                "vertex": "V1",
+                "kh_id": '["HL"]',
+                "assist_account_id": '["U2"]',
+            }
+        ],
+        "regional": [{"id": "R1", "name": "Regional 1"}],
+        "stat_forestry_skema": [{"schema_id": "HN", "name": "Hutan Nagari", "description": None, "ord": 1}],
+        "stat_forestry_pps_proses": [{"id": 1, "name": "Usulan", "proposal_forestry_vertex": "V1"}],
+        "forestry_area": [{"id": 1, "name": "Hutan Lindung", "abbreviation": "HL"}],
+    }
+
+    @pytest.fixture
+    def mock_session(self):
+        def execute(query):
+            table = query.get_final_froms()[0].name
+            result = MagicMock()
+            result.mappings.return_value.all.return_value = self.ROWS.get(table, [])
+            return result
+
+        session = AsyncMock()
+        session.execute = AsyncMock(side_effect=execute)
+        return session
+
+    @pytest.fixture
+    def repository(self, mock_session):
+        with patch("app.repositories.base.db") as mock_db:
+            mock_db.session = mock_session
+            return BusinessesRepository(BusinessesModel)
+
+    @pytest.mark.asyncio
+    async def test_hydrate_uses_one_query_per_relation(self, repository, mock_session):
+        records = [
+            {
+                "id": "B1",
+                "class_id": "biru",
+                "operational_status_id": "S1",
+                "forestry_id": "10 ",
+                "account_ids": '["U1"]',
+            },
+            {"id": "B2", "class_id": "BIRU", "operational_status_id": None, "forestry_id": "99", "account_ids": None},
+        ]
+
+        first, second = await repository._hydrate(records)
+
+        # class, status, forestry, regional, schema, vertex, area, users
+        assert mock_session.execute.await_count == 8
+        assert first["account_users"][0]["id"] == "U1"
+        assert first["business_class"]["type"] == "BIRU"
+        assert first["operational_status"] is None
+        assert first["forestry"]["regional"]["name"] == "Regional 1"
+        assert first["forestry"]["kph_account"]["id"] == "K1"
+        assert [user["id"] for user in first["forestry"]["assist_accounts"]] == ["U2"]
+        assert first["forestry"]["kh_detail"][0]["abbreviation"] == "HL"
+        assert "account_ids" not in first
+        assert second["account_users"] == []
+        assert second["forestry"] is None
+
+    @pytest.mark.asyncio
+    async def test_hydrate_empty_page_skips_queries(self, repository, mock_session):
+        assert await repository._hydrate([]) == []
+        mock_session.execute.assert_not_called()
@@ -0,0 +1,54 @@
+from datetime import datetime
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
+from sqlalchemy.dialects import mysql
+
+from app.core.data_types import ExportJobStatusEnum
+from app.models import ExportJobModel
+from app.repositories import ExportJobRepository
+
+
+class TestExportJobRepositoryHeartbeat:
+    """Test cases for worker ownership and heartbeat of export jobs."""
+
+    @pytest.fixture
+    def session(self):
+        session = AsyncMock()
+        session.execute = AsyncMock(return_value=Mock(rowcount=1))
+        return session
+
+    @pytest.fixture
+    def repository(self, session):
+        with patch("app.repositories.base.db") as db:
+            db.session = session
+            return ExportJobRepository(ExportJobModel)
+
+    def sql(self, session) -> str:
+        query = session.execute.call_args.args[0]
+        return str(query.compile(dialect=mysql.dialect(), compile_kwargs={"literal_binds": True}))
+
+    @pytest.mark.asyncio
+    async def test_set_status_only_for_owned_active_job(self, repository, session):
+        assert await repository.set_status("job-1", "host:1:ab", ExportJobStatusEnum.COMPLETED, size=10)
+
+        sql = self.sql(session)
+        assert "export_jobs.worker_id = 'host:1:ab'" in sql
+        assert "export_jobs.status IN ('queued', 'running')" in sql
+        session.commit.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_set_status_on_reaped_job(self, repository, session):
+        session.execute.return_value = Mock(rowcount=0)
+
+        assert not await repository.set_status("job-1", "host:1:ab", ExportJobStatusEnum.RUNNING)
+
+    @pytest.mark.asyncio
+    async def test_fail_stale_filters_on_heartbeat(self, repository, session):
+        stale_before = datetime(2026, 10, 18, 12, 0)
+
+        await repository.fail_stale(stale_before, "Interrupted", stale_before)
+
+        sql = self.sql(session)
+        assert "export_jobs.updated_at IS NULL OR export_jobs.updated_at < '2026-10-18 12:00:00'" in sql
+        assert "created_at" not in sql.split("WHERE")[1]
@@ -0,0 +1,121 @@
+from unittest.mock import AsyncMock, MagicMock, Mock, patch
+
+import pytest
+from sqlalchemy.exc import IntegrityError
+
+from app.models import FileBlobModel, FileModel
+from app.repositories import FileRepository
+
+
+class TestFileRepositoryReferences:
+    """Test cases for content-hash reference counting in FileRepository."""
+
+    @pytest.fixture
+    def db(self):
+        with patch("app.repositories.file_repository.db") as db, patch("app.repositories.base.db"):
+            db.session.execute = AsyncMock()
+            db.session.commit = AsyncMock()
+            db.session.rollback = AsyncMock()
+            yield db
+
+    @pytest.fixture
+    def repository(self, db):
+        return FileRepository(FileModel)
+
+    def select_result(self, file):
+        result = MagicMock()
+        result.scalars.return_value.first.return_value = file
+        return result
+
+    @pytest.mark.asyncio
+    async def test_add_reference_missing_hash(self, repository, db):
+        db.session.execute.return_value = Mock(rowcount=0)
+
+        assert await repository.add_reference("abc") is None
+        db.session.rollback.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_add_reference_left_uncommitted(self, repository, db):
+        blob = Mock(spec=FileBlobModel, object_name="abc.pdf", ref_count=2)
+        db.session.execute.side_effect = [Mock(rowcount=1), self.select_result(blob)]
+
+        assert await repository.add_reference("abc") is blob
+        db.session.commit.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_create_blob_lost_race(self, repository, db):
+        db.session.add = Mock()
+        db.session.flush = AsyncMock(side_effect=IntegrityError("INSERT", {}, Exception("Duplicate entry")))
+
+        assert await repository.create_blob("abc", "abc.pdf") is None
+        db.session.rollback.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_release_keeps_shared_object(self, repository, db):
+        file = Mock(spec=FileModel, object_name="abc.pdf", content_hash="abc")
+        blob = Mock(spec=FileBlobModel, id=7, ref_count=1)
+        db.session.execute.side_effect = [self.select_result(file), Mock(), Mock(), self.select_result(blob)]
+        on_last = AsyncMock()
+
+        assert await repository.release_reference(1, on_last) is False
+        on_last.assert_not_called()
+        db.session.commit.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_release_last_reference_deletes_object_before_commit(self, repository, db):
+        file = Mock(spec=FileModel, object_name="abc.pdf", content_hash="abc")
+        blob = Mock(spec=FileBlobModel, id=7, ref_count=0)
+        calls = []
+        db.session.execute.side_effect = [self.select_result(file), Mock(), Mock(), self.select_result(blob), Mock()]
+        db.session.commit.side_effect = lambda: calls.append("commit")
+        on_last = AsyncMock(side_effect=lambda object_name: calls.append(object_name))
+
+        assert await repository.release_reference(1, on_last) is True
+        assert calls == ["abc.pdf", "commit"]
+        assert db.session.execute.await_count == 5
+
+    @pytest.mark.asyncio
+    async def test_release_file_without_blob(self, repository, db):
+        file = Mock(spec=FileModel, object_name="lama.pdf", content_hash=None)
+        db.session.execute.side_effect = [self.select_result(file), Mock()]
+        on_last = AsyncMock()
+
+        assert await repository.release_reference(1, on_last) is True
+        on_last.assert_awaited_once_with("lama.pdf")
+        assert db.session.execute.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_release_rolls_back_when_object_delete_fails(self, repository, db):
+        file = Mock(spec=FileModel, object_name="abc.pdf", content_hash="abc")
+        blob = Mock(spec=FileBlobModel, id=7, ref_count=0)
+        db.session.execute.side_effect = [self.select_result(file), Mock(), Mock(), self.select_result(blob), Mock()]
+        on_last = AsyncMock(side_effect=RuntimeError("minio down"))
+
+        with pytest.raises(RuntimeError):
+            await repository.release_reference(1, on_last)
+
+        db.session.rollback.assert_awaited_once()
+        db.session.commit.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_find_by_user_and_prefix_scoped_to_owner(self, repository, db):
+        db.session.execute.return_value = MagicMock()
+
+        await repository.find_by_user_and_prefix("user-1", "a_b", limit=11)
+
+        query = db.session.execute.call_args.args[0]
+        sql = str(query.compile(compile_kwargs={"literal_binds": True}))
+        assert "files.user_id = 'user-1'" in sql
+        assert "LIKE 'a/_b' || '%' ESCAPE '/'" in sql
+        assert "LIMIT 11" in sql
+
+    @pytest.mark.asyncio
+    async def test_find_by_ids_scoped_to_owner(self, repository, db):
+        db.session.execute.return_value = MagicMock()
+
+        await repository.find_by_ids([1, 2], "user-1")
+
+        query = db.session.execute.call_args.args[0]
+        sql = str(query.compile(compile_kwargs={"literal_binds": True}))
+        assert "files.id IN (1, 2)" in sql
+        assert "files.user_id = 'user-1'" in sql
@@ -0,0 +1,39 @@
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.models import BusinessesModel, ForestryProposalModel
+from app.repositories import InfographicRepository
+from app.services.infographic_store import SECTIONS
+
+
+class TestInfographicRepository:
+    """Test cases for InfographicRepository join keys."""
+
+    @pytest.mark.asyncio
+    async def test_queries_join_on_normalized_keys(self):
+        session = MagicMock()
+        session.execute = AsyncMock(return_value=MagicMock())
+        repository = InfographicRepository()
+
+        with patch("app.repositories.infographic_repository.db") as mock_db:
+            mock_db.session = session
+            for method_name, _ in SECTIONS.values():
+                await getattr(repository, method_name)()
+
+        sql = "\n".join(str(call.args[0]) for call in session.execute.await_args_list)
+        assert "fore_kps_key" in sql
+        assert "fore_skema_key" in sql
+        assert "TRIM(f.fore_kps_id)" not in sql
+        assert "TRIM(b.fore_kps_id)" not in sql
+        assert "TRIM(f.fore_skema_id)" not in sql
+
+    def test_key_columns_are_generated_and_indexed(self):
+        forestry = ForestryProposalModel.__table__
+        businesses = BusinessesModel.__table__
+
+        assert forestry.c.fore_kps_key.computed.persisted
+        assert forestry.c.fore_skema_key.computed.persisted
+        assert businesses.c.fore_kps_key.computed.persisted
+        assert {"ix_forestry_kps_key", "ix_forestry_skema_key"} <= {index.name for index in forestry.indexes}
+        assert "ix_businesses_kps_key" in {index.name for index in businesses.indexes}
@@ -0,0 +1,47 @@
+from unittest.mock import patch
+
+from sqlalchemy.dialects import mysql
+
+from app.models import BusinessProductModel, BusinessServiceModel
+from app.repositories import BusinessProductRepository, BusinessServiceRepository
+from app.repositories.projections import cached_select
+
+
+class TestProjectionRegistry:
+    """Test cases for the shared JSON projection registry."""
+
+    def test_cached_select_builds_once(self):
+        calls = []
+
+        def builder():
+            calls.append(1)
+            return object()
+
+        first = cached_select(("test", "builds-once"), builder)
+        second = cached_select(("test", "builds-once"), builder)
+
+        assert first is second
+        assert len(calls) == 1
+
+    def test_repository_reuses_base_select(self):
+        with patch("app.repositories.base.db"):
+            first = BusinessProductRepository(BusinessProductModel)._build_query()
+            second = BusinessProductRepository(BusinessProductModel)._build_query()
+
+        assert first is second
+        # Filter menghasilkan Select baru; base tetap utuh
+        assert first.where(BusinessProductModel.id == "X") is not first
+        assert first.whereclause is None
+
+    def test_business_projection_is_shared(self):
+        with patch("app.repositories.base.db"):
+            product_sql = str(
+                BusinessProductRepository(BusinessProductModel)._build_query().compile(dialect=mysql.dialect())
+            )
+            service_sql = str(
+                BusinessServiceRepository(BusinessServiceModel)._build_query().compile(dialect=mysql.dialect())
+            )
+
+        for sql in (product_sql, service_sql):
+            assert "json_contains(business_alias.kups_acc_id" in sql
+            assert sql.count("is_verified") == 1
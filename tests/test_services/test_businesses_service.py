@@ -1,12 +1,23 @@
-from unittest.mock import AsyncMock, Mock
+from contextlib import nullcontext
+from io import BytesIO
+from unittest.mock import AsyncMock, Mock, patch
 
 import pytest
+from openpyxl import load_workbook
 
+from app.core.data_types import ExportFormatEnum
+from app.core.exceptions import ValidationException
+from app.core.pagination import Page
 from app.repositories import BusinessesRepository
 from app.schemas.user_schema import UserSchema
 from app.services import BusinessesService
 
 
+def export_db(session=None):
+    """Pengganti db() untuk iter_all: context kosong dengan `session` sebagai db.session."""
+    return Mock(side_effect=nullcontext, session=session or Mock())
+
+
 class TestBusinessesService:
     """Test cases for BusinessesService."""
 
@@ -45,6 +56,7 @@ class TestBusinessesService:
             "updated_at": Mock(),
         }
         mock_repo.inspector = mock_inspector
+        mock_repo.with_session = Mock(return_value=mock_repo)
         return mock_repo
 
     @pytest.fixture
@@ -155,3 +167,77 @@ class TestBusinessesService:
         assert call_args[1]["offset"] == offset
         assert call_args[1]["relationships"] == []  # Default empty list
         assert call_args[1]["searchable_columns"] == []  # Default empty list
+
+    @pytest.mark.asyncio
+    async def test_export_streams_xlsx_pages(self, service, mock_repository):
+        """Export membaca per batch dengan keyset cursor dan menghasilkan xlsx."""
+        mock_repository.find_all = AsyncMock(
+            side_effect=[
+                Page([{"name": "KUPS A", "business_class": {"name": "Gold"}}], None, has_more=True, next_cursor="c1"),
+                Page([{"name": "KUPS B", "forestry": {"name": "KPS B", "kph_account": {"name": "KPH"}}}], None),
+            ]
+        )
+
+        with patch("app.services.base.db", export_db()):
+            chunks = [chunk async for chunk in service.export(sort="name:asc")]
+
+        rows = list(load_workbook(BytesIO(b"".join(chunks))).active.values)
+        assert rows[0] == tuple(BusinessesService.EXPORT_COLUMNS)
+        assert rows[1][:3] == (1, "KUPS A", "Gold")
+        assert rows[2][:5] == (2, "KUPS B", None, "KPS B", "KPH")
+
+        cursors = [call.kwargs["cursor"] for call in mock_repository.find_all.await_args_list]
+        assert cursors == ["", "c1"]
+        assert all(call.kwargs["count"] == "none" for call in mock_repository.find_all.await_args_list)
+
+    @pytest.mark.asyncio
+    async def test_export_respects_limit(self, service, mock_repository):
+        mock_repository.find_all = AsyncMock(
+            return_value=Page([{"name": f"KUPS {i}"} for i in range(3)], None, has_more=True, next_cursor="c")
+        )
+
+        with patch("app.services.base.db", export_db()):
+            records = [item async for item in service.iter_all(limit=2, offset=1)]
+
+        assert [item["name"] for item in records] == ["KUPS 1", "KUPS 2"]
+        mock_repository.find_all.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_export_csv(self, service, mock_repository):
+        mock_repository.find_all = AsyncMock(return_value=Page([{"name": "KUPS, A"}], None))
+
+        with patch("app.services.base.db", export_db()):
+            chunks = [chunk async for chunk in service.export(export_format=ExportFormatEnum.CSV)]
+
+        lines = b"".join(chunks).decode("utf-8").splitlines()
+        assert lines[0] == ",".join(BusinessesService.EXPORT_COLUMNS)
+        assert lines[1].startswith('1,"KUPS, A",')
+
+    @pytest.mark.asyncio
+    async def test_export_parquet(self, service, mock_repository):
+        pq = pytest.importorskip("pyarrow.parquet")
+        mock_repository.find_all = AsyncMock(return_value=Page([{"name": "KUPS A"}, {"name": "KUPS B"}], None))
+
+        with patch("app.services.base.db", export_db()):
+            chunks = [chunk async for chunk in service.export(export_format=ExportFormatEnum.PARQUET)]
+
+        table = pq.read_table(BytesIO(b"".join(chunks)))
+        assert table.column_names == list(BusinessesService.EXPORT_COLUMNS)
+        assert table.column("No").to_pylist() == [1, 2]
+        assert table.column("Kelas KUPS").to_pylist() == [None, None]
+
+    @pytest.mark.asyncio
+    async def test_iter_all_queries_through_own_session(self, service, mock_repository):
+        """Halaman diambil lewat repository yang memakai session db() baru, bukan session request."""
+        mock_repository.find_all = AsyncMock(return_value=Page([{"name": "KUPS A"}], None))
+        session = Mock()
+
+        with patch("app.services.base.db", export_db(session)):
+            records = [item async for item in service.iter_all()]
+
+        assert records == [{"name": "KUPS A"}]
+        mock_repository.with_session.assert_called_once_with(session)
+
+    def test_export_validates_before_streaming(self, service):
+        with pytest.raises(ValidationException):
+            service.export(sort="unknown:asc")
@@ -0,0 +1,388 @@
+import asyncio
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+import pytest_asyncio
+
+from app.schemas.user_schema import UserSchema
+from app.utils.cache import (
+    CacheManager,
+    LocalSharedCache,
+    LRUMemoryCache,
+    estimate_size,
+)
+
+
+class TestLRUMemoryCache:
+    """Test cases for the bounded LRU + TTL cache backend."""
+
+    @pytest.mark.asyncio
+    async def test_evicts_least_recently_used(self):
+        cache = LRUMemoryCache(max_entries=2)
+        await cache.set("a", 1)
+        await cache.set("b", 2)
+        await cache.get("a")
+        await cache.set("c", 3)
+
+        assert await cache.get("b") is None
+        assert await cache.get("a") == 1
+        assert await cache.get("c") == 3
+        assert cache.stats()["evictions"] == 1
+
+    @pytest.mark.asyncio
+    async def test_byte_budget(self):
+        cache = LRUMemoryCache(max_entries=100, max_bytes=estimate_size("k1") + estimate_size("x" * 1000) + 10)
+        await cache.set("k1", "x" * 1000)
+        await cache.set("k2", "y" * 1000)
+
+        assert await cache.get("k1") is None
+        assert await cache.get("k2") == "y" * 1000
+        assert cache.stats()["bytes"] <= cache.max_bytes
+
+        # Nilai yang melebihi seluruh budget tidak disimpan dan tidak mengosongkan cache
+        assert await cache.set("big", "z" * 5000) is False
+        assert await cache.get("k2") == "y" * 1000
+
+    @pytest.mark.asyncio
+    async def test_ttl_expiry(self, monkeypatch):
+        now = [1000.0]
+        monkeypatch.setattr("app.utils.cache.time.monotonic", lambda: now[0])
+        cache = LRUMemoryCache()
+        await cache.set("token:abc", {"sub": "1"}, ttl=30)
+
+        assert await cache.get("token:abc") == {"sub": "1"}
+        now[0] += 30
+        assert await cache.get("token:abc") is None
+
+        stats = cache.stats()
+        assert (stats["hits"], stats["misses"], stats["expirations"], stats["entries"]) == (1, 1, 1, 0)
+        assert stats["bytes"] == 0
+
+    @pytest.mark.asyncio
+    async def test_delete_and_overwrite_keep_size_accounting(self):
+        cache = LRUMemoryCache()
+        await cache.set("a", [1, 2, 3])
+        await cache.set("a", "x" * 100)
+        assert cache.bytes == estimate_size("a") + estimate_size("x" * 100)
+
+        assert await cache.delete("a") == 1
+        assert await cache.delete("a") == 0
+        assert cache.bytes == 0
+
+    def test_estimate_size_counts_nested_values(self):
+        user = UserSchema(id="1", name="Budi", email="budi@example.com", enable="Y")
+
+        assert estimate_size({"user": {"name": "x" * 500}}) > 500
+        assert estimate_size(user) > estimate_size("Budi")
+
+    @pytest.mark.asyncio
+    async def test_cache_manager_backend_selectable(self):
+        assert isinstance(CacheManager(backend="lru").cache, LRUMemoryCache)
+
+        manager = CacheManager(backend="simple")
+        await manager.set("a", 1)
+        assert await manager.get("a") == 1
+        assert manager.stats() == {}
+
+
+class TestTwoTierCache:
+    """Test cases for the shared L2 layer and cross-worker invalidation."""
+
+    @pytest_asyncio.fixture
+    async def workers(self):
+        shared = LocalSharedCache()
+        workers = [CacheManager(shared=shared, l1_ttl=30) for _ in range(2)]
+        for worker in workers:
+            worker.start()
+        await asyncio.sleep(0)
+        yield workers
+        for worker in workers:
+            await worker.stop()
+
+    @pytest.mark.asyncio
+    async def test_value_shared_between_workers(self, workers):
+        a, b = workers
+        await a.set("user:1", {"id": "1", "name": "Budi"}, ttl=300)
+
+        assert await b.get("user:1") == {"id": "1", "name": "Budi"}
+        assert b.stats()["entries"] == 1
+
+    @pytest.mark.asyncio
+    async def test_delete_invalidates_other_workers_l1(self, workers):
+        a, b = workers
+        await a.set("user:1", {"name": "lama"})
+        assert await b.get("user:1") == {"name": "lama"}
+
+        await a.delete("user:1")
+        await asyncio.sleep(0)
+        assert await b.get("user:1") is None
+
+        await a.set("user:1", {"name": "baru"})
+        await asyncio.sleep(0)
+        assert await b.get("user:1") == {"name": "baru"}
+
+    @pytest.mark.asyncio
+    async def test_l1_copy_never_outlives_l2_ttl(self, workers, monkeypatch):
+        now = [1000.0]
+        monkeypatch.setattr("app.utils.cache.time.monotonic", lambda: now[0])
+        a, b = workers
+        await a.set("token:abc", {"sub": "1"}, ttl=5)
+        assert await b.get("token:abc") == {"sub": "1"}
+
+        now[0] += 5
+        assert await b.get("token:abc") is None
+
+    @pytest.mark.asyncio
+    async def test_l1_cleared_after_subscription_confirmed(self):
+        manager = CacheManager(shared=None)
+
+        class SlowSubscribe(LocalSharedCache):
+            async def subscribe(self):
+                # Sebelum SUBSCRIBE dikonfirmasi worker masih bisa mengisi L1 dari nilai yang sudah basi
+                await manager.cache.set("user:1", {"name": "lama"})
+                async for message in super().subscribe():
+                    yield message
+
+        manager.shared = SlowSubscribe()
+        manager.start()
+        await asyncio.sleep(0)
+
+        assert await manager.cache.get("user:1") is None
+        await manager.stop()
+
+    @pytest.mark.asyncio
+    async def test_l2_failure_falls_back_to_l1(self):
+        shared = Mock(spec=LocalSharedCache)
+        shared.get = AsyncMock(side_effect=ConnectionError("redis down"))
+        shared.set = AsyncMock(side_effect=ConnectionError("redis down"))
+        shared.publish = AsyncMock(side_effect=ConnectionError("redis down"))
+        manager = CacheManager(shared=shared)
+
+        assert await manager.get("user:1") is None
+        await manager.set("user:1", {"id": "1"})
+        assert await manager.get("user:1") == {"id": "1"}
+
+
+class TestStampedeProtection:
+    """Test cases for single-flight loading and stale-while-revalidate."""
+
+    @pytest.fixture
+    def clock(self, monkeypatch):
+        now = [1_000_000.0]
+        monkeypatch.setattr("app.utils.cache.time.time", lambda: now[0])
+        return now
+
+    @staticmethod
+    def loader(values, delay=0.01):
+        calls = []
+
+        async def load():
+            calls.append(1)
+            await asyncio.sleep(delay)
+            return values[len(calls) - 1]
+
+        load.calls = calls
+        return load
+
+    @pytest.mark.asyncio
+    async def test_concurrent_misses_share_one_load(self):
+        manager = CacheManager(backend="lru")
+        load = self.loader(["v1"])
+
+        results = await asyncio.gather(*(manager.get_or_load("k", load, ttl=60) for _ in range(50)))
+
+        assert results == ["v1"] * 50
+        assert len(load.calls) == 1
+        assert await manager.get_or_load("k", load, ttl=60) == "v1"
+        assert len(load.calls) == 1
+
+    @pytest.mark.asyncio
+    async def test_stale_value_served_while_refreshing(self, clock):
+        manager = CacheManager(backend="lru")
+        manager.early_refresh_beta = 0
+        load = self.loader(["v1", "v2"])
+        await manager.get_or_load("k", load, ttl=60, stale_ttl=30)
+
+        clock[0] += 61
+        assert await manager.get_or_load("k", load, ttl=60, stale_ttl=30) == "v1"
+        assert await manager.get_or_load("k", load, ttl=60, stale_ttl=30) == "v1"
+        await asyncio.sleep(0.05)
+
+        assert len(load.calls) == 2
+        assert await manager.get_or_load("k", load, ttl=60, stale_ttl=30) == "v2"
+
+    @pytest.mark.asyncio
+    async def test_early_refresh_before_expiry(self, clock, monkeypatch):
+        manager = CacheManager(backend="lru")
+        load = self.loader(["v1", "v2"], delay=0)
+        await manager.get_or_load("k", load, ttl=60)
+
+        # U mendekati 1 → -log(1 - U) besar, refresh dimulai walau ttl belum habis
+        monkeypatch.setattr("app.utils.cache.random.random", lambda: 1 - 1e-12)
+        manager.early_refresh_beta = 1e6
+        clock[0] += 30
+        assert await manager.get_or_load("k", load, ttl=60) == "v1"
+        await asyncio.sleep(0)
+
+        assert len(load.calls) == 2
+
+    @pytest.mark.asyncio
+    async def test_invalidation_during_load_not_cached(self):
+        manager = CacheManager(backend="lru")
+        load = self.loader(["lama", "baru"])
+
+        pending = asyncio.create_task(manager.get_or_load("k", load))
+        await asyncio.sleep(0)
+        await manager.delete("k")
+
+        assert await pending == "lama"
+        assert await manager.get_or_load("k", load) == "baru"
+
+    @pytest.mark.asyncio
+    async def test_loader_error_propagates_and_is_not_cached(self):
+        manager = CacheManager(backend="lru")
+        load = AsyncMock(side_effect=[RuntimeError("db down"), "v1"])
+
+        with pytest.raises(RuntimeError):
+            await manager.get_or_load("k", load)
+        assert await manager.get_or_load("k", load) == "v1"
+
+    @pytest.mark.asyncio
+    async def test_plain_values_from_set_are_returned(self):
+        manager = CacheManager(backend="lru")
+        await manager.set("user:1", {"id": "1"})
+        load = AsyncMock()
+
+        assert await manager.get_or_load("user:1", load) == {"id": "1"}
+        load.assert_not_called()
+
+
+class TestTagInvalidation:
+    """Test cases for tag-based invalidation and BaseService write hooks."""
+
+    @pytest.mark.asyncio
+    async def test_invalidate_tag_drops_tagged_entries_only(self):
+        manager = CacheManager(backend="lru")
+        await manager.set("businesses:list", [1, 2], tags=["model:BusinessesModel"])
+        await manager.set("businesses:1", {"id": 1}, tags=["id:BusinessesModel:1"])
+        await manager.set("articles:list", [3], tags=["model:ArticleModel"])
+
+        await manager.invalidate_tags("model:BusinessesModel")
+
+        assert await manager.get("businesses:list") is None
+        assert await manager.get("businesses:1") == {"id": 1}
+        assert await manager.get("articles:list") == [3]
+
+    @pytest.mark.asyncio
+    async def test_invalidation_reaches_other_workers(self):
+        shared = LocalSharedCache()
+        a, b = CacheManager(shared=shared), CacheManager(shared=shared)
+        for worker in (a, b):
+            worker.start()
+        await asyncio.sleep(0)
+
+        await a.set("businesses:list", [1], tags=["model:BusinessesModel"])
+        assert await b.get("businesses:list") == [1]
+
+        await a.invalidate_tags("model:BusinessesModel")
+        await asyncio.sleep(0)
+        assert await b.get("businesses:list") is None
+
+        for worker in (a, b):
+            await worker.stop()
+
+    @pytest.mark.asyncio
+    async def test_invalidation_during_load_is_not_lost(self):
+        manager = CacheManager(backend="lru")
+        loaded = asyncio.Event()
+        values = iter(["lama", "baru"])
+
+        async def load():
+            value = next(values)
+            loaded.set()
+            await asyncio.sleep(0.01)
+            return value
+
+        pending = asyncio.create_task(manager.get_or_load("k", load, tags=["model:X"]))
+        await loaded.wait()
+        await manager.invalidate_tags("model:X")
+
+        assert await pending == "lama"
+        assert await manager.get_or_load("k", load, tags=["model:X"]) == "baru"
+
+    @pytest.mark.asyncio
+    async def test_service_writes_invalidate_model_and_id_tags(self, monkeypatch):
+        from app.models import IncomeModel
+        from app.repositories import FarmerIncomesRepository
+        from app.services import FarmerIncomesService
+        from app.services import base as base_module
+
+        invalidate_tags = AsyncMock()
+        monkeypatch.setattr(base_module.cache_manager, "invalidate_tags", invalidate_tags)
+        repository = Mock(spec=FarmerIncomesRepository)
+        repository.create = AsyncMock(return_value=Mock(spec=IncomeModel))
+        repository.exists = AsyncMock(return_value=True)
+        repository.update = AsyncMock(return_value=Mock(spec=IncomeModel))
+        repository.delete = AsyncMock()
+        service = FarmerIncomesService(repository)
+
+        await service.create({"year": 2024})
+        await service.update("7", {"year": 2025})
+        await service.delete("7", permanent=True)
+
+        assert [c.args for c in invalidate_tags.await_args_list] == [
+            ("model:IncomeModel",),
+            ("model:IncomeModel", "id:IncomeModel:7"),
+            ("model:IncomeModel", "id:IncomeModel:7"),
+        ]
+
+    @pytest.mark.asyncio
+    async def test_user_update_drops_cached_auth_user(self, monkeypatch):
+        from app.models import UserModel
+        from app.repositories import UserRepository
+        from app.services import UserService
+        from app.services import base as base_module
+        from app.services.base import id_cache_tag
+
+        manager = CacheManager(backend="lru")
+        monkeypatch.setattr(base_module, "cache_manager", manager)
+        repository = Mock(spec=UserRepository)
+        repository.find_by_id = AsyncMock(return_value=Mock(spec=UserModel))
+        repository.update = AsyncMock(return_value=Mock(spec=UserModel))
+        load = AsyncMock(side_effect=[{"id": "u1", "enable": "Y"}, {"id": "u1", "enable": "N"}])
+        tags = [id_cache_tag(UserModel, "u1")]
+
+        assert (await manager.get_or_load("user:u1", load, tags=tags))["enable"] == "Y"
+        await UserService(repository).update("u1", {"enable": "N"}, Mock(id="admin"))
+
+        # Nilai lama tidak disajikan sebagai nilai basi setelah user dinonaktifkan
+        assert (await manager.get_or_load("user:u1", load, tags=tags))["enable"] == "N"
+
+    @pytest.mark.asyncio
+    async def test_user_update_drops_auth_user_cached_at_login(self, monkeypatch):
+        from app.models import UserModel
+        from app.repositories import TokenRepository, UserRepository
+        from app.services import AuthService, UserService
+        from app.services import auth_service as auth_module
+        from app.services import base as base_module
+        from app.services.base import id_cache_tag
+
+        manager = CacheManager(backend="lru")
+        monkeypatch.setattr(base_module, "cache_manager", manager)
+        monkeypatch.setattr(auth_module, "cache_manager", manager)
+        monkeypatch.setattr(auth_module, "verify_password", lambda password, hashed: True)
+        user = Mock(spec=UserModel, id="u1", password="hash")
+        user.to_dict.return_value = {"id": "u1", "enable": "Y"}
+        repository = Mock(spec=UserRepository)
+        repository.find_by_email = AsyncMock(return_value=user)
+        repository.find_by_id = AsyncMock(return_value=user)
+        repository.update = AsyncMock(return_value=user)
+        load = AsyncMock(return_value={"id": "u1", "enable": "N"})
+        tags = [id_cache_tag(UserModel, "u1")]
+
+        await AuthService(repository, Mock(spec=TokenRepository)).authenticate_user("u1@example.com", "rahasia")
+        assert (await manager.get_or_load("user:u1", load, tags=tags))["enable"] == "Y"
+        await UserService(repository).update("u1", {"enable": "N"}, Mock(id="admin"))
+
+        # Entry yang ditulis saat login juga ikut dibuang oleh invalidasi tag user
+        assert (await manager.get_or_load("user:u1", load, tags=tags))["enable"] == "N"
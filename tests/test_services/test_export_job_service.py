@@ -0,0 +1,251 @@
+import asyncio
+from contextlib import nullcontext
+from datetime import timedelta
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
+
+from app.core.data_types import ExportFormatEnum, ExportJobStatusEnum
+from app.core.exceptions import (
+    NotFoundException,
+    ServiceUnavailableException,
+    TooManyRequestsException,
+)
+from app.core.minio_client import MinioClient
+from app.models import ExportJobModel
+from app.repositories import ExportJobRepository
+from app.services import ExportJobService, export_job_service
+from app.services.export_runner import ExportJobRunner
+
+
+class TestExportJobRunner:
+    """Test cases for the in-process export queue."""
+
+    def test_check_requires_started_runner(self):
+        with pytest.raises(ServiceUnavailableException):
+            ExportJobRunner().check()
+
+    @pytest.mark.asyncio
+    async def test_heartbeat_runs_until_stopped(self):
+        runner = ExportJobRunner(workers=1, heartbeat_interval=0.01)
+        heartbeat = AsyncMock(side_effect=[RuntimeError("db down"), None, None, None, None, None])
+
+        runner.start(heartbeat=heartbeat)
+        await asyncio.sleep(0.05)
+        await runner.stop()
+
+        # Gagal sekali tidak menghentikan heartbeat berikutnya
+        assert heartbeat.await_count >= 2
+        count = heartbeat.await_count
+        await asyncio.sleep(0.02)
+        assert heartbeat.await_count == count
+
+    @pytest.mark.asyncio
+    async def test_queue_size(self):
+        runner = ExportJobRunner(workers=1, queue_size=2)
+        runner.start()
+        release = asyncio.Event()
+        try:
+            # Worker mengambil satu job, sisanya mengisi antrian
+            runner.submit(release.wait)
+            await asyncio.sleep(0)
+            runner.submit(release.wait)
+            runner.submit(release.wait)
+            with pytest.raises(ServiceUnavailableException):
+                runner.submit(release.wait)
+
+            release.set()
+            await runner._queue.join()
+            runner.check()
+        finally:
+            await runner.stop()
+
+
+class TestExportJobService:
+    """Test cases for ExportJobService."""
+
+    @pytest.fixture
+    def mock_repository(self, job_repository):
+        mock_repo = Mock(spec=ExportJobRepository)
+        mock_repo.set_status = AsyncMock(return_value=True)
+        mock_repo.count_active = AsyncMock(return_value=0)
+        mock_repo.with_session = Mock(side_effect=lambda session: job_repository)
+        return mock_repo
+
+    @pytest.fixture
+    def job_repository(self):
+        """Repository yang dipakai job di worker, terikat ke session db() milik job."""
+        job_repo = Mock(spec=ExportJobRepository)
+        job_repo.set_status = AsyncMock(return_value=True)
+        return job_repo
+
+    @pytest.fixture
+    def mock_minio(self):
+        minio = Mock(spec=MinioClient)
+        minio.upload_file = AsyncMock(return_value="http://minio/bucket/exports/job-1.csv")
+        minio.get_presigned_url = AsyncMock(return_value="http://minio/bucket/exports/job-1.csv?X-Amz-Signature=x")
+        return minio
+
+    @pytest.fixture
+    def exporter(self):
+        async def content():
+            yield b"a,b\r\n"
+            yield b"1,2\r\n"
+
+        return Mock(export=Mock(side_effect=lambda **kwargs: content()))
+
+    @pytest.fixture
+    def runner(self):
+        return Mock(spec=ExportJobRunner)
+
+    @pytest.fixture
+    def service(self, mock_repository, mock_minio, exporter, runner):
+        return ExportJobService(mock_repository, mock_minio, {"businesses": exporter}, runner=runner)
+
+    def job(self, **fields):
+        data = {column: None for column in ExportJobModel.__mapper__.c.keys()}
+        data.update(id="job-1", user_id="user-1", resource="businesses", format="csv", status="queued")
+        data.update(fields)
+        return SimpleNamespace(__mapper__=ExportJobModel.__mapper__, **data)
+
+    @pytest.mark.asyncio
+    async def test_create_job_enqueues(self, service, mock_repository, exporter, runner):
+        calls = []
+        mock_repository.create = AsyncMock(return_value=self.job())
+        mock_repository.find_by_id = AsyncMock(side_effect=lambda id: calls.append("get_job") or self.job())
+        runner.submit.side_effect = lambda job: calls.append("submit")
+
+        result = await service.create_job(
+            {"resource": "businesses", "format": ExportFormatEnum.CSV, "filters": ["status=active"]}, "user-1"
+        )
+
+        # Session request tidak dipakai lagi setelah job bisa diambil worker
+        assert calls == ["get_job", "submit"]
+
+        assert result["status"] == ExportJobStatusEnum.QUEUED.value
+        assert result["download_url"] is None
+        exporter.export.assert_called_once_with(export_format=ExportFormatEnum.CSV, filters=["status=active"])
+        runner.check.assert_called_once_with()
+        runner.submit.assert_called_once()
+        mock_repository.count_active.assert_awaited_once_with("user-1")
+        created = mock_repository.create.call_args.args[0]
+        assert created["params"] == {"filters": ["status=active"]}
+        assert created["worker_id"] == export_job_service.WORKER_ID
+        assert created["updated_at"] is not None
+
+    @pytest.mark.asyncio
+    async def test_create_job_rejected_before_insert(self, service, mock_repository, runner):
+        mock_repository.create = AsyncMock()
+        runner.check.side_effect = ServiceUnavailableException("queue full")
+
+        with pytest.raises(ServiceUnavailableException):
+            await service.create_job({"resource": "businesses"}, "user-1")
+
+        mock_repository.create.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_per_user_limit_counted_from_table(self, service, mock_repository, monkeypatch):
+        monkeypatch.setattr("app.services.export_job_service.settings.EXPORT_MAX_JOBS_PER_USER", 2)
+        mock_repository.create = AsyncMock()
+        # Job aktif user bisa berada di worker lain, jadi dihitung dari export_jobs
+        mock_repository.count_active = AsyncMock(return_value=2)
+
+        with pytest.raises(TooManyRequestsException):
+            await service.create_job({"resource": "businesses"}, "user-1")
+
+        mock_repository.create.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_submit_failure_after_insert_marks_job_failed(self, service, mock_repository, runner):
+        mock_repository.create = AsyncMock(return_value=self.job())
+        mock_repository.find_by_id = AsyncMock(return_value=self.job())
+        runner.submit.side_effect = ServiceUnavailableException("Export queue is full, try again later")
+
+        with pytest.raises(ServiceUnavailableException):
+            await service.create_job({"resource": "businesses"}, "user-1")
+
+        job_id, worker_id, status = mock_repository.set_status.call_args.args
+        assert (job_id, worker_id, status) == ("job-1", export_job_service.WORKER_ID, ExportJobStatusEnum.FAILED)
+        assert mock_repository.set_status.call_args.kwargs["error"] == "Export queue is full, try again later"
+
+    @pytest.mark.asyncio
+    async def test_run_uploads_and_completes(self, service, mock_repository, job_repository, mock_minio, exporter):
+        session = Mock()
+        with patch("app.services.export_job_service.db", Mock(side_effect=nullcontext, session=session)):
+            await service._run("job-1", "businesses", ExportFormatEnum.CSV, exporter.export())
+
+        upload = mock_minio.upload_file.call_args.kwargs
+        assert upload["object_name"] == "exports/job-1.csv"
+        assert upload["content_length"] == 10
+        assert upload["file_data"].closed
+        # Status dicatat lewat session job, bukan session request yang membuat service
+        mock_repository.with_session.assert_called_once_with(session)
+        mock_repository.set_status.assert_not_called()
+        statuses = [call.args[2] for call in job_repository.set_status.call_args_list]
+        assert statuses == [ExportJobStatusEnum.RUNNING, ExportJobStatusEnum.COMPLETED]
+        assert job_repository.set_status.call_args.kwargs["size"] == 10
+
+    @pytest.mark.asyncio
+    async def test_run_skips_job_failed_while_queued(self, service, job_repository, mock_minio, exporter):
+        # Job sudah ditandai failed (heartbeat basi) sebelum worker mengambilnya
+        job_repository.set_status.return_value = False
+
+        with patch("app.services.export_job_service.db", Mock(side_effect=nullcontext, session=Mock())):
+            await service._run("job-1", "businesses", ExportFormatEnum.CSV, exporter.export())
+
+        job_repository.set_status.assert_awaited_once()
+        mock_minio.upload_file.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_run_marks_failed(self, service, job_repository, mock_minio, exporter):
+        mock_minio.upload_file.side_effect = RuntimeError("minio down")
+
+        with (
+            patch("app.services.export_job_service.db", Mock(side_effect=nullcontext, session=Mock())),
+            pytest.raises(RuntimeError),
+        ):
+            await service._run("job-1", "businesses", ExportFormatEnum.CSV, exporter.export())
+
+        assert job_repository.set_status.call_args.args[2] == ExportJobStatusEnum.FAILED
+        assert job_repository.set_status.call_args.kwargs["error"] == "minio down"
+
+    @pytest.mark.asyncio
+    async def test_get_job_completed_has_download_url(self, service, mock_repository, mock_minio):
+        mock_repository.find_by_id = AsyncMock(
+            return_value=self.job(status="completed", object_name="exports/job-1.csv", size=10)
+        )
+
+        result = await service.get_job("job-1", "user-1")
+
+        assert result["download_url"] == "http://minio/bucket/exports/job-1.csv?X-Amz-Signature=x"
+        mock_minio.get_presigned_url.assert_awaited_once_with(
+            "exports/job-1.csv", filename="businesses.csv", content_type="text/csv; charset=utf-8"
+        )
+
+    @pytest.mark.asyncio
+    async def test_get_job_of_other_user_not_found(self, service, mock_repository):
+        mock_repository.find_by_id = AsyncMock(return_value=self.job(user_id="someone-else"))
+
+        with pytest.raises(NotFoundException):
+            await service.get_job("job-1", "user-1")
+
+    @pytest.mark.asyncio
+    async def test_heartbeat_fails_only_stale_jobs(self, monkeypatch):
+        monkeypatch.setattr("app.services.export_job_service.settings.EXPORT_JOB_STALE_AFTER", 180)
+        repository = Mock(spec=ExportJobRepository)
+        repository.touch = AsyncMock(return_value=1)
+        repository.fail_stale = AsyncMock(return_value=3)
+
+        with (
+            patch.object(export_job_service, "db", nullcontext),
+            patch.object(export_job_service, "ExportJobRepository", return_value=repository),
+        ):
+            assert await export_job_service.export_jobs_heartbeat() == 3
+
+        worker_id, now = repository.touch.call_args.args
+        assert worker_id == export_job_service.WORKER_ID
+        stale_before, error, finished_at = repository.fail_stale.call_args.args
+        assert now - stale_before == timedelta(seconds=180)
+        assert finished_at == now
+        assert "worker" in error
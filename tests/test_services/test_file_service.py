@@ -0,0 +1,743 @@
+import asyncio
+import base64
+import hashlib
+import io
+import tempfile
+import zipfile
+from datetime import datetime
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+import pytest_asyncio
+from fastapi import HTTPException, UploadFile
+from miniopy_async import Minio
+from starlette.datastructures import Headers
+
+from app.core.minio_client import MinioClient, PresignedUrlCache, get_minio_client
+from app.core.minio_compat import multipart_api_mismatches
+from app.core.minio_transfer import (
+    PART_SIZE_METADATA,
+    ChecksumMismatchError,
+    MultipartTransfer,
+    multipart_etag,
+)
+from app.models import FileBlobModel, FileModel
+from app.repositories import FileRepository
+from app.services import FileService
+from app.services.image_processor import render_webp
+from app.utils.zip_stream import ZipMember, stream_zip
+
+PART_SIZE = 64
+
+
+def blob(object_name: str) -> FileBlobModel:
+    return Mock(spec=FileBlobModel, object_name=object_name)
+
+
+def make_upload(content: bytes, filename: str = "laporan.pdf", known_size: bool = False) -> UploadFile:
+    spool = tempfile.SpooledTemporaryFile(max_size=16)
+    spool.write(content)
+    spool.seek(0)
+    return UploadFile(
+        spool,
+        size=len(content) if known_size else None,
+        filename=filename,
+        headers=Headers({"content-type": "application/pdf"}),
+    )
+
+
+class TestFileService:
+    """Test cases for FileService streaming upload."""
+
+    @pytest.fixture
+    def mock_repository(self):
+        mock_repo = Mock(spec=FileRepository)
+        mock_repo.add_reference = AsyncMock(return_value=None)
+        mock_repo.create_blob = AsyncMock(side_effect=lambda content_hash, object_name: blob(object_name))
+        mock_repo.session = Mock(rollback=AsyncMock())
+        return mock_repo
+
+    @pytest.fixture
+    def mock_minio(self):
+        minio = Mock(spec=MinioClient)
+        minio.parts = []
+
+        async def upload_file(file_data, content_length, **kwargs):
+            # Meniru put_object: baca per part sampai EOF
+            while chunk := await file_data.read(PART_SIZE):
+                minio.parts.append(len(chunk))
+            return f"http://minio/sips/{kwargs['object_name']}"
+
+        minio.upload_file = AsyncMock(side_effect=upload_file)
+        minio.get_file_url = AsyncMock(side_effect=lambda object_name: f"http://minio/sips/{object_name}")
+        minio.delete_file = AsyncMock()
+        return minio
+
+    @pytest.fixture
+    def service(self, mock_repository, mock_minio):
+        service = FileService(mock_repository, mock_minio)
+        service.create = AsyncMock(side_effect=lambda data: Mock(spec=FileModel, **data))
+        return service
+
+    @pytest.mark.asyncio
+    async def test_upload_streams_in_parts(self, service, mock_minio, monkeypatch):
+        monkeypatch.setattr("app.services.file_service.settings.MAX_UPLOAD_SIZE", 1000)
+
+        result = await service.upload_file(make_upload(b"x" * 200), user_id="user-1")
+
+        digest = hashlib.sha256(b"x" * 200).hexdigest()
+        assert result.size == 200
+        assert result.content_hash == digest
+        assert result.object_name == f"{digest}.pdf"
+        assert mock_minio.upload_file.call_args.kwargs["content_length"] == 200
+        assert "metadata" not in mock_minio.upload_file.call_args.kwargs
+        assert max(mock_minio.parts) <= PART_SIZE
+        assert sum(mock_minio.parts) == 200
+
+    @pytest.mark.asyncio
+    async def test_download_name_from_callers_own_row(self, service, mock_repository):
+        mock_repository.find_by_object_name_for_user = AsyncMock(
+            return_value=Mock(spec=FileModel, filename="milik-saya.pdf", content_type="application/pdf")
+        )
+
+        assert await service.get_download_name("abc.pdf", "abc.pdf", "user-1") == (
+            "milik-saya.pdf",
+            "application/pdf",
+        )
+        mock_repository.find_by_object_name_for_user.assert_awaited_once_with("abc.pdf", "user-1")
+
+    @pytest.mark.asyncio
+    async def test_download_name_hides_other_uploaders(self, service, mock_repository):
+        mock_repository.find_by_object_name_for_user = AsyncMock(return_value=None)
+
+        assert await service.get_download_name("abc.pdf", "abc.pdf", "user-2") == ("abc.pdf", None)
+        assert await service.get_download_name("abc.pdf", "abc.pdf", None) == ("abc.pdf", None)
+        mock_repository.find_by_object_name_for_user.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_download_name_of_derivative(self, service, mock_repository):
+        mock_repository.find_by_object_name_for_user = AsyncMock(
+            return_value=Mock(spec=FileModel, filename="sampul.jpg", content_type="image/jpeg")
+        )
+
+        assert await service.get_download_name("abc.jpg", "derived/abc.jpg/w320.webp", "user-1") == (
+            "sampul.webp",
+            None,
+        )
+
+    @pytest.mark.asyncio
+    async def test_upload_over_limit_stops_reading(self, service, mock_minio, monkeypatch):
+        monkeypatch.setattr("app.services.file_service.settings.MAX_UPLOAD_SIZE", 100)
+
+        with pytest.raises(HTTPException) as exc:
+            await service.upload_file(make_upload(b"x" * 1000))
+
+        assert exc.value.status_code == 413
+        mock_minio.upload_file.assert_not_called()
+        service.create.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_duplicate_content_not_uploaded_again(self, service, mock_repository, mock_minio):
+        digest = hashlib.sha256(b"sama").hexdigest()
+        mock_repository.add_reference.return_value = blob(f"{digest}.pdf")
+
+        result = await service.upload_file(make_upload(b"sama", filename="catatan.PDF"), "milik user-2", "user-2")
+
+        # Upload kedua tetap punya row sendiri yang menunjuk ke objek yang sama
+        assert result.filename == "catatan.PDF"
+        assert result.description == "milik user-2"
+        assert result.user_id == "user-2"
+        assert result.object_name == f"{digest}.pdf"
+        assert result.url == f"http://minio/sips/{digest}.pdf"
+        mock_repository.add_reference.assert_awaited_once_with(digest)
+        mock_minio.upload_file.assert_not_called()
+        mock_repository.create_blob.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_parallel_upload_of_same_content_reuses_blob(self, service, mock_repository, mock_minio):
+        digest = hashlib.sha256(b"sama").hexdigest()
+        mock_repository.add_reference.side_effect = [None, blob(f"{digest}.pdf")]
+        mock_repository.create_blob = AsyncMock(return_value=None)
+
+        result = await service.upload_file(make_upload(b"sama", filename="sama.docx"), user_id="user-2")
+
+        assert result.object_name == f"{digest}.pdf"
+        mock_minio.delete_file.assert_awaited_once_with(f"{digest}.docx")
+
+    @pytest.mark.asyncio
+    async def test_failed_insert_rolls_back_reference(self, service, mock_repository):
+        mock_repository.add_reference.return_value = blob("abc.pdf")
+        service.create.side_effect = RuntimeError("db down")
+
+        with pytest.raises(HTTPException) as exc:
+            await service.upload_file(make_upload(b"sama"))
+
+        assert exc.value.status_code == 500
+        mock_repository.session.rollback.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_delete_removes_object_only_on_last_reference(self, service, mock_repository, mock_minio):
+        file_model = Mock(spec=FileModel, id=1, user_id="user-1", object_name="abc.pdf")
+        service.find_by_id = AsyncMock(return_value=file_model)
+        mock_minio.delete_file = AsyncMock()
+        mock_minio.list_files = AsyncMock(return_value=[{"name": "derived/abc.pdf/w320.webp"}])
+
+        async def release_reference(id, on_last):
+            await on_last(file_model.object_name)
+            return True
+
+        mock_repository.release_reference = AsyncMock(side_effect=release_reference)
+
+        assert await service.delete_file_with_content("1", "user-1")
+        assert [c.args[0] for c in mock_minio.delete_file.await_args_list] == ["abc.pdf", "derived/abc.pdf/w320.webp"]
+        mock_minio.list_files.assert_awaited_once_with(prefix="derived/abc.pdf/")
+
+    @pytest.mark.asyncio
+    async def test_delete_by_other_user_forbidden(self, service, mock_repository):
+        service.find_by_id = AsyncMock(return_value=Mock(spec=FileModel, id=1, user_id="user-1"))
+        mock_repository.release_reference = AsyncMock()
+
+        with pytest.raises(HTTPException) as exc:
+            await service.delete_file_with_content("1", "user-2")
+
+        assert exc.value.status_code == 403
+        mock_repository.release_reference.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_upload_with_known_size_rejected_before_transfer(self, service, mock_minio, monkeypatch):
+        monkeypatch.setattr("app.services.file_service.settings.MAX_UPLOAD_SIZE", 100)
+
+        with pytest.raises(HTTPException) as exc:
+            await service.upload_file(make_upload(b"x" * 1000, known_size=True))
+
+        assert exc.value.status_code == 413
+        mock_minio.upload_file.assert_not_called()
+
+
+class FakeMinio:
+    """Bucket di memori dengan API multipart internal miniopy."""
+
+    def __init__(self, fail_parts=None, corrupt_etag=False):
+        self.objects = {}
+        self.uploads = {}
+        self.headers = {}
+        self.fail_parts = dict(fail_parts or {})
+        self.corrupt_etag = corrupt_etag
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.aborted = False
+
+    async def _put_object(self, bucket_name, object_name, data, headers, query_params=None):
+        assert base64.b64decode(headers["Content-MD5"]) == hashlib.md5(data).digest()
+        self.objects[object_name] = (data, hashlib.md5(data).hexdigest())
+        return SimpleNamespace(etag=self.objects[object_name][1])
+
+    async def _create_multipart_upload(self, bucket_name, object_name, headers):
+        self.uploads["u1"] = {}
+        self.headers[object_name] = headers
+        return "u1"
+
+    async def _upload_part(self, bucket_name, object_name, data, headers, upload_id, part_number):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(0.01)
+            if self.fail_parts.get(part_number):
+                self.fail_parts[part_number] -= 1
+                raise ConnectionError("reset")
+            self.uploads[upload_id][part_number] = data
+            return "0" * 32 if self.corrupt_etag else hashlib.md5(data).hexdigest()
+        finally:
+            self.in_flight -= 1
+
+    async def _complete_multipart_upload(self, bucket_name, object_name, upload_id, parts):
+        assert [part.part_number for part in parts] == sorted(self.uploads[upload_id])
+        chunks = [self.uploads[upload_id][part.part_number] for part in parts]
+        etag = multipart_etag([hashlib.md5(chunk).digest() for chunk in chunks])
+        self.objects[object_name] = (b"".join(chunks), etag)
+        return SimpleNamespace(etag=etag)
+
+    async def _abort_multipart_upload(self, bucket_name, object_name, upload_id):
+        self.aborted = True
+
+    async def get_object(self, bucket_name, object_name, offset=0, length=0):
+        data = self.objects[object_name][0][offset : offset + length]
+        return SimpleNamespace(read=AsyncMock(return_value=data), release=AsyncMock())
+
+
+class TestMultipartTransfer:
+    """Test cases for the parallel multipart transfer engine."""
+
+    def transfer(self, client, **kwargs):
+        return MultipartTransfer(client, "sips", part_size=PART_SIZE, concurrency=3, retries=2, **kwargs)
+
+    @pytest.mark.asyncio
+    async def test_upload_parts_concurrently_and_download_in_order(self):
+        client = FakeMinio(fail_parts={2: 1})
+        transfer = self.transfer(client)
+        payload = bytes(range(256)) * 3
+
+        etag = await transfer.upload(io.BytesIO(payload), "big.bin", "application/octet-stream")
+
+        assert client.objects["big.bin"] == (payload, etag)
+        assert etag.endswith("-12")
+        assert 1 < client.max_in_flight <= 3
+        assert client.headers["big.bin"][PART_SIZE_METADATA] == str(PART_SIZE)
+
+        chunks = [
+            chunk async for chunk in transfer.download("big.bin", len(payload), etag=etag, upload_part_size=PART_SIZE)
+        ]
+        assert b"".join(chunks) == payload
+
+    @pytest.mark.asyncio
+    async def test_upload_buffers_at_most_concurrency_parts(self):
+        client = FakeMinio()
+        payload = io.BytesIO(b"x" * PART_SIZE * 10)
+        reads, buffered = [], []
+
+        def read(size):
+            chunk = payload.read(size)
+            if chunk:
+                reads.append(chunk)
+                # Part yang sudah dibaca tapi belum selesai diupload
+                buffered.append(len(reads) - len(client.uploads.get("u1", {})))
+            return chunk
+
+        await self.transfer(client).upload(SimpleNamespace(read=read), "big.bin", "application/octet-stream")
+
+        assert len(client.uploads["u1"]) == 10
+        assert max(buffered) == 3
+
+    def test_multipart_api_signatures(self):
+        # Method privat miniopy_async yang dipakai MultipartApi, juga FakeMinio di test ini
+        assert multipart_api_mismatches(Minio) == []
+        assert multipart_api_mismatches(FakeMinio) == []
+
+    @pytest.mark.asyncio
+    async def test_small_object_single_put(self):
+        client = FakeMinio()
+
+        etag = await self.transfer(client).upload(io.BytesIO(b"kecil"), "small.txt", "text/plain")
+
+        assert etag == hashlib.md5(b"kecil").hexdigest()
+        assert "u1" not in client.uploads
+
+    @pytest.mark.asyncio
+    async def test_part_failing_after_retries_aborts_upload(self):
+        client = FakeMinio(fail_parts={3: 5})
+
+        with pytest.raises(ConnectionError):
+            await self.transfer(client).upload(io.BytesIO(b"x" * PART_SIZE * 5), "big.bin", "text/plain")
+
+        assert client.aborted
+        assert "big.bin" not in client.objects
+
+    @pytest.mark.asyncio
+    async def test_etag_mismatch_detected(self):
+        client = FakeMinio(corrupt_etag=True)
+
+        with pytest.raises(ChecksumMismatchError):
+            await self.transfer(client).upload(io.BytesIO(b"x" * PART_SIZE * 2), "big.bin", "text/plain")
+
+        assert client.aborted
+
+    @pytest.mark.asyncio
+    async def test_download_range_and_checksum(self):
+        client = FakeMinio()
+        client.objects["f.bin"] = (b"a" * 200, "0" * 32)
+        transfer = self.transfer(client)
+
+        ranged = [chunk async for chunk in transfer.download("f.bin", 200, etag="0" * 32, offset=50, length=100)]
+        assert b"".join(ranged) == b"a" * 100
+
+        with pytest.raises(ChecksumMismatchError):
+            async for _ in transfer.download("f.bin", 200, etag="0" * 32):
+                pass
+
+    @pytest.mark.asyncio
+    async def test_multipart_etag_checked_with_upload_part_size(self):
+        client = FakeMinio()
+        payload = bytes(range(250))
+        await MultipartTransfer(client, "sips", part_size=100).upload(io.BytesIO(payload), "big.bin", "text/plain")
+        etag = client.objects["big.bin"][1]
+        # Ukuran part download transfer ini (64) berbeda dengan saat upload (100)
+        transfer = self.transfer(client)
+
+        chunks = [chunk async for chunk in transfer.download("big.bin", 250, etag=etag, upload_part_size=100)]
+        assert b"".join(chunks) == payload
+
+        # Jumlah part sama (3) tetapi ukuran part berbeda: harus terdeteksi tidak cocok
+        with pytest.raises(ChecksumMismatchError):
+            async for _ in transfer.download("big.bin", 250, etag=etag, upload_part_size=90):
+                pass
+
+    @pytest.mark.asyncio
+    async def test_multipart_etag_skipped_without_upload_part_size(self):
+        client = FakeMinio()
+        client.objects["f.bin"] = (b"a" * 200, "0" * 32 + "-4")
+
+        chunks = [chunk async for chunk in self.transfer(client).download("f.bin", 200, etag="0" * 32 + "-4")]
+
+        assert b"".join(chunks) == b"a" * 200
+
+
+class TestPresignedUrl:
+    """Test cases for presigned URL generation and caching."""
+
+    @pytest.fixture
+    def cache(self, monkeypatch):
+        cache = PresignedUrlCache(max_size=2, margin=60)
+        monkeypatch.setattr("app.core.minio_client.presigned_url_cache", cache)
+        return cache
+
+    @pytest.fixture
+    def minio_client(self, cache):
+        minio_client = MinioClient.__new__(MinioClient)
+        minio_client.bucket_name = "sips"
+        minio_client.client = Mock()
+        minio_client.client.stat_object = AsyncMock(
+            return_value=SimpleNamespace(
+                _content_type="application/pdf", _metadata={"x-amz-meta-filename": "lain.pdf"}
+            )
+        )
+        minio_client.client.presigned_get_object = AsyncMock(
+            side_effect=lambda **kwargs: f"url-{kwargs['object_name']}"
+        )
+        return minio_client
+
+    @pytest.mark.asyncio
+    async def test_presigned_url_cached(self, minio_client):
+        first = await minio_client.get_presigned_url("a.pdf", filename="laporan.pdf", content_type="application/pdf")
+        second = await minio_client.get_presigned_url("a.pdf", filename="laporan.pdf", content_type="application/pdf")
+
+        assert first == second == "url-a.pdf"
+        minio_client.client.presigned_get_object.assert_awaited_once()
+        minio_client.client.stat_object.assert_not_called()
+        response_headers = minio_client.client.presigned_get_object.call_args.kwargs["response_headers"]
+        assert response_headers["response-content-disposition"] == 'attachment; filename="laporan.pdf"'
+        assert response_headers["response-content-type"] == "application/pdf"
+
+    @pytest.mark.asyncio
+    async def test_presigned_url_ignores_blob_filename(self, minio_client, cache):
+        await minio_client.get_presigned_url("a.pdf", filename="laporan.pdf")
+        await minio_client.get_presigned_url("a.pdf")
+
+        # Nama dari pemanggil / nama objek, bukan metadata pengupload pertama; varian di-cache terpisah
+        dispositions = [
+            call.kwargs["response_headers"]["response-content-disposition"]
+            for call in minio_client.client.presigned_get_object.await_args_list
+        ]
+        assert dispositions == ['attachment; filename="laporan.pdf"', 'attachment; filename="a.pdf"']
+        cache.invalidate("a.pdf")
+        assert cache.get("a.pdf", "laporan.pdf\nNone") is None
+
+    @pytest.mark.asyncio
+    async def test_presigned_url_refreshed_before_expiry(self, minio_client, cache, monkeypatch):
+        await minio_client.get_presigned_url("a.pdf")
+        monkeypatch.setattr("app.core.minio_client.time.monotonic", lambda: float("inf"))
+
+        await minio_client.get_presigned_url("a.pdf")
+
+        assert minio_client.client.presigned_get_object.await_count == 2
+
+    def test_cache_bounded_and_invalidated(self, cache):
+        cache.set("a", "url-a", 900)
+        cache.set("b", "url-b", 900)
+        cache.get("a")
+        cache.set("c", "url-c", 900)
+
+        assert cache.get("b") is None
+        assert cache.get("a") == "url-a"
+        cache.invalidate("a")
+        assert cache.get("a") is None
+
+
+class TestMinioClientBucket:
+    """Test cases for bucket bootstrap and the shared client."""
+
+    @pytest_asyncio.fixture
+    async def minio_client(self):
+        minio_client = MinioClient()
+        minio_client.client = Mock()
+        minio_client.client.bucket_exists = AsyncMock(return_value=True)
+        minio_client.client.set_session = Mock()
+        minio_client.transfer = Mock(upload=AsyncMock(return_value="etag"))
+        yield minio_client
+        # Session aiohttp yang dibuat startup() diserahkan ke client mock, tutup di sini
+        for call in minio_client.client.set_session.call_args_list:
+            await call.args[0].close()
+
+    @pytest.mark.asyncio
+    async def test_bucket_checked_once_at_startup(self, minio_client):
+        await minio_client.startup()
+        for _ in range(3):
+            await minio_client.upload_file(io.BytesIO(b"x"), "a.txt", "text/plain", 1)
+
+        minio_client.client.bucket_exists.assert_awaited_once()
+        minio_client.client.set_session.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_startup_tolerates_unreachable_minio(self, minio_client):
+        minio_client.client.bucket_exists.side_effect = [ConnectionError("refused"), True]
+
+        await minio_client.startup()
+        await minio_client.upload_file(io.BytesIO(b"x"), "a.txt", "text/plain", 1)
+
+        assert minio_client.client.bucket_exists.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_download_uses_recorded_part_size(self, minio_client):
+        minio_client.transfer.download = Mock()
+        object_info = {"_size": 10, "_etag": "abc-2", "_metadata": {PART_SIZE_METADATA: "5"}}
+
+        await minio_client.download_file("a.bin", object_info=object_info)
+        await minio_client.download_file("b.bin", object_info={**object_info, "_metadata": {}})
+
+        first, second = minio_client.transfer.download.call_args_list
+        assert first.kwargs["upload_part_size"] == 5
+        assert second.kwargs["upload_part_size"] is None
+
+    def test_shared_client(self):
+        assert get_minio_client() is get_minio_client()
+
+
+class TestImageDerivative:
+    """Test cases for lazily generated WebP derivatives (?w=)."""
+
+    ORIGINAL_INFO = {
+        "_size": 4,
+        "_etag": "orig",
+        "_content_type": "image/jpeg",
+        "_metadata": {},
+    }
+
+    @pytest.fixture
+    def processor(self, monkeypatch):
+        processor = SimpleNamespace(available=True, to_webp=AsyncMock(return_value=b"webp"))
+        monkeypatch.setattr("app.services.file_service.image_processor", processor)
+        return processor
+
+    @pytest.fixture
+    def mock_minio(self):
+        minio = Mock(spec=MinioClient)
+        minio.objects = {"abc.jpg": self.ORIGINAL_INFO}
+
+        async def stat_file(object_name):
+            await asyncio.sleep(0)
+            if object_name not in minio.objects:
+                raise HTTPException(status_code=404, detail="File not found")
+            return minio.objects[object_name]
+
+        async def download_file(object_name, object_info=None):
+            async def content():
+                yield b"jpeg"
+
+            return content(), object_info
+
+        async def upload_file(file_data, object_name, content_type, content_length, metadata):
+            minio.objects[object_name] = {"_size": content_length, "_content_type": content_type}
+            return f"http://minio/sips/{object_name}"
+
+        minio.stat_file = AsyncMock(side_effect=stat_file)
+        minio.download_file = AsyncMock(side_effect=download_file)
+        minio.upload_file = AsyncMock(side_effect=upload_file)
+        minio.get_file_url = AsyncMock(side_effect=lambda object_name: f"http://minio/sips/{object_name}")
+        minio.delete_file = AsyncMock()
+        return minio
+
+    @pytest.fixture
+    def service(self, mock_minio):
+        return FileService(Mock(spec=FileRepository), mock_minio)
+
+    @pytest.mark.asyncio
+    async def test_derivative_rendered_once_and_cached(self, service, mock_minio, processor):
+        results = await asyncio.gather(*(service.get_image_derivative("abc.jpg", 320) for _ in range(3)))
+
+        assert {name for name, _ in results} == {"derived/abc.jpg/w320.webp"}
+        processor.to_webp.assert_awaited_once_with(b"jpeg", 320)
+        mock_minio.upload_file.assert_awaited_once()
+        assert mock_minio.upload_file.call_args.kwargs["metadata"] == {"source": "abc.jpg"}
+
+        name, info = await service.get_image_derivative("abc.jpg", 320)
+        assert info["_content_type"] == "image/webp"
+        assert processor.to_webp.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_unsupported_width_rejected(self, service, processor):
+        with pytest.raises(HTTPException) as exc:
+            await service.get_image_derivative("abc.jpg", 321)
+
+        assert exc.value.status_code == 400
+
+    @pytest.mark.asyncio
+    async def test_non_image_served_as_is(self, service, mock_minio, processor):
+        mock_minio.objects["laporan.pdf"] = {**self.ORIGINAL_INFO, "_content_type": "application/pdf"}
+
+        name, info = await service.get_image_derivative("laporan.pdf", 320)
+
+        assert name == "laporan.pdf"
+        processor.to_webp.assert_not_called()
+        mock_minio.upload_file.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_broken_image_served_as_is(self, service, mock_minio, processor):
+        processor.to_webp.side_effect = OSError("cannot identify image file")
+
+        name, _ = await service.get_image_derivative("abc.jpg", 320)
+
+        assert name == "abc.jpg"
+        mock_minio.upload_file.assert_not_called()
+
+    def test_render_webp_keeps_aspect_ratio(self):
+        Image = pytest.importorskip("PIL.Image")
+        source = io.BytesIO()
+        Image.new("RGB", (1000, 500), "green").save(source, format="JPEG")
+
+        with Image.open(io.BytesIO(render_webp(source.getvalue(), 320, 80))) as image:
+            assert image.format == "WEBP"
+            assert image.size == (320, 160)
+
+        with Image.open(io.BytesIO(render_webp(source.getvalue(), 1280, 80))) as image:
+            assert image.size == (1000, 500)
+
+
+class TestZipDownload:
+    """Test cases for streaming ZIP downloads."""
+
+    @staticmethod
+    def source(name, chunks, produced=None):
+        async def content():
+            for chunk in chunks:
+                if produced is not None:
+                    produced.append(name)
+                yield chunk
+
+        async def fetch():
+            return ZipMember(name, sum(map(len, chunks)), datetime(2026, 10, 1, 8, 30), content())
+
+        return fetch
+
+    @staticmethod
+    async def collect(stream):
+        return b"".join([chunk async for chunk in stream])
+
+    @staticmethod
+    async def download_file(object_name):
+        async def content():
+            yield b"isi"
+
+        return content(), {"_size": 3, "_last_modified": None, "_metadata": {}}
+
+    @pytest.mark.asyncio
+    async def test_zip_contents_in_order_with_unique_names(self):
+        sources = [
+            self.source("laporan.pdf", [b"a" * 10, b"b" * 5]),
+            self.source("../laporan.pdf", [b"c"]),
+            self.source("kosong.txt", []),
+        ]
+
+        data = await self.collect(stream_zip(sources, concurrency=2))
+
+        with zipfile.ZipFile(io.BytesIO(data)) as archive:
+            assert archive.namelist() == ["laporan.pdf", "laporan (1).pdf", "kosong.txt"]
+            assert archive.read("laporan.pdf") == b"a" * 10 + b"b" * 5
+            assert archive.read("laporan (1).pdf") == b"c"
+            assert archive.read("kosong.txt") == b""
+            assert archive.testzip() is None
+
+    @pytest.mark.asyncio
+    async def test_read_ahead_is_bounded(self):
+        produced = []
+        sources = [self.source(name, [b"x"] * 20, produced) for name in ("a", "b", "c")]
+        stream = stream_zip(sources, concurrency=2, read_ahead=2)
+
+        await stream.__anext__()
+        await asyncio.sleep(0.01)
+
+        # File pertama baru satu chunk terkirim; file berikutnya hanya boleh mendahului read_ahead chunk
+        assert produced.count("b") <= 3
+        assert "c" not in produced
+        await stream.aclose()
+
+    @pytest.mark.asyncio
+    async def test_source_error_propagates(self):
+        async def broken():
+            raise HTTPException(status_code=404, detail="File not found")
+
+        with pytest.raises(HTTPException):
+            await self.collect(stream_zip([self.source("a.txt", [b"a"]), broken]))
+
+    @pytest.mark.asyncio
+    async def test_zip_by_ids_uses_database_filenames(self):
+        repository = Mock(spec=FileRepository)
+        repository.find_by_ids = AsyncMock(
+            return_value=[Mock(spec=FileModel, id=1, object_name="abc.pdf", filename="laporan.pdf")]
+        )
+        minio = Mock(spec=MinioClient)
+        minio.download_file = AsyncMock(side_effect=self.download_file)
+        service = FileService(repository, minio)
+
+        data = await self.collect(await service.get_zip_content("user-1", ids=[1, 1]))
+
+        with zipfile.ZipFile(io.BytesIO(data)) as archive:
+            assert archive.namelist() == ["laporan.pdf"]
+        repository.find_by_ids.assert_awaited_once_with([1, 1], "user-1")
+        minio.download_file.assert_awaited_once_with("abc.pdf")
+
+    @pytest.mark.asyncio
+    async def test_zip_missing_ids_rejected_before_streaming(self):
+        repository = Mock(spec=FileRepository)
+        repository.find_by_ids = AsyncMock(return_value=[])
+        service = FileService(repository, Mock(spec=MinioClient))
+
+        with pytest.raises(HTTPException) as exc:
+            await service.get_zip_content("user-1", ids=[7])
+
+        assert exc.value.status_code == 404
+
+    @pytest.mark.asyncio
+    async def test_zip_by_ids_rejects_other_users_files(self):
+        repository = Mock(spec=FileRepository)
+        # Repository hanya mengembalikan row milik pemanggil: id 2 milik pengguna lain
+        repository.find_by_ids = AsyncMock(
+            return_value=[Mock(spec=FileModel, id=1, object_name="abc.pdf", filename="laporan.pdf")]
+        )
+        minio = Mock(spec=MinioClient)
+        service = FileService(repository, minio)
+
+        with pytest.raises(HTTPException) as exc:
+            await service.get_zip_content("user-1", ids=[1, 2])
+
+        assert exc.value.status_code == 404
+        assert exc.value.detail == "File tidak ditemukan: 2"
+        minio.download_file.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_zip_by_prefix_only_includes_own_files(self, monkeypatch):
+        monkeypatch.setattr("app.services.file_service.settings.ZIP_MAX_FILES", 10)
+        repository = Mock(spec=FileRepository)
+        repository.find_by_user_and_prefix = AsyncMock(
+            return_value=[Mock(spec=FileModel, id=1, object_name="ab12.pdf", filename="laporan.pdf")]
+        )
+        minio = Mock(spec=MinioClient)
+        minio.download_file = AsyncMock(side_effect=self.download_file)
+        service = FileService(repository, minio)
+
+        data = await self.collect(await service.get_zip_content("user-1", prefix="ab"))
+
+        with zipfile.ZipFile(io.BytesIO(data)) as archive:
+            assert archive.namelist() == ["laporan.pdf"]
+        repository.find_by_user_and_prefix.assert_awaited_once_with("user-1", "ab", limit=11)
+        minio.list_files.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_zip_by_prefix_without_own_files(self):
+        repository = Mock(spec=FileRepository)
+        repository.find_by_user_and_prefix = AsyncMock(return_value=[])
+        service = FileService(repository, Mock(spec=MinioClient))
+
+        with pytest.raises(HTTPException) as exc:
+            await service.get_zip_content("user-2", prefix="")
+
+        assert exc.value.status_code == 404
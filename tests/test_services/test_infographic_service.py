@@ -0,0 +1,120 @@
+import asyncio
+import time
+from contextlib import nullcontext
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+
+from app.repositories import InfographicRepository
+from app.services import InfographicService
+from app.services.infographic_store import SECTIONS, InfographicStore
+
+
+class TestInfographicService:
+    """Test cases for InfographicService snapshot store."""
+
+    @pytest.fixture
+    def mock_repository(self):
+        mock_repo = Mock(spec=InfographicRepository)
+        for method_name, _ in SECTIONS.values():
+            setattr(mock_repo, method_name, AsyncMock(return_value=[{"method": method_name}]))
+        return mock_repo
+
+    @pytest.fixture
+    def store(self):
+        return InfographicStore(refresh_interval=60, query_timeout=0.5, debounce=0, session_scope=nullcontext)
+
+    @pytest.fixture
+    def service(self, mock_repository, store):
+        return InfographicService(mock_repository, store=store)
+
+    @pytest.mark.asyncio
+    async def test_get_all_serves_from_snapshot(self, service, mock_repository):
+        first = await service.get_all()
+        second = await service.get_all()
+
+        assert list(first) == list(SECTIONS)
+        assert first == second
+        assert first["farmer_incomes"] == [{"method": "get_farmer_incomes"}]
+        for method_name, _ in SECTIONS.values():
+            getattr(mock_repository, method_name).assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_invalidate_refreshes_only_dependent_sections(self, service, store, mock_repository):
+        await service.get_all()
+
+        sections = store.invalidate("pendapatan")
+        await service.get_all()
+
+        assert sections == {"farmer_incomes"}
+        assert mock_repository.get_farmer_incomes.await_count == 2
+        assert mock_repository.get_summary_infographic.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_dirty_section_served_stale_while_scheduler_runs(self, service, store, mock_repository, monkeypatch):
+        await service.get_summary_infographic()
+        monkeypatch.setattr(InfographicStore, "running", property(lambda self: True))
+
+        store.invalidate("businesses")
+        mock_repository.get_summary_infographic.return_value = {"ps_groups": 2}
+
+        assert await service.get_summary_infographic() == [{"method": "get_summary_infographic"}]
+        assert mock_repository.get_summary_infographic.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_get_all_fans_out_concurrently(self, service, mock_repository):
+        async def slow_query():
+            await asyncio.sleep(0.1)
+            return []
+
+        for method_name, _ in SECTIONS.values():
+            getattr(mock_repository, method_name).side_effect = slow_query
+
+        started = time.perf_counter()
+        result = await service.get_all()
+
+        assert time.perf_counter() - started < 0.5
+        assert all(value == [] for value in result.values())
+
+    @pytest.mark.asyncio
+    async def test_get_all_returns_partial_results(self, service, mock_repository):
+        async def hang():
+            await asyncio.sleep(5)
+
+        mock_repository.get_farmer_incomes.side_effect = hang
+        mock_repository.get_households_by_regional.side_effect = RuntimeError("boom")
+
+        result = await service.get_all()
+
+        assert result["farmer_incomes"]["error"] == "Query timed out"
+        assert result["households_by_regional"]["error"] == "Query failed"
+        assert result["summary"] == [{"method": "get_summary_infographic"}]
+
+    @pytest.mark.asyncio
+    async def test_failed_section_retried_on_next_request(self, service, mock_repository):
+        mock_repository.get_households_by_regional.side_effect = [RuntimeError("boom"), [{"ok": 1}]]
+
+        await service.get_all()
+        result = await service.get_all()
+
+        assert result["households_by_regional"] == [{"ok": 1}]
+
+    def test_invalidate_unrelated_table(self, store):
+        assert store.invalidate("articles") == set()
+        assert store.stats()["dirty"] == []
+
+    @pytest.mark.asyncio
+    async def test_service_write_invalidates_store(self, monkeypatch):
+        from app.models import IncomeModel
+        from app.repositories import FarmerIncomesRepository
+        from app.services import FarmerIncomesService
+        from app.services import base as base_module
+
+        invalidate = Mock()
+        monkeypatch.setattr(base_module.infographic_store, "invalidate", invalidate)
+        repository = Mock(spec=FarmerIncomesRepository)
+        repository.create = AsyncMock(return_value=Mock(spec=IncomeModel))
+
+        await FarmerIncomesService(repository).create({"year": 2024})
+
+        invalidate.assert_called_once_with("pendapatan")